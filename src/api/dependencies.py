@@ -1,7 +1,7 @@
 """Dependency injection for FastAPI routes."""
 
 from typing import Optional, Generator
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -12,10 +12,23 @@ from src.core.security import verify_token, SecurityException
 from src.core.config import get_settings
 from src.api.models.user import User
 from src.api.models.analytics import UserSession
+from src.services.analytics.tracker import get_analytics_tracker
+from src.services.cache.user_cache import get_user_by_id
 
 security = HTTPBearer()
 settings = get_settings()
 
+# last_login_at is refreshed at most this often, not on every request
+LAST_SEEN_INTERVAL = timedelta(minutes=5)
+
+
+def _seen_recently(last_seen: Optional[datetime]) -> bool:
+    if last_seen is None:
+        return False
+    if last_seen.tzinfo is not None:
+        last_seen = last_seen.astimezone(timezone.utc).replace(tzinfo=None)
+    return datetime.utcnow() - last_seen < LAST_SEEN_INTERVAL
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -34,8 +47,8 @@ def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Get user from database
-        user = db.query(User).filter(User.id == user_id).first()
+        # Get user, usually from the short-lived user cache
+        user = get_user_by_id(db, user_id)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,9 +64,9 @@ def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Update last login
-        user.last_login_at = datetime.utcnow()
-        db.commit()
+        # Update last login; written with the analytics tracker's next flush
+        if not _seen_recently(user.last_login_at):
+            get_analytics_tracker().record_login(user.id)
         
         return user
         
@@ -133,8 +146,8 @@ def get_optional_current_user(
         if user_id is None:
             return None
         
-        # Get user from database
-        user = db.query(User).filter(User.id == user_id).first()
+        # Get user, usually from the short-lived user cache
+        user = get_user_by_id(db, user_id)
         if user is None or not user.is_active:
             return None
         
@@ -176,7 +189,8 @@ class QuotaChecker:
         # For example, check daily quote generation limits
         if self.quota_type == "quotes":
             # Check if user has exceeded daily quote limit
-            if not current_user.is_premium and current_user.api_calls_today >= 50:
+            # Counted from the database: the loaded user may be a cached copy
+            if not current_user.is_premium and User.count_api_calls_today(db, current_user.id) >= 50:
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     detail="Daily quote generation limit exceeded. Upgrade to premium for unlimited quotes."
@@ -1,5 +1,6 @@
 """Enhanced FastAPI application for Quote Master Pro with comprehensive monitoring."""
 
+import asyncio
 import time
 import logging
 from contextlib import asynccontextmanager
@@ -35,10 +36,13 @@ from src.api.routers import (
 # Import enhanced quotes router
 from src.api.routers.enhanced_quotes import router as enhanced_quotes_router
 
-# Configure structured logging with enhanced format
+settings = get_settings()
+
+# Configure structured logging with enhanced format. The filtering wrapper
+# turns calls below the configured level into no-ops before any processor
+# (including JSON rendering) runs.
 structlog.configure(
     processors=[
-        structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
@@ -54,12 +58,13 @@ structlog.configure(
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
+    wrapper_class=structlog.make_filtering_bound_logger(
+        getattr(logging, settings.log_level, logging.INFO)
+    ),
     cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger(__name__)
-settings = get_settings()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -112,17 +117,60 @@ async def lifespan(app: FastAPI):
     logger.info("Application shutdown completed")
 
 async def startup_tasks():
-    """Enhanced startup tasks."""
+    """Enhanced startup tasks.
     
-    try:
-        # Initialize Redis cache if enabled
-        if settings.enable_caching:
+    Each step fails on its own so a database hiccup never keeps the
+    analytics tracker (and its buffered writes) from starting.
+    """
+    
+    # Initialize Redis cache if enabled
+    if settings.enable_caching:
+        try:
             from src.services.cache.cache_init import initialize_redis_cache
             cache_init_result = await initialize_redis_cache()
             logger.info("Cache initialization completed", 
                        status=cache_init_result["status"],
                        backend="redis" if cache_init_result.get("redis_config", {}).get("connected") else "memory")
-        
+        except Exception as e:
+            logger.error(f"Cache initialization failed: {e}", exc_info=True)
+    
+    # Roll partitioned tables (analytics, voice jobs) forward for the coming months
+    try:
+        from src.core.database import ensure_monthly_partitions, engine
+        ensure_monthly_partitions(engine)
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {e}", exc_info=True)
+    
+    # Databases created before the recent jobs view don't have it yet
+    try:
+        from src.core.database import engine
+        from src.api.models.voice import ensure_recent_jobs_view
+        ensure_recent_jobs_view(engine)
+    except Exception as e:
+        logger.error(f"Recent jobs view creation failed: {e}", exc_info=True)
+    
+    # Cached clock for API key expiry checks
+    try:
+        from src.api.models.user import run_expiry_clock
+        app.state.expiry_clock = asyncio.create_task(run_expiry_clock())
+    except Exception as e:
+        logger.error(f"Expiry clock failed to start: {e}", exc_info=True)
+    
+    # Periodic writer for coalesced quote counter bumps
+    try:
+        from src.api.models.quote import quote_counter_batcher
+        app.state.quote_counter_flusher = asyncio.create_task(quote_counter_batcher.run())
+    except Exception as e:
+        logger.error(f"Quote counter flusher failed to start: {e}", exc_info=True)
+    
+    # Start analytics background processing inside the running loop
+    try:
+        from src.services.analytics.tracker import get_analytics_tracker
+        await get_analytics_tracker().start_processing()
+    except Exception as e:
+        logger.error(f"Analytics processing failed to start: {e}", exc_info=True)
+    
+    try:
         # Test AI service connectivity
         ai_service = await get_ai_service()
         health_status = await ai_service.get_health_status()
@@ -147,6 +195,22 @@ async def shutdown_tasks():
     """Enhanced shutdown tasks."""
     
     try:
+        # Stop analytics background processing and flush pending events
+        from src.services.analytics.tracker import get_analytics_tracker
+        await get_analytics_tracker().stop_processing()
+        
+        # Stop the API key expiry clock
+        expiry_clock = getattr(app.state, "expiry_clock", None)
+        if expiry_clock:
+            expiry_clock.cancel()
+        
+        # Stop the counter flusher and write out what it hadn't yet
+        quote_counter_flusher = getattr(app.state, "quote_counter_flusher", None)
+        if quote_counter_flusher:
+            quote_counter_flusher.cancel()
+        from src.api.models.quote import quote_counter_batcher
+        await asyncio.get_running_loop().run_in_executor(None, quote_counter_batcher.flush)
+        
         # Cleanup AI service
         ai_service = await get_ai_service()
         await ai_service.cleanup()
@@ -218,7 +282,7 @@ def setup_middleware(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=settings.allowed_methods,
         allow_headers=settings.allowed_headers,
-        expose_headers=["X-Request-ID", "X-Correlation-ID", "X-Trace-ID", "X-Cache", "X-Cache-Date"],
+        expose_headers=["X-Request-ID", "X-Correlation-ID", "X-Trace-ID", "X-Response-Time", "X-Cache", "X-Cache-Date", "X-Next-Cursor"],
     )
     
     # Trusted host middleware (security) - only in production
@@ -228,56 +292,7 @@ def setup_middleware(app: FastAPI) -> None:
             allowed_hosts=["*.quotemasterpro.com", "quotemasterpro.com"]
         )
     # In development mode, skip TrustedHostMiddleware to allow all hosts
-    
-    # Request logging middleware
-    @app.middleware("http")
-    async def log_requests(request: Request, call_next):
-        start_time = time.time()
-        
-        # Log request
-        logger.info(
-            "Request started",
-            method=request.method,
-            url=str(request.url),
-            client_ip=request.client.host if request.client else None,
-            user_agent=request.headers.get("user-agent"),
-        )
-        
-        try:
-            response = await call_next(request)
-            
-            # Calculate processing time
-            process_time = time.time() - start_time
-            
-            # Log response with cache information
-            cache_status = response.headers.get("X-Cache", "NONE")
-            logger.info(
-                "Request completed",
-                method=request.method,
-                url=str(request.url),
-                status_code=response.status_code,
-                process_time=round(process_time, 4),
-                cache_status=cache_status
-            )
-            
-            # Add processing time header
-            response.headers["X-Process-Time"] = str(process_time)
-            
-            return response
-            
-        except Exception as e:
-            process_time = time.time() - start_time
-            
-            # Log error
-            logger.error(
-                "Request failed",
-                method=request.method,
-                url=str(request.url),
-                error=str(e),
-                process_time=round(process_time, 4)
-            )
-            
-            raise
+    # Request logging and timing are handled by UnifiedObservabilityMiddleware
 
 
 def setup_routes(app: FastAPI) -> None:
@@ -513,6 +528,11 @@ def setup_routes(app: FastAPI) -> None:
     async def test_endpoint():
         """Simple test endpoint."""
         return {"message": "Test endpoint working", "success": True}
+    
+    # Prometheus scrape endpoint backed by the OpenTelemetry Prometheus reader.
+    # Mounted last so the /metrics/* JSON endpoints above still match first.
+    from prometheus_client import make_asgi_app
+    app.mount("/metrics", make_asgi_app())
 
 
 def setup_exception_handlers(app: FastAPI) -> None:
@@ -62,11 +62,20 @@ class ResponseCacheMiddleware(BaseHTTPMiddleware):
                 "ttl": 300,   # 5 minutes
                 "cache_key_params": ["service_type", "location", "property_type"]
             },
+            # Cached in its handler, keyed on ``days`` and behind the admin check
+            "/api/v1/analytics/dashboard": {
+                "strategy": CacheStrategy.NONE
+            },
             "/api/v1/analytics": {
                 "strategy": CacheStrategy.AGGRESSIVE,
                 "tier": CacheTier.COLD,
                 "ttl": 3600,  # 1 hour
                 "cache_key_params": ["metric", "period", "user_id"]
+            },
+            # A middleware hit would bypass the admin check, and most admin
+            # routes return user PII; /admin/overview caches in its handler
+            "/api/v1/admin": {
+                "strategy": CacheStrategy.NONE
             }
         }
     
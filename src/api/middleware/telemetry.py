@@ -3,110 +3,173 @@ OpenTelemetry FastAPI Middleware Integration
 Provides comprehensive request/response tracing and metrics collection.
 """
 
+import os
+import re
 import time
-from typing import Callable
-from uuid import uuid4
+from functools import lru_cache
+from typing import Callable, Dict
 
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 import structlog
 
 from opentelemetry import trace, metrics
+from opentelemetry.metrics import NoOpMeterProvider
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.propagate import extract
 from opentelemetry.trace import set_span_in_context
 
+from src.core.config import get_settings
+from src.models.service_quote import ServiceType, PerthSuburb
 from src.services.ai.monitoring.tracing import get_tracer, get_meter, add_trace_attributes
+from src.services.monitoring.enhanced_metrics import get_metrics_collector
 
 logger = structlog.get_logger(__name__)
+settings = get_settings()
 
-class OpenTelemetryMiddleware(BaseHTTPMiddleware):
-    """Custom OpenTelemetry middleware for enhanced request tracing."""
+# Path segments that identify a resource rather than a route
+_UUID_SEGMENT = re.compile(
+    r"/[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}(?=/|$)"
+)
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+# Allowed quote metric label values; anything else is reported as "other"
+KNOWN_SERVICE_TYPES = frozenset(service_type.value for service_type in ServiceType)
+KNOWN_SUBURBS = frozenset(suburb.value for suburb in PerthSuburb)
+
+@lru_cache(maxsize=1024)
+def normalize_route(path: str) -> str:
+    """Collapse IDs in a URL path so it is safe to use as a metric label."""
+    path = path.split("?", 1)[0]
+    path = _UUID_SEGMENT.sub("/{id}", path)
+    return _NUMERIC_SEGMENT.sub("/{id}", path)
+
+def get_route_label(request: Request) -> str:
+    """Get the low-cardinality route for a request.
+    
+    Prefers the path template of the matched FastAPI route (available once
+    routing has run) and falls back to the normalized URL path.
+    """
+    route = request.scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    return normalize_route(request.url.path)
+
+def _new_request_id() -> str:
+    """Generate a 64-bit hex request ID (cheaper than a formatted UUID4)."""
+    return os.urandom(8).hex()
+
+@lru_cache(maxsize=512)
+def _request_labels(method: str, route: str, status_code: int) -> Dict[str, str]:
+    """Get the shared metric attribute dict for a request outcome.
+    
+    The same few (method, route, status) combinations repeat on every
+    request, so the dicts are built once and reused. Callers must not
+    mutate the returned dict.
+    """
+    return {
+        "method": method,
+        "route": route,
+        "status_code": str(status_code),
+        "status_class": f"{status_code // 100}xx"
+    }
+
+class UnifiedObservabilityMiddleware(BaseHTTPMiddleware):
+    """Single-pass request tracing, logging and metrics middleware.
+    
+    Replaces the separate correlation ID, request logging and OpenTelemetry
+    middlewares: each request gets one timer, one span, one log event and
+    one set of metric updates.
+    """
     
     def __init__(self, app: FastAPI):
         super().__init__(app)
         self.tracer = get_tracer()
         self.meter = get_meter()
         
-        # Create metrics instruments
-        self.request_counter = self.meter.create_counter(
-            name="http_requests_total",
-            description="Total HTTP requests processed",
-            unit="1"
-        )
+        # HTTP instruments are owned by the shared metrics collector
+        collector = get_metrics_collector()
+        self.request_counter = collector.http_requests_counter
+        self.request_duration = collector.http_request_duration
+        self.response_size = collector.http_response_size
+        self.active_requests = collector.http_requests_active
         
-        self.request_duration = self.meter.create_histogram(
-            name="http_request_duration_seconds",
-            description="HTTP request duration in seconds",
-            unit="s"
-        )
-        
-        self.response_size = self.meter.create_histogram(
-            name="http_response_size_bytes",
-            description="HTTP response size in bytes",
-            unit="by"
+        self.quote_generation_counter = self.meter.create_counter(
+            name="service_quotes_generated_total",
+            description="Service quotes generated by service type and suburb",
+            unit="1"
         )
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request with comprehensive tracing."""
         
-        # Generate request ID
-        request_id = str(uuid4())
+        # Generate request ID; correlation ID falls back to it
+        request_id = _new_request_id()
+        correlation_id = request.headers.get("X-Correlation-ID") or request_id
         request.state.request_id = request_id
+        request.state.correlation_id = correlation_id
+        
+        # Bind per-request fields once for every log call below
+        log = logger.bind(
+            request_id=request_id,
+            correlation_id=correlation_id,
+            method=request.method,
+            path=request.url.path
+        )
         
         # Extract trace context from headers
         context = extract(request.headers)
+        route = normalize_route(request.url.path)
         
         # Start span for the request
         with self.tracer.start_as_current_span(
-            name=f"{request.method} {request.url.path}",
+            name=f"{request.method} {route}",
             context=context,
             attributes={
                 "http.method": request.method,
                 "http.url": str(request.url),
-                "http.route": request.url.path,
+                "http.route": route,
                 "http.user_agent": request.headers.get("user-agent", ""),
                 "http.client_ip": self._get_client_ip(request),
                 "request.id": request_id,
+                "correlation.id": correlation_id,
                 "service.name": "quote-master-pro-api"
             }
         ) as span:
             
-            start_time = time.time()
+            self.active_requests.add(1)
+            start_time = time.monotonic()
+            labels = None
             
             try:
                 # Process request
                 response = await call_next(request)
                 
                 # Calculate duration
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
+                
+                # Routing has run by now, so the matched template is known
+                route = get_route_label(request)
+                span.update_name(f"{request.method} {route}")
+                span.set_attribute("http.route", route)
                 
                 # Add response attributes
                 span.set_attribute("http.status_code", response.status_code)
                 span.set_attribute("http.response_time", duration)
                 
-                # Determine response size
-                response_size = 0
-                if hasattr(response, 'body'):
-                    response_size = len(response.body) if response.body else 0
-                elif hasattr(response, 'content_length') and response.content_length:
-                    response_size = response.content_length
+                # Determine response size from headers only; 0 means unknown
+                # (e.g. streaming responses) and is not recorded
+                content_length = response.headers.get("content-length")
+                response_size = int(content_length) if content_length and content_length.isdigit() else 0
                 
                 span.set_attribute("http.response_size", response_size)
                 
-                # Record metrics
-                status_class = f"{response.status_code // 100}xx"
-                labels = {
-                    "method": request.method,
-                    "route": request.url.path,
-                    "status_code": str(response.status_code),
-                    "status_class": status_class
-                }
+                # Record metrics (request count/duration are recorded below)
+                labels = _request_labels(request.method, route, response.status_code)
                 
-                self.request_counter.add(1, labels)
-                self.request_duration.record(duration, labels)
                 if response_size > 0:
                     self.response_size.record(response_size, labels)
+                self._track_quote_metrics(request, response.status_code)
                 
                 # Set span status based on HTTP status
                 if response.status_code >= 400:
@@ -119,24 +182,30 @@ class OpenTelemetryMiddleware(BaseHTTPMiddleware):
                 else:
                     span.set_status(trace.Status(trace.StatusCode.OK))
                 
-                # Add request ID to response headers
+                # Add request/correlation IDs and timing to response headers
                 response.headers["X-Request-ID"] = request_id
+                response.headers["X-Correlation-ID"] = correlation_id
+                response.headers["X-Response-Time"] = f"{int(duration * 1000)}ms"
                 
-                # Log request completion
-                logger.info(
-                    "HTTP request completed",
-                    request_id=request_id,
-                    method=request.method,
-                    path=request.url.path,
-                    status_code=response.status_code,
-                    duration_ms=duration * 1000,
-                    response_size=response_size
+                # Log request completion for errors, slow requests and
+                # requests whose trace was sampled; drop the rest
+                should_log = (
+                    response.status_code >= 400
+                    or duration >= settings.slow_request_threshold
+                    or span.get_span_context().trace_flags.sampled
                 )
+                if should_log:
+                    log.info(
+                        "HTTP request completed",
+                        status_code=response.status_code,
+                        duration_ms=duration * 1000,
+                        response_size=response_size
+                    )
                 
                 return response
                 
             except Exception as e:
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 
                 # Record error in span
                 span.record_exception(e)
@@ -147,30 +216,52 @@ class OpenTelemetryMiddleware(BaseHTTPMiddleware):
                     )
                 )
                 
-                # Record error metrics
-                error_labels = {
+                # Error metrics; no response exists, so headers are untouched
+                labels = {
                     "method": request.method,
-                    "route": request.url.path,
+                    "route": get_route_label(request),
                     "status_code": "500",
                     "status_class": "5xx",
                     "error_type": type(e).__name__
                 }
                 
-                self.request_counter.add(1, error_labels)
-                self.request_duration.record(duration, error_labels)
-                
                 # Log error
-                logger.error(
+                log.error(
                     "HTTP request failed",
-                    request_id=request_id,
-                    method=request.method,
-                    path=request.url.path,
                     error=str(e),
                     error_type=type(e).__name__,
                     duration_ms=duration * 1000
                 )
                 
                 raise
+            
+            finally:
+                # Skipped only when cancelled before an outcome was known
+                if labels is not None:
+                    self.request_counter.add(1, labels)
+                    self.request_duration.record(duration, labels)
+                self.active_requests.add(-1)
+    
+    def _track_quote_metrics(self, request: Request, status_code: int) -> None:
+        """Record quote generation using labels set by the quote handler.
+        
+        Handlers publish already-parsed labels on ``request.state.quote_labels``
+        so the request body never has to be re-read here.
+        """
+        
+        quote_labels = getattr(request.state, "quote_labels", None)
+        if not quote_labels:
+            return
+        
+        service_type = quote_labels.get("service_type", "unknown")
+        suburb = quote_labels.get("suburb", "unknown")
+        
+        # Bound label cardinality regardless of what the handler passed in
+        self.quote_generation_counter.add(1, {
+            "service_type": service_type if service_type in KNOWN_SERVICE_TYPES else "other",
+            "suburb": suburb if suburb in KNOWN_SUBURBS else "other",
+            "status": "success" if status_code < 400 else "error"
+        })
     
     def _get_client_ip(self, request: Request) -> str:
         """Get client IP address from request."""
@@ -190,16 +281,22 @@ class OpenTelemetryMiddleware(BaseHTTPMiddleware):
         
         return "unknown"
 
+# Backwards-compatible name
+OpenTelemetryMiddleware = UnifiedObservabilityMiddleware
+
 def setup_opentelemetry_instrumentation(app: FastAPI) -> None:
     """Setup comprehensive OpenTelemetry instrumentation for FastAPI app."""
     
     # Add custom middleware first
-    app.add_middleware(OpenTelemetryMiddleware)
+    app.add_middleware(UnifiedObservabilityMiddleware)
     
     # Instrument FastAPI with OpenTelemetry
+    # Request metrics come from UnifiedObservabilityMiddleware, so the
+    # instrumentor only contributes spans
     FastAPIInstrumentor.instrument_app(
         app,
-        excluded_urls="health,metrics,docs,openapi.json,favicon.ico"
+        excluded_urls="health,metrics,docs,openapi.json,favicon.ico",
+        meter_provider=NoOpMeterProvider()
     )
     
     # Add startup event for initialization
@@ -229,87 +326,11 @@ def setup_opentelemetry_instrumentation(app: FastAPI) -> None:
                 "timestamp": time.time()
             }
 
-def add_correlation_id_middleware(app: FastAPI) -> None:
-    """Add correlation ID middleware for request tracking."""
-    
-    @app.middleware("http")
-    async def correlation_id_middleware(request: Request, call_next):
-        """Add correlation ID to requests."""
-        
-        # Get correlation ID from header or generate new one
-        correlation_id = request.headers.get("X-Correlation-ID", str(uuid4()))
-        
-        # Store in request state
-        request.state.correlation_id = correlation_id
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Add to response headers
-        response.headers["X-Correlation-ID"] = correlation_id
-        
-        return response
-
-def setup_request_logging_middleware(app: FastAPI) -> None:
-    """Setup structured request logging middleware."""
-    
-    @app.middleware("http")
-    async def request_logging_middleware(request: Request, call_next):
-        """Log all requests with structured data."""
-        
-        start_time = time.time()
-        
-        # Extract request info
-        request_info = {
-            "method": request.method,
-            "url": str(request.url),
-            "path": request.url.path,
-            "client_ip": request.client.host if request.client else "unknown",
-            "user_agent": request.headers.get("user-agent", ""),
-            "content_type": request.headers.get("content-type", ""),
-            "content_length": request.headers.get("content-length", 0)
-        }
-        
-        # Log request start
-        logger.info("Request started", **request_info)
-        
-        try:
-            response = await call_next(request)
-            duration = time.time() - start_time
-            
-            # Log successful response
-            logger.info(
-                "Request completed",
-                **request_info,
-                status_code=response.status_code,
-                duration_ms=duration * 1000,
-                response_size=getattr(response, 'content_length', 0)
-            )
-            
-            return response
-            
-        except Exception as e:
-            duration = time.time() - start_time
-            
-            # Log error response
-            logger.error(
-                "Request failed",
-                **request_info,
-                error=str(e),
-                error_type=type(e).__name__,
-                duration_ms=duration * 1000
-            )
-            
-            raise
-
 def setup_comprehensive_instrumentation(app: FastAPI) -> None:
-    """Setup all instrumentation middleware in correct order."""
-    
-    # 1. Correlation ID middleware (first)
-    add_correlation_id_middleware(app)
+    """Setup all instrumentation middleware in correct order.
     
-    # 2. Request logging middleware
-    setup_request_logging_middleware(app)
+    Correlation IDs, request logging and metrics are all handled by
+    UnifiedObservabilityMiddleware, so only one middleware is registered.
+    """
     
-    # 3. OpenTelemetry instrumentation (last)
     setup_opentelemetry_instrumentation(app)
@@ -1,16 +1,27 @@
 """Analytics and tracking model definitions."""
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, time, timedelta
+from typing import Optional, List, Dict, Any
 from enum import Enum
+import csv
+import io
+import json
+import uuid
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, JSON
+from sqlalchemy import (
+    BigInteger, Column, Date, Integer, SmallInteger, String, DateTime, Text, Float, ForeignKey, Index,
+    and_, bindparam, case, cast, event, insert, literal, or_, select, text, update
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.hybrid import Comparator, hybrid_property
+from sqlalchemy.sql import operators
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship, Session
 from sqlalchemy.sql import func
-import uuid
 
-from src.core.database import Base
+from src.core.database import (
+    Base, JSONType, elapsed_seconds, jsonb_gin_index, register_monthly_partitions, time_ordered_uuid
+)
 
 
 class EventType(str, Enum):
@@ -62,25 +73,180 @@ class EventType(str, Enum):
     PAYMENT_COMPLETED = "payment_completed"
 
 
-class AnalyticsEvent(Base):
+# SMALLINT codes for event types, stored in analytics_events.event_type_id.
+# Codes follow declaration order, so new EventType members must be appended.
+EVENT_TYPE_IDS: Dict[str, int] = {
+    event_type.value: index for index, event_type in enumerate(EventType, start=1)
+}
+EVENT_TYPES_BY_ID: Dict[int, EventType] = {
+    index: EventType(value) for value, index in EVENT_TYPE_IDS.items()
+}
+
+
+def event_type_id(event_type: Any) -> int:
+    """Map an EventType (or its string value) to its stored code."""
+    return EVENT_TYPE_IDS[EventType(event_type).value]
+
+
+# Below this many rows a multi-row INSERT is cheaper than setting up COPY
+BULK_COPY_THRESHOLD = 100
+
+# NULL marker used in the COPY stream
+_COPY_NULL = "\\N"
+
+
+def _copy_value(value: Any) -> Any:
+    """Serialize a Python value for a PostgreSQL CSV COPY stream."""
+    if value is None:
+        return _COPY_NULL
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class BulkCopyMixin:
+    """Bulk ingestion for high-volume append-only analytics tables."""
+    
+    @classmethod
+    def bulk_copy(
+        cls,
+        session: Session,
+        rows: List[Dict[str, Any]],
+        columns: Optional[List[str]] = None
+    ) -> int:
+        """Insert many rows in one round-trip.
+        
+        Uses PostgreSQL ``COPY ... FROM STDIN`` for large batches and falls back
+        to a single multi-row INSERT for small batches or other databases.
+        Python-side column defaults (e.g. UUID primary keys) are filled in
+        because COPY bypasses the ORM; columns with server defaults that
+        the rows leave out get them from COPY. Works with psycopg2 and
+        psycopg 3. Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+        
+        if len(rows) < BULK_COPY_THRESHOLD or session.bind.dialect.name != "postgresql":
+            session.execute(insert(cls), rows)
+            return len(rows)
+        
+        table = cls.__table__
+        provided = list(columns or rows[0].keys())
+        
+        # COPY skips ORM defaults, so add columns that only have Python-side ones
+        defaulted = [
+            column for column in table.columns
+            if column.name not in provided and column.default is not None
+        ]
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_MINIMAL)
+        for row in rows:
+            values = [_copy_value(row.get(name)) for name in provided]
+            for column in defaulted:
+                default = column.default
+                values.append(_copy_value(default.arg(None) if default.is_callable else default.arg))
+            writer.writerow(values)
+        buffer.seek(0)
+        
+        column_list = ", ".join(provided + [column.name for column in defaulted])
+        statement = f"COPY {table.name} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')"
+        raw_connection = session.connection().connection
+        with raw_connection.cursor() as cursor:
+            if hasattr(cursor, "copy_expert"):  # psycopg2
+                cursor.copy_expert(statement, buffer)
+            else:  # psycopg 3
+                with cursor.copy(statement) as copy:
+                    copy.write(buffer.getvalue())
+        
+        return len(rows)
+
+
+class EventTypeDim(Base):
+    """Lookup table for analytics event type codes."""
+    
+    __tablename__ = "event_types"
+    
+    id = Column(SmallInteger, primary_key=True, autoincrement=False)
+    name = Column(String(50), unique=True, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<EventTypeDim(id={self.id}, name={self.name})>"
+
+
+@event.listens_for(EventTypeDim.__table__, "after_create")
+def _populate_event_types(target, connection, **kw) -> None:
+    connection.execute(
+        target.insert(),
+        [{"id": index, "name": value} for value, index in EVENT_TYPE_IDS.items()]
+    )
+
+
+class _EventTypeComparator(Comparator):
+    """Compare ``event_type`` by its SMALLINT code so indexes on the code apply."""
+    
+    def __clause_element__(self):
+        return case(
+            {index: value for value, index in EVENT_TYPE_IDS.items()},
+            value=self.expression
+        )
+    
+    def operate(self, op, *other, **kwargs):
+        if op in (operators.eq, operators.ne):
+            return op(self.expression, event_type_id(other[0]))
+        if op in (operators.in_op, operators.not_in_op):
+            return op(self.expression, [event_type_id(value) for value in other[0]])
+        return op(self.__clause_element__(), *other, **kwargs)
+
+
+class AnalyticsEvent(BulkCopyMixin, Base):
     """Analytics event tracking."""
     
     __tablename__ = "analytics_events"
-    
-    # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (
+        jsonb_gin_index("ix_analytics_events_properties_gin", "properties"),
+        # Dashboard access paths: recent events by user, by type and per session
+        Index("ix_analytics_user_time", "user_id", text("timestamp DESC"), text("id DESC")),
+        Index(
+            "ix_analytics_type_time",
+            "event_type_id",
+            text("timestamp DESC"),
+            postgresql_include=["event_name", "value"]
+        ),
+        Index("ix_analytics_session", "session_id", "timestamp"),
+        # Keyset pagination of the event listings, newest first
+        Index("ix_analytics_time_id", text("timestamp DESC"), text("id DESC")),
+        # Daily active users: index-only scan of a time window's known users
+        Index(
+            "ix_analytics_time_user",
+            "timestamp",
+            "user_id",
+            postgresql_where=text("user_id IS NOT NULL"),
+            sqlite_where=text("user_id IS NOT NULL")
+        ),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+    
+    # Primary key; includes the partition key as PostgreSQL requires
+    id = Column(UUID(as_uuid=True), primary_key=True, default=time_ordered_uuid)
     
     # Foreign key (optional for anonymous events)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
-    session_id = Column(UUID(as_uuid=True), ForeignKey("user_sessions.id"), nullable=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    session_id = Column(UUID(as_uuid=True), ForeignKey("user_sessions.id", ondelete="CASCADE"), nullable=True)
     
     # Event information
-    event_type = Column(String(50), nullable=False)
+    event_type_id = Column(SmallInteger, ForeignKey("event_types.id"), nullable=False)
     event_name = Column(String(255), nullable=False)
     event_category = Column(String(100), nullable=True)
     
     # Event data
-    properties = Column(JSON, nullable=True)  # Event-specific properties
+    properties = Column(JSONType, nullable=True)  # Event-specific properties
     value = Column(Float, nullable=True)  # Numeric value for the event
     
     # Context information
@@ -89,7 +255,7 @@ class AnalyticsEvent(Base):
     referrer = Column(String(500), nullable=True)
     
     # Technical information
-    user_agent = Column(Text, nullable=True)
+    user_agent = deferred(Column(Text, nullable=True), group="diag")
     ip_address = Column(String(45), nullable=True)  # IPv4/IPv6 compatible
     device_type = Column(String(50), nullable=True)  # mobile, tablet, desktop
     browser = Column(String(100), nullable=True)
@@ -111,30 +277,87 @@ class AnalyticsEvent(Base):
     variant = Column(String(50), nullable=True)
     
     # Timestamps
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    timestamp = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=datetime.utcnow,
+        server_default=func.now(),
+        nullable=False
+    )
     server_timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
-    # Relationships
-    user = relationship("User", back_populates="analytics_events")
-    session = relationship("UserSession", back_populates="events")
+    # Relationships; never lazy-loaded so ingest code can't trigger N+1 selects
+    user = relationship("User", back_populates="analytics_events", lazy="raise")
+    session = relationship("UserSession", back_populates="events", lazy="raise")
     
     def __repr__(self) -> str:
         return f"<AnalyticsEvent(id={self.id}, event_type={self.event_type}, user_id={self.user_id})>"
+    
+    @hybrid_property
+    def event_type(self) -> Optional[EventType]:
+        """Event type, decoded from ``event_type_id``."""
+        return EVENT_TYPES_BY_ID.get(self.event_type_id)
+    
+    @event_type.setter
+    def event_type(self, value: Any) -> None:
+        self.event_type_id = event_type_id(value)
+    
+    @event_type.comparator
+    def event_type(cls):
+        return _EventTypeComparator(cls.event_type_id)
 
 
-class UserSession(Base):
+# UserSession.flags bits
+FLAG_ACTIVE = 1
+FLAG_BOUNCE = 2
+FLAG_ENGAGED = 4
+FLAG_CONVERTED = 8
+
+# Session quality thresholds: a bounce is a single page in under 30s,
+# engagement is more than two pages, two minutes, or any generation
+BOUNCE_MAX_PAGE_VIEWS = 1
+BOUNCE_MAX_SECONDS = 30
+ENGAGED_MIN_PAGE_VIEWS = 2
+ENGAGED_MIN_SECONDS = 120
+
+
+def _session_flag(bit: int, doc: str) -> hybrid_property:
+    """Boolean view over one bit of ``UserSession.flags``, usable in queries."""
+    
+    def getter(self) -> bool:
+        flags = FLAG_ACTIVE if self.flags is None else self.flags
+        return bool(flags & bit)
+    
+    def setter(self, value: bool) -> None:
+        flags = FLAG_ACTIVE if self.flags is None else self.flags
+        self.flags = flags | bit if value else flags & ~bit
+    
+    def expression(cls):
+        return cls.flags.op("&")(bit) != 0
+    
+    getter.__doc__ = doc
+    return hybrid_property(getter, setter, expr=expression)
+
+
+class UserSession(BulkCopyMixin, Base):
     """User session tracking."""
     
     __tablename__ = "user_sessions"
+    __table_args__ = (
+        # Dashboard window scans: sessions and distinct visitors since a date
+        Index("ix_user_sessions_started_user", "started_at", "user_id"),
+        # Keyset pagination of the session listing, newest first
+        Index("ix_user_sessions_started_id", text("started_at DESC"), text("id DESC")),
+    )
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Foreign key (optional for anonymous sessions)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
     
     # Session identification
-    session_token = Column(String(255), unique=True, nullable=False)
+    session_token = Column(String(100), unique=True, nullable=False)
     anonymous_id = Column(String(255), nullable=True)  # For anonymous users
     
     # Session metadata
@@ -152,7 +375,7 @@ class UserSession(Base):
     utm_campaign = Column(String(100), nullable=True)
     
     # Technical information
-    user_agent = Column(Text, nullable=True)
+    user_agent = deferred(Column(Text, nullable=True), group="diag")
     ip_address = Column(String(45), nullable=True)  # IPv4/IPv6 compatible
     device_type = Column(String(50), nullable=True)
     browser = Column(String(100), nullable=True)
@@ -170,17 +393,17 @@ class UserSession(Base):
     voice_recordings = Column(Integer, default=0)
     interactions = Column(Integer, default=0)
     
-    # Quality metrics
-    bounce = Column(Boolean, default=False)  # Single page session
-    engaged = Column(Boolean, default=False)  # Meaningful interaction
-    converted = Column(Boolean, default=False)  # Achieved goal
+    # Status and quality metrics packed into one bitmask (FLAG_* constants)
+    flags = Column(SmallInteger, default=FLAG_ACTIVE, nullable=False)
     
-    # Status
-    is_active = Column(Boolean, default=True)
+    is_active = _session_flag(FLAG_ACTIVE, "Session is still open.")
+    bounce = _session_flag(FLAG_BOUNCE, "Single page session.")
+    engaged = _session_flag(FLAG_ENGAGED, "Meaningful interaction.")
+    converted = _session_flag(FLAG_CONVERTED, "Achieved goal.")
     
     # Relationships
     user = relationship("User", back_populates="sessions")
-    events = relationship("AnalyticsEvent", back_populates="session", cascade="all, delete-orphan")
+    events = relationship("AnalyticsEvent", back_populates="session", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self) -> str:
         return f"<UserSession(id={self.id}, user_id={self.user_id}, started_at={self.started_at})>"
@@ -192,31 +415,115 @@ class UserSession(Base):
             return int(delta.total_seconds())
         return None
     
-    def end_session(self) -> None:
-        """End the session and calculate metrics."""
-        self.ended_at = datetime.utcnow()
-        self.duration_seconds = self.calculate_duration()
-        self.is_active = False
+    @classmethod
+    def end_session(cls, session: Session, session_id: uuid.UUID, **counters: int) -> None:
+        """End a session with a single UPDATE.
+        
+        ``ended_at``, ``duration_seconds`` and the bounce/engaged flags are
+        computed by the database from ``started_at`` and its clock, so the
+        row never has to be read first. Optional ``counters`` (page_views,
+        quotes_generated, voice_recordings, interactions) are written in the
+        same statement and used for the quality flags.
+        """
+        elapsed = elapsed_seconds(session.bind.dialect.name, cls.started_at)
+        
+        def counter(name: str):
+            return literal(counters[name]) if name in counters else getattr(cls, name)
         
-        # Determine if session was a bounce
-        self.bounce = self.page_views <= 1 and (self.duration_seconds or 0) < 30
+        # Single page session
+        bounce = case(
+            (
+                and_(
+                    counter("page_views") <= BOUNCE_MAX_PAGE_VIEWS,
+                    elapsed < BOUNCE_MAX_SECONDS
+                ),
+                FLAG_BOUNCE
+            ),
+            else_=0
+        )
+        # Meaningful interaction
+        engaged = case(
+            (
+                or_(
+                    counter("page_views") > ENGAGED_MIN_PAGE_VIEWS,
+                    elapsed > ENGAGED_MIN_SECONDS,
+                    counter("quotes_generated") > 0,
+                    counter("voice_recordings") > 0
+                ),
+                FLAG_ENGAGED
+            ),
+            else_=0
+        )
         
-        # Determine if session was engaged
-        self.engaged = (
-            self.page_views > 2 or
-            (self.duration_seconds or 0) > 120 or
-            self.quotes_generated > 0 or
-            self.voice_recordings > 0
+        statement = (
+            update(cls)
+            .where(cls.id == session_id)
+            .values(
+                ended_at=func.now(),
+                duration_seconds=cast(elapsed, Integer),
+                # Clear active, keep converted, recompute bounce and engaged
+                flags=cls.flags.op("&")(FLAG_CONVERTED)
+                .op("|")(bounce)
+                .op("|")(engaged),
+                **counters
+            )
+            .execution_options(synchronize_session=False)
         )
+        session.execute(statement)
+    
+    @classmethod
+    def record_activity(
+        cls,
+        session: Session,
+        page_views: Dict[uuid.UUID, int],
+        last_activity: Dict[uuid.UUID, datetime],
+        converted: Optional[List[uuid.UUID]] = None
+    ) -> None:
+        """Add page views to sessions and flag converted ones without reading them.
+        
+        ``page_views`` maps session ids to views to add and ``last_activity``
+        to their latest view; both parts are a single statement however
+        many sessions they touch.
+        """
+        table = cls.__table__
+        
+        if page_views:
+            session.execute(
+                update(table)
+                .where(table.c.id == bindparam("session_id"))
+                .values(
+                    page_views=func.coalesce(table.c.page_views, 0) + bindparam("views"),
+                    last_activity_at=bindparam("last_activity")
+                ),
+                [
+                    {"session_id": session_id, "views": views, "last_activity": last_activity[session_id]}
+                    for session_id, views in page_views.items()
+                ]
+            )
+        
+        if converted:
+            session.execute(
+                update(table)
+                .where(table.c.id.in_(converted))
+                .values(flags=table.c.flags.op("|")(FLAG_CONVERTED))
+            )
 
 
-class PageView(Base):
+class PageView(BulkCopyMixin, Base):
     """Page view tracking."""
     
     __tablename__ = "page_views"
-    
-    # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (
+        jsonb_gin_index("ix_page_views_query_params_gin", "query_params"),
+        Index("ix_page_views_user_time", "user_id", text("viewed_at DESC")),
+        Index("ix_page_views_session", "session_id", "viewed_at"),
+        # Dashboard page view counts over a date window
+        Index("ix_page_views_viewed_at", "viewed_at"),
+        {"postgresql_partition_by": "RANGE (viewed_at)"},
+    )
+    
+    # Primary key; includes the partition key as PostgreSQL requires
+    id = Column(UUID(as_uuid=True), primary_key=True, default=time_ordered_uuid)
     
     # Foreign keys
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
@@ -226,14 +533,20 @@ class PageView(Base):
     url = Column(String(500), nullable=False)
     title = Column(String(255), nullable=True)
     path = Column(String(255), nullable=False)
-    query_params = Column(JSON, nullable=True)
+    query_params = Column(JSONType, nullable=True)
     
     # Navigation
     referrer = Column(String(500), nullable=True)
     previous_page = Column(String(500), nullable=True)
     
     # Timing
-    viewed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    viewed_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=datetime.utcnow,
+        server_default=func.now(),
+        nullable=False
+    )
     time_on_page = Column(Float, nullable=True)  # seconds
     load_time = Column(Float, nullable=True)  # milliseconds
     
@@ -246,13 +559,22 @@ class PageView(Base):
         return f"<PageView(id={self.id}, path={self.path}, user_id={self.user_id})>"
 
 
-class ConversionEvent(Base):
+class ConversionEvent(BulkCopyMixin, Base):
     """Conversion tracking."""
     
     __tablename__ = "conversion_events"
+    __table_args__ = (
+        jsonb_gin_index("ix_conversion_events_properties_gin", "properties"),
+        Index(
+            "ix_conv_goal_time",
+            "goal_name",
+            text("converted_at DESC"),
+            postgresql_include=["value"]
+        ),
+    )
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=time_ordered_uuid)
     
     # Foreign keys
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
@@ -266,26 +588,29 @@ class ConversionEvent(Base):
     # Attribution
     first_touch_source = Column(String(100), nullable=True)
     last_touch_source = Column(String(100), nullable=True)
-    conversion_path = Column(JSON, nullable=True)  # Array of touchpoints
+    conversion_path = Column(JSONType, nullable=True)  # Array of touchpoints
     
     # Timing
     converted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     time_to_conversion = Column(Integer, nullable=True)  # seconds from first touch
     
     # Context
-    properties = Column(JSON, nullable=True)
+    properties = Column(JSONType, nullable=True)
     
     def __repr__(self) -> str:
         return f"<ConversionEvent(id={self.id}, goal_name={self.goal_name}, user_id={self.user_id})>"
 
 
-class FunnelStep(Base):
+class FunnelStep(BulkCopyMixin, Base):
     """Funnel step tracking."""
     
     __tablename__ = "funnel_steps"
+    __table_args__ = (
+        Index("ix_funnel_step", "funnel_name", "step_order"),
+    )
     
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=time_ordered_uuid)
     
     # Foreign keys
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
@@ -301,7 +626,7 @@ class FunnelStep(Base):
     time_spent = Column(Float, nullable=True)  # seconds on this step
     
     # Context
-    properties = Column(JSON, nullable=True)
+    properties = Column(JSONType, nullable=True)
     
     def __repr__(self) -> str:
         return f"<FunnelStep(funnel_name={self.funnel_name}, step_name={self.step_name})>"
@@ -329,4 +654,232 @@ class ABTestVariant(Base):
     anonymous_id = Column(String(255), nullable=True)
     
     def __repr__(self) -> str:
-        return f"<ABTestVariant(experiment_id={self.experiment_id}, variant={self.variant})>"
\ No newline at end of file
+        return f"<ABTestVariant(experiment_id={self.experiment_id}, variant={self.variant})>"
+
+
+def _as_date(value) -> date:
+    """Normalize a ``func.date()`` result; SQLite's date() returns text."""
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _date_range(start: date, end: date) -> List[date]:
+    """Every day in [start, end)."""
+    return [start + timedelta(days=offset) for offset in range((end - start).days)]
+
+
+class DailyActiveUsers(Base):
+    """Distinct signed-in users per day, rolled up from analytics_events.
+    
+    Reports read one row per day instead of a distinct count over every
+    event in the window; refresh() recomputes recent days from the events
+    and writes a row for every day, idle ones included, so a missing row
+    means the day hasn't been rolled up yet.
+    """
+    
+    __tablename__ = "analytics_daily_active_users"
+    
+    day = Column(Date, primary_key=True)
+    active_users = Column(Integer, nullable=False)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    @staticmethod
+    def _counts(session: Session, start: date, end: date) -> Dict[date, int]:
+        """Distinct users per day for days in [start, end)."""
+        day = func.date(AnalyticsEvent.timestamp)
+        rows = session.execute(
+            select(day, func.count(func.distinct(AnalyticsEvent.user_id)))
+            .where(
+                AnalyticsEvent.timestamp >= datetime.combine(start, time.min),
+                AnalyticsEvent.timestamp < datetime.combine(end, time.min),
+                AnalyticsEvent.user_id.isnot(None)
+            )
+            .group_by(day)
+        )
+        return {_as_date(d): n for d, n in rows}
+    
+    @classmethod
+    def refresh(cls, session: Session, start: date, end: date) -> int:
+        """Recompute and upsert the rollup for days in [start, end); returns rows written."""
+        days = _date_range(start, end)
+        if not days:
+            return 0
+        counts = cls._counts(session, start, end)
+        
+        dialect_insert = sqlite.insert if session.bind.dialect.name == "sqlite" else postgresql.insert
+        statement = dialect_insert(cls).values(
+            [{"day": d, "active_users": counts.get(d, 0)} for d in days]
+        )
+        session.execute(statement.on_conflict_do_update(
+            index_elements=["day"],
+            set_={"active_users": statement.excluded.active_users, "refreshed_at": func.now()}
+        ))
+        return len(days)
+    
+    @classmethod
+    def count_day(cls, session: Session, day: date) -> int:
+        """Live count for one day, e.g. today before the rollup has closed it."""
+        return cls._counts(session, day, day + timedelta(days=1)).get(day, 0)
+    
+    @classmethod
+    def daily_counts(cls, session: Session, start: date, end: date) -> Dict[date, int]:
+        """Active users for every day in [start, end].
+        
+        Rolled-up days are read from the rollup; days without a row (today,
+        and any history the refresh job hasn't reached yet) are counted live.
+        """
+        counts = dict(session.execute(
+            select(cls.day, cls.active_users).where(cls.day.between(start, end))
+        ).all())
+        
+        missing = [d for d in _date_range(start, end + timedelta(days=1)) if d not in counts]
+        if missing:
+            live = cls._counts(session, missing[0], missing[-1] + timedelta(days=1))
+            counts.update({d: live.get(d, 0) for d in missing})
+        
+        # Today is still open; its row, if any, is already out of date
+        today = datetime.utcnow().date()
+        if start <= today <= end and today not in missing:
+            counts[today] = cls.count_day(session, today)
+        
+        return counts
+    
+    def __repr__(self) -> str:
+        return f"<DailyActiveUsers(day={self.day}, active_users={self.active_users})>"
+
+
+class DailySessionMetrics(Base):
+    """Session and page view totals per day, rolled up for the dashboard.
+    
+    Every column is additive, so a window's totals are a sum over one row
+    per day instead of an aggregate over every session and page view in
+    it. Sessions keep changing after their first day (duration, bounce and
+    conversion are set when they end), so refresh() recomputes recent days.
+    Like DailyActiveUsers, every day gets a row, so a missing one means
+    the day hasn't been rolled up yet and is aggregated live.
+    """
+    
+    __tablename__ = "analytics_daily_session_metrics"
+    
+    # Additive columns summed by window_totals()
+    METRICS = (
+        "sessions", "page_views", "duration_total", "timed_sessions",
+        "bounces", "engaged_sessions", "conversions"
+    )
+    
+    day = Column(Date, primary_key=True)
+    sessions = Column(Integer, nullable=False, default=0)
+    page_views = Column(Integer, nullable=False, default=0)
+    duration_total = Column(BigInteger, nullable=False, default=0)  # seconds
+    timed_sessions = Column(Integer, nullable=False, default=0)  # sessions with a duration
+    bounces = Column(Integer, nullable=False, default=0)
+    engaged_sessions = Column(Integer, nullable=False, default=0)
+    conversions = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    @classmethod
+    def _aggregate(cls, session: Session, start: datetime, end: datetime) -> Dict[date, Dict[str, int]]:
+        """Live per-day totals for sessions and page views in [start, end)."""
+        days: Dict[date, Dict[str, int]] = {}
+        
+        def day_totals(day) -> Dict[str, int]:
+            return days.setdefault(_as_date(day), dict.fromkeys(cls.METRICS, 0))
+        
+        started_day = func.date(UserSession.started_at)
+        for row in session.execute(
+            select(
+                started_day.label("day"),
+                func.count().label("sessions"),
+                func.coalesce(func.sum(UserSession.duration_seconds), 0).label("duration_total"),
+                func.count(UserSession.duration_seconds).label("timed_sessions"),
+                func.count().filter(UserSession.bounce).label("bounces"),
+                func.count().filter(UserSession.engaged).label("engaged_sessions"),
+                func.count().filter(UserSession.converted).label("conversions"),
+            )
+            .where(UserSession.started_at >= start, UserSession.started_at < end)
+            .group_by(started_day)
+        ):
+            values = row._asdict()
+            day_totals(values.pop("day")).update(values)
+        
+        viewed_day = func.date(PageView.viewed_at)
+        for day, page_views in session.execute(
+            select(viewed_day, func.count())
+            .where(PageView.viewed_at >= start, PageView.viewed_at < end)
+            .group_by(viewed_day)
+        ):
+            day_totals(day)["page_views"] = page_views
+        
+        return days
+    
+    @classmethod
+    def refresh(cls, session: Session, start: date, end: date) -> int:
+        """Recompute and upsert the rollup for days in [start, end); returns rows written."""
+        days = _date_range(start, end)
+        if not days:
+            return 0
+        totals = cls._aggregate(session, datetime.combine(start, time.min), datetime.combine(end, time.min))
+        empty = dict.fromkeys(cls.METRICS, 0)
+        
+        dialect_insert = sqlite.insert if session.bind.dialect.name == "sqlite" else postgresql.insert
+        statement = dialect_insert(cls).values([{"day": day, **totals.get(day, empty)} for day in days])
+        session.execute(statement.on_conflict_do_update(
+            index_elements=["day"],
+            set_={
+                **{name: statement.excluded[name] for name in cls.METRICS},
+                "refreshed_at": func.now()
+            }
+        ))
+        return len(days)
+    
+    @classmethod
+    def window_totals(cls, session: Session, start: datetime, end: datetime) -> Dict[str, int]:
+        """Totals for [start, end).
+        
+        Whole days come from the rollup; the partial days at the edges and
+        whole days without a rollup row are aggregated live.
+        """
+        first_day = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+        last_day = end.date()
+        totals = dict.fromkeys(cls.METRICS, 0)
+        
+        def add(day_totals: Dict[str, int]) -> None:
+            for name in cls.METRICS:
+                totals[name] += day_totals[name]
+        
+        if first_day >= last_day:
+            live = [(start, end)]
+        else:
+            live = [(start, datetime.combine(first_day, time.min)), (datetime.combine(last_day, time.min), end)]
+            rolled_up = set()
+            for row in session.execute(
+                select(cls.day, *(getattr(cls, name) for name in cls.METRICS))
+                .where(cls.day >= first_day, cls.day < last_day)
+            ):
+                rolled_up.add(row.day)
+                add(row._mapping)
+            
+            missing = [day for day in _date_range(first_day, last_day) if day not in rolled_up]
+            if missing:
+                days = cls._aggregate(
+                    session,
+                    datetime.combine(missing[0], time.min),
+                    datetime.combine(missing[-1] + timedelta(days=1), time.min)
+                )
+                for day in missing:
+                    if day in days:
+                        add(days[day])
+        
+        for live_start, live_end in live:
+            if live_start < live_end:
+                for day_totals in cls._aggregate(session, live_start, live_end).values():
+                    add(day_totals)
+        
+        return totals
+    
+    def __repr__(self) -> str:
+        return f"<DailySessionMetrics(day={self.day}, sessions={self.sessions})>"
+
+
+# Monthly range-partitioned tables (PostgreSQL only)
+register_monthly_partitions(AnalyticsEvent.__table__)
+register_monthly_partitions(PageView.__table__)
@@ -1,16 +1,46 @@
 """Quote-related model definitions."""
 
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional
+from functools import cached_property
+from typing import Optional, List, Dict, Any, Iterable
 from enum import Enum
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, JSON
+from sqlalchemy import (
+    Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Table, UniqueConstraint,
+    Computed, Index, bindparam, column, event, update, values, text as sql_text
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship, validates, Session
 from sqlalchemy.sql import func
 import uuid
 
-from src.core.database import Base
+from src.core.database import Base, SessionLocal, JSONType, jsonb_gin_index, trigram_gin_index
+
+logger = logging.getLogger(__name__)
+
+
+def _insert_ignoring_duplicates(
+    session: Session,
+    table: Table,
+    values: List[Dict[str, Any]],
+    index_elements: List[str]
+) -> int:
+    """Insert rows in a single statement, skipping ones that already exist."""
+    if not values:
+        return 0
+    
+    dialect_insert = sqlite.insert if session.bind.dialect.name == "sqlite" else postgresql.insert
+    statement = dialect_insert(table).values(values).on_conflict_do_nothing(
+        index_elements=index_elements
+    )
+    return session.execute(statement).rowcount
 
 
 class QuoteStatus(str, Enum):
@@ -64,17 +94,65 @@ class QuoteCategory(Base):
         return f"<QuoteCategory(id={self.id}, name={self.name})>"
 
 
+# Engagement weights behind Quote.popularity_score
+POPULARITY_WEIGHTS = {
+    "view_count": 0.1,
+    "like_count": 2.0,
+    "share_count": 5.0,
+    "favorite_count": 3.0,
+}
+
+# Linear age decay applied on top of the weighted engagement, floored
+POPULARITY_DECAY_PER_DAY = 0.01
+POPULARITY_MIN_DECAY = 0.1
+
+_POPULARITY_EXPRESSION = " + ".join(
+    f"{column} * {weight}" for column, weight in POPULARITY_WEIGHTS.items()
+)
+
+_LISTED_QUOTES = "status = 'published' AND is_public AND is_approved"
+
+
 class Quote(Base):
     """Quote model."""
     
     __tablename__ = "quotes"
+    __table_args__ = (
+        jsonb_gin_index("ix_quotes_tags_gin", "tags"),
+        # Popularity feed: index range scan over listed quotes only
+        Index(
+            "ix_quotes_pop",
+            sql_text("popularity_score DESC"),
+            postgresql_where=sql_text(_LISTED_QUOTES),
+            sqlite_where=sql_text(_LISTED_QUOTES)
+        ),
+        # Keyset pagination of admin listings on (created_at, id)
+        Index("ix_quotes_created_id", sql_text("created_at DESC"), sql_text("id DESC")),
+        # Admin filters on small subsets
+        Index(
+            "ix_quotes_published_created",
+            sql_text("created_at DESC"),
+            postgresql_where=sql_text("status = 'published'"),
+            sqlite_where=sql_text("status = 'published'")
+        ),
+        Index(
+            "ix_quotes_featured",
+            sql_text("featured_at DESC"),
+            postgresql_where=sql_text("is_featured"),
+            sqlite_where=sql_text("is_featured")
+        ),
+        # Admin substring search (ILIKE '%term%')
+        trigram_gin_index("ix_quotes_text_trgm", "text"),
+        trigram_gin_index("ix_quotes_author_trgm", "author"),
+        trigram_gin_index("ix_quotes_context_trgm", "context"),
+    )
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Foreign keys
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    category_id = Column(UUID(as_uuid=True), ForeignKey("quote_categories.id"), nullable=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("quote_categories.id"), nullable=True, index=True)
     
     # Quote content
     text = Column(Text, nullable=False)
@@ -84,11 +162,12 @@ class Quote(Base):
     # Generation metadata
     source = Column(String(20), default=QuoteSource.AI_GENERATED)
     ai_model = Column(String(50), nullable=True)  # Which AI model generated it
-    prompt_used = Column(Text, nullable=True)  # Original prompt
-    generation_params = Column(JSON, nullable=True)  # AI generation parameters
+    # Rarely read and potentially large: loaded on access or via undefer_group("diag")
+    prompt_used = deferred(Column(Text, nullable=True), group="diag")  # Original prompt
+    generation_params = deferred(Column(JSONType, nullable=True), group="diag")  # AI generation parameters
     
     # Psychology analysis
-    psychological_profile = Column(JSON, nullable=True)  # Psychological insights
+    psychological_profile = deferred(Column(JSONType, nullable=True), group="analysis")  # Psychological insights
     emotional_tone = Column(String(50), nullable=True)
     sentiment_score = Column(Float, nullable=True)  # -1 to 1
     complexity_score = Column(Float, nullable=True)  # 0 to 1
@@ -100,7 +179,12 @@ class Quote(Base):
     
     # Quality and engagement
     quality_score = Column(Float, nullable=True)  # 0 to 1
-    popularity_score = Column(Float, default=0.0)  # Calculated from engagement
+    # Weighted engagement, maintained by the database on every counter change.
+    # Time decay depends on now() so it cannot be part of a stored generated
+    # column; calculate_popularity_score() applies it when needed.
+    popularity_score = Column(Float, Computed(_POPULARITY_EXPRESSION, persisted=True))
+    # Decayed popularity, refreshed in bulk by score_quotes_batch()
+    trending_score = Column(Float, nullable=True)
     view_count = Column(Integer, default=0)
     like_count = Column(Integer, default=0)
     share_count = Column(Integer, default=0)
@@ -110,13 +194,13 @@ class Quote(Base):
     is_approved = Column(Boolean, default=True)
     is_featured = Column(Boolean, default=False)
     is_public = Column(Boolean, default=True)
-    moderation_notes = Column(Text, nullable=True)
+    moderation_notes = deferred(Column(Text, nullable=True), group="diag")
     
     # Status and lifecycle
     status = Column(String(20), default=QuoteStatus.PUBLISHED)
     
     # SEO and discovery
-    tags = Column(JSON, nullable=True)  # Array of tags
+    tags = Column(JSONType, nullable=True)  # Array of tags
     keywords = Column(Text, nullable=True)  # Comma-separated keywords
     
     # Timestamps
@@ -129,67 +213,225 @@ class Quote(Base):
     user = relationship("User", back_populates="quotes")
     category = relationship("QuoteCategory", back_populates="quotes")
     voice_recording = relationship("VoiceRecording", backref="quotes")
-    favorites = relationship("QuoteFavorite", back_populates="quote", cascade="all, delete-orphan")
+    favorites = relationship("QuoteFavorite", back_populates="quote", cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Engagement counters that may be bumped with bump_counter()
+    COUNTER_COLUMNS = ("view_count", "like_count", "share_count", "favorite_count")
     
     def __repr__(self) -> str:
         preview = self.text[:50] + "..." if len(self.text) > 50 else self.text
         return f"<Quote(id={self.id}, text='{preview}')>"
     
-    def increment_view_count(self) -> None:
-        """Increment view count."""
-        self.view_count += 1
-    
-    def increment_like_count(self) -> None:
-        """Increment like count."""
-        self.like_count += 1
+    @classmethod
+    def _counter_column(cls, counter: str):
+        """Resolve a counter name to its column, rejecting anything else."""
+        if counter not in cls.COUNTER_COLUMNS:
+            raise ValueError(f"Unknown quote counter: {counter}")
+        return getattr(cls, counter)
     
-    def increment_share_count(self) -> None:
-        """Increment share count."""
-        self.share_count += 1
+    @classmethod
+    def bump_counter(cls, session: Session, quote_id: uuid.UUID, counter: str, n: int = 1) -> Optional[int]:
+        """Atomically add ``n`` to a counter and return its new value.
+        
+        Emits ``UPDATE quotes SET <counter> = <counter> + n WHERE id = ...``
+        so the row never has to be loaded and concurrent bumps don't race.
+        Returns None if the quote does not exist.
+        """
+        counter_column = cls._counter_column(counter)
+        statement = (
+            update(cls)
+            .where(cls.id == quote_id)
+            .values({counter_column: counter_column + n})
+            .returning(counter_column)
+        )
+        return session.execute(statement).scalar()
+    
+    @classmethod
+    def bump_views(cls, session: Session, quote_id: uuid.UUID, n: int = 1) -> Optional[int]:
+        """Atomically increment view count."""
+        return cls.bump_counter(session, quote_id, "view_count", n)
+    
+    @classmethod
+    def bump_likes(cls, session: Session, quote_id: uuid.UUID, n: int = 1) -> Optional[int]:
+        """Atomically increment like count."""
+        return cls.bump_counter(session, quote_id, "like_count", n)
+    
+    @classmethod
+    def bump_shares(cls, session: Session, quote_id: uuid.UUID, n: int = 1) -> Optional[int]:
+        """Atomically increment share count."""
+        return cls.bump_counter(session, quote_id, "share_count", n)
+    
+    @classmethod
+    def bump_counters(cls, session: Session, counter: str, deltas: Dict[uuid.UUID, int]) -> None:
+        """Apply many counter bumps for different quotes in one statement.
+        
+        On PostgreSQL this is a single ``UPDATE ... FROM (VALUES ...)``
+        joined on id; other dialects fall back to one executemany UPDATE.
+        """
+        if not deltas:
+            return
+        
+        counter_column = cls._counter_column(counter)
+        
+        if session.bind.dialect.name == "postgresql":
+            bumps = values(
+                column("id", UUID(as_uuid=True)),
+                column("delta", Integer),
+                name="v"
+            ).data(list(deltas.items()))
+            statement = (
+                update(cls)
+                .where(cls.id == bumps.c.id)
+                .values({counter_column: counter_column + bumps.c.delta})
+                .execution_options(synchronize_session=False)
+            )
+            session.execute(statement)
+        else:
+            table = cls.__table__
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam("quote_id"))
+                .values({counter: table.c[counter] + bindparam("delta")})
+            )
+            session.execute(
+                statement,
+                [{"quote_id": quote_id, "delta": delta} for quote_id, delta in deltas.items()]
+            )
     
     def calculate_popularity_score(self) -> float:
         """Calculate popularity score based on engagement metrics."""
         # Simple algorithm: weighted sum of engagement metrics
-        score = (
-            self.view_count * 0.1 +
-            self.like_count * 2.0 +
-            self.share_count * 5.0 +
-            self.favorite_count * 3.0
+        score = sum(
+            (getattr(self, column) or 0) * weight
+            for column, weight in POPULARITY_WEIGHTS.items()
         )
         
         # Time decay factor (newer quotes get slight boost)
         days_old = (datetime.utcnow() - self.created_at).days
-        time_factor = max(0.1, 1.0 - (days_old * 0.01))
+        time_factor = max(POPULARITY_MIN_DECAY, 1.0 - (days_old * POPULARITY_DECAY_PER_DAY))
         
         return score * time_factor
     
-    @property
+    def _clear_text_stats(self) -> None:
+        """Drop cached text statistics."""
+        for name in ("word_count", "character_count", "is_long_quote"):
+            self.__dict__.pop(name, None)
+    
+    @validates("text")
+    def _reset_text_stats(self, key: str, text: str) -> str:
+        """Invalidate cached text statistics whenever the text is assigned."""
+        self._clear_text_stats()
+        return text
+    
+    @cached_property
     def word_count(self) -> int:
         """Get word count of the quote."""
-        return len(self.text.split())
+        return sum(1 for _ in re.finditer(r"\S+", self.text))
     
-    @property
+    @cached_property
     def character_count(self) -> int:
         """Get character count of the quote."""
         return len(self.text)
     
-    @property
+    @cached_property
     def is_long_quote(self) -> bool:
         """Check if quote is considered long."""
         return self.word_count > 50 or self.character_count > 280
 
 
+@event.listens_for(Quote, "refresh")
+@event.listens_for(Quote, "expire")
+def _clear_quote_text_stats(target: Quote, *args) -> None:
+    """Reloaded text may differ from what the cached statistics were built on."""
+    target._clear_text_stats()
+
+
+class QuoteCounterBatcher:
+    """Coalesce quote counter bumps in memory and write them together.
+    
+    Bumps are summed per quote and counter; ``run()`` flushes everything
+    pending every ``flush_interval`` seconds with one
+    ``Quote.bump_counters()`` statement per counter column, off the event
+    loop. Deltas from a failed write are merged back for the next flush.
+    """
+    
+    def __init__(self, flush_interval: float = 0.5):
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[uuid.UUID, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+    
+    def bump(self, quote_id: uuid.UUID, counter: str = "view_count", n: int = 1) -> None:
+        """Queue a counter bump for the next flush."""
+        Quote._counter_column(counter)
+        
+        with self._lock:
+            self._pending[counter][quote_id] += n
+    
+    def _requeue(self, pending: Dict[str, Dict[uuid.UUID, int]]) -> None:
+        """Merge unwritten deltas back into the pending bumps."""
+        with self._lock:
+            for counter, deltas in pending.items():
+                for quote_id, n in deltas.items():
+                    self._pending[counter][quote_id] += n
+    
+    def flush(self, session: Optional[Session] = None) -> None:
+        """Write all pending bumps.
+        
+        Uses its own session and commits when none is given; otherwise the
+        caller owns the transaction. If the write fails the deltas are
+        queued again and the error is raised.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(lambda: defaultdict(int))
+        
+        if not pending:
+            return
+        
+        own_session = session is None
+        session = session or SessionLocal()
+        try:
+            for counter, deltas in pending.items():
+                Quote.bump_counters(session, counter, deltas)
+            if own_session:
+                session.commit()
+        except Exception:
+            if own_session:
+                session.rollback()
+            self._requeue(pending)
+            raise
+        finally:
+            if own_session:
+                session.close()
+    
+    async def run(self) -> None:
+        """Flush pending bumps every ``flush_interval`` seconds until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await loop.run_in_executor(None, self.flush)
+            except Exception as e:
+                logger.warning(f"Quote counter flush failed, retrying next interval: {e}")
+
+
+# Global counter batcher instance
+quote_counter_batcher = QuoteCounterBatcher()
+
+
 class QuoteFavorite(Base):
     """User's favorite quotes."""
     
     __tablename__ = "quote_favorites"
+    __table_args__ = (
+        UniqueConstraint("user_id", "quote_id", name="uq_quote_favorites_user_quote"),
+    )
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Foreign keys
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    quote_id = Column(UUID(as_uuid=True), ForeignKey("quotes.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    quote_id = Column(UUID(as_uuid=True), ForeignKey("quotes.id", ondelete="CASCADE"), nullable=False)
     
     # Metadata
     notes = Column(Text, nullable=True)  # Personal notes about the quote
@@ -203,6 +445,21 @@ class QuoteFavorite(Base):
     
     def __repr__(self) -> str:
         return f"<QuoteFavorite(user_id={self.user_id}, quote_id={self.quote_id})>"
+    
+    @classmethod
+    def bulk_add(
+        cls,
+        session: Session,
+        user_id: uuid.UUID,
+        quote_ids: Iterable[uuid.UUID],
+        notes: Optional[str] = None
+    ) -> int:
+        """Favorite many quotes in one INSERT, ignoring existing favorites."""
+        values = [
+            {"user_id": user_id, "quote_id": quote_id, "notes": notes}
+            for quote_id in quote_ids
+        ]
+        return _insert_ignoring_duplicates(session, cls.__table__, values, ["user_id", "quote_id"])
 
 
 class QuoteCollection(Base):
@@ -237,6 +494,9 @@ class QuoteCollectionItem(Base):
     """Items in a quote collection."""
     
     __tablename__ = "quote_collection_items"
+    __table_args__ = (
+        UniqueConstraint("collection_id", "quote_id", name="uq_quote_collection_items_collection_quote"),
+    )
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -256,6 +516,24 @@ class QuoteCollectionItem(Base):
     
     def __repr__(self) -> str:
         return f"<QuoteCollectionItem(collection_id={self.collection_id}, quote_id={self.quote_id})>"
+    
+    @classmethod
+    def bulk_add(
+        cls,
+        session: Session,
+        collection_id: uuid.UUID,
+        quote_ids: Iterable[uuid.UUID],
+        notes: Optional[str] = None
+    ) -> int:
+        """Add many quotes to a collection in one INSERT, ignoring duplicates.
+        
+        Quotes keep the order they were passed in via ``sort_order``.
+        """
+        values = [
+            {"collection_id": collection_id, "quote_id": quote_id, "sort_order": index, "notes": notes}
+            for index, quote_id in enumerate(quote_ids)
+        ]
+        return _insert_ignoring_duplicates(session, cls.__table__, values, ["collection_id", "quote_id"])
 
 
 class QuoteRating(Base):
@@ -1,16 +1,25 @@
 """User model definitions."""
 
-from datetime import datetime
-from typing import Optional
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
 from enum import Enum
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum as SQLEnum
+from sqlalchemy import (
+    Column, Integer, String, Boolean, DateTime, Text, LargeBinary, CheckConstraint, Computed, Index,
+    and_, bindparam, case, select, text, update
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates, Session
 from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import FunctionElement
 import uuid
 
-from src.core.database import Base
+from src.core.database import Base, trigram_gin_index
+from src.core.security import hash_api_key
 
 
 class UserRole(str, Enum):
@@ -29,18 +38,95 @@ class UserStatus(str, Enum):
     DELETED = "deleted"
 
 
+# Wall clock cached at one-second resolution for API key expiry checks,
+# refreshed by run_expiry_clock() while the app's event loop is running
+EXPIRY_CLOCK_INTERVAL = 1.0
+_now_epoch: Optional[float] = None
+
+
+async def run_expiry_clock() -> None:
+    """Keep the cached expiry clock current until cancelled."""
+    global _now_epoch
+    try:
+        while True:
+            _now_epoch = time.time()
+            await asyncio.sleep(EXPIRY_CLOCK_INTERVAL)
+    finally:
+        _now_epoch = None
+
+
+def _current_epoch() -> float:
+    """Cached wall clock, or a fresh reading when the clock task isn't running."""
+    return _now_epoch if _now_epoch is not None else time.time()
+
+
+class _display_name_expression(FunctionElement):
+    """Generation expression for ``users.display_name``, rendered per dialect."""
+    type = String()
+    inherit_cache = True
+
+
+@compiles(_display_name_expression)
+def _compile_display_name(element, compiler, **kw):
+    return "COALESCE(full_name, username, split_part(email, '@', 1))"
+
+
+@compiles(_display_name_expression, "sqlite")
+def _compile_display_name_sqlite(element, compiler, **kw):
+    return "COALESCE(full_name, username, substr(email, 1, instr(email, '@') - 1))"
+
+
+PREMIUM_ROLES = (UserRole.PREMIUM.value, UserRole.MODERATOR.value, UserRole.ADMIN.value)
+
+
 class User(Base):
     """User model."""
     
     __tablename__ = "users"
+    __table_args__ = (
+        CheckConstraint(
+            "role IN ('user', 'premium', 'moderator', 'admin')",
+            name="ck_users_role"
+        ),
+        CheckConstraint(
+            "status IN ('active', 'inactive', 'suspended', 'deleted')",
+            name="ck_users_status"
+        ),
+        # Login lookups compare lower(email), so index and enforce uniqueness on that
+        Index("ix_users_email_lower", func.lower(text("email")), unique=True),
+        # Usernames are likewise unique regardless of case
+        Index("ix_users_username_lower", func.lower(text("username")), unique=True),
+        # Partial index over the users allowed to generate quotes
+        Index(
+            "ix_users_eligible",
+            "id",
+            postgresql_where=text("is_active AND status = 'active'"),
+            sqlite_where=text("is_active AND status = 'active'")
+        ),
+        # Keyset pagination of admin listings on (created_at, id)
+        Index("ix_users_created_id", text("created_at DESC"), text("id DESC")),
+        # Active users, newest first
+        Index(
+            "ix_users_active_created",
+            text("created_at DESC"),
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active")
+        ),
+        # Admin substring search (ILIKE '%term%')
+        trigram_gin_index("ix_users_email_trgm", "email"),
+        trigram_gin_index("ix_users_username_trgm", "username"),
+        trigram_gin_index("ix_users_full_name_trgm", "full_name"),
+    )
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Basic information
-    email = Column(String(255), unique=True, index=True, nullable=False)
+    email = Column(String(255), nullable=False)  # Unique case-insensitively, see ix_users_email_lower
     username = Column(String(50), unique=True, index=True, nullable=True)
     full_name = Column(String(255), nullable=True)
+    # Full name, username or the email's local part; maintained by the database
+    display_name = Column(String(255), Computed(_display_name_expression(), persisted=True))
     hashed_password = Column(String(255), nullable=False)
     
     # Profile information
@@ -50,8 +136,8 @@ class User(Base):
     language = Column(String(10), default="en")
     
     # Account status
-    role = Column(SQLEnum(UserRole), default=UserRole.USER, nullable=False)
-    status = Column(SQLEnum(UserStatus), default=UserStatus.ACTIVE, nullable=False)
+    role = Column(String(20), default=UserRole.USER.value, nullable=False)
+    status = Column(String(20), default=UserStatus.ACTIVE.value, nullable=False)
     is_verified = Column(Boolean, default=False, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     
@@ -75,41 +161,110 @@ class User(Base):
     last_api_call_date = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
-    quotes = relationship("Quote", back_populates="user", cascade="all, delete-orphan")
-    favorites = relationship("QuoteFavorite", back_populates="user", cascade="all, delete-orphan")
-    analytics_events = relationship("AnalyticsEvent", back_populates="user", cascade="all, delete-orphan")
-    sessions = relationship("UserSession", back_populates="user", cascade="all, delete-orphan")
-    voice_recordings = relationship("VoiceRecording", back_populates="user", cascade="all, delete-orphan")
+    quotes = relationship("Quote", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    favorites = relationship("QuoteFavorite", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    analytics_events = relationship("AnalyticsEvent", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    sessions = relationship("UserSession", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    voice_recordings = relationship("VoiceRecording", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email={self.email}, role={self.role})>"
     
-    @property
+    @classmethod
+    def email_matches(cls, email: str):
+        """Case-insensitive email predicate served by ix_users_email_lower."""
+        return func.lower(cls.email) == email.lower()
+    
+    @classmethod
+    def username_matches(cls, username: str):
+        """Case-insensitive username predicate served by ix_users_username_lower."""
+        return func.lower(cls.username) == username.lower()
+    
+    @validates("email")
+    def _normalize_email(self, key: str, email: str) -> str:
+        """Store emails lowercased."""
+        return email.lower() if email else email
+    
+    @validates("role", "status")
+    def _validate_enum_value(self, key: str, value: str) -> str:
+        """Store enum members as their plain string value."""
+        enum_type = UserRole if key == "role" else UserStatus
+        return enum_type(value).value
+    
+    @hybrid_property
     def is_admin(self) -> bool:
         """Check if user is admin."""
         return self.role == UserRole.ADMIN
     
-    @property
+    @hybrid_property
     def is_premium(self) -> bool:
         """Check if user has premium access."""
-        return self.role in [UserRole.PREMIUM, UserRole.MODERATOR, UserRole.ADMIN]
+        return self.role in PREMIUM_ROLES
     
-    @property
-    def display_name(self) -> str:
-        """Get display name (full name or username)."""
-        return self.full_name or self.username or self.email.split("@")[0]
+    @is_premium.expression
+    def is_premium(cls):
+        return cls.role.in_(PREMIUM_ROLES)
     
+    @hybrid_property
     def can_generate_quotes(self) -> bool:
         """Check if user can generate quotes."""
         return self.is_active and self.status == UserStatus.ACTIVE
     
-    def increment_quote_count(self) -> None:
-        """Increment total quotes generated."""
-        self.total_quotes_generated += 1
+    @can_generate_quotes.expression
+    def can_generate_quotes(cls):
+        return and_(cls.is_active.is_(True), cls.status == UserStatus.ACTIVE.value)
+    
+    @staticmethod
+    def _today_start() -> datetime:
+        return datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
     
-    def increment_voice_count(self) -> None:
-        """Increment total voice requests."""
-        self.total_voice_requests += 1
+    @classmethod
+    def bump_quote_count(cls, session: Session, user_id: uuid.UUID, n: int = 1, api_call: bool = False) -> None:
+        """Atomically increment total quotes generated.
+        
+        With ``api_call`` the daily API call counter is bumped in the same
+        UPDATE, restarting from zero on the first call of a new (UTC) day,
+        so concurrent requests can't overwrite each other's counts.
+        """
+        values = {"total_quotes_generated": cls.total_quotes_generated + n}
+        if api_call:
+            values["api_calls_today"] = case(
+                (cls.last_api_call_date >= cls._today_start(), cls.api_calls_today + n),
+                else_=n
+            )
+            values["last_api_call_date"] = func.now()
+        session.execute(update(cls).where(cls.id == user_id).values(**values))
+    
+    @classmethod
+    def count_api_calls_today(cls, session: Session, user_id: uuid.UUID) -> int:
+        """Current daily API call count, read from the database rather than a loaded row."""
+        calls = session.execute(
+            select(case((cls.last_api_call_date >= cls._today_start(), cls.api_calls_today), else_=0))
+            .where(cls.id == user_id)
+        ).scalar()
+        return calls or 0
+    
+    @classmethod
+    def bump_voice_count(cls, session: Session, user_id: uuid.UUID, n: int = 1) -> None:
+        """Atomically increment total voice requests."""
+        session.execute(
+            update(cls)
+            .where(cls.id == user_id)
+            .values(total_voice_requests=cls.total_voice_requests + n)
+        )
+    
+    @classmethod
+    def record_logins(cls, session: Session, logins: Dict[uuid.UUID, datetime]) -> None:
+        """Set ``last_login_at`` for many users in one executemany UPDATE."""
+        if not logins:
+            return
+        table = cls.__table__
+        session.execute(
+            update(table)
+            .where(table.c.id == bindparam("user_id"))
+            .values(last_login_at=bindparam("logged_in_at")),
+            [{"user_id": user_id, "logged_in_at": at} for user_id, at in logins.items()]
+        )
 
 
 class UserProfile(Base):
@@ -172,7 +327,7 @@ class APIKey(Base):
     
     # Key information
     name = Column(String(100), nullable=False)
-    key_hash = Column(String(255), nullable=False)
+    key_hash = Column(LargeBinary(32), unique=True, nullable=False)  # Keyed BLAKE2b digest
     key_prefix = Column(String(20), nullable=False)  # First few chars for identification
     
     # Permissions and limitations
@@ -191,17 +346,30 @@ class APIKey(Base):
     def __repr__(self) -> str:
         return f"<APIKey(id={self.id}, user_id={self.user_id}, name={self.name})>"
     
+    @classmethod
+    def get_by_key(cls, session: Session, api_key: str) -> Optional["APIKey"]:
+        """Look up an API key by its plaintext value with a single index probe."""
+        return session.scalar(select(cls).where(cls.key_hash == hash_api_key(api_key)))
+    
     def is_valid(self) -> bool:
         """Check if API key is valid and active."""
         if not self.is_active:
             return False
         
-        if self.expires_at and self.expires_at < datetime.utcnow():
-            return False
+        if self.expires_at:
+            expires_at = self.expires_at
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            if expires_at.timestamp() < _current_epoch():
+                return False
         
         return True
     
-    def increment_usage(self) -> None:
-        """Increment usage count and update last used timestamp."""
-        self.usage_count += 1
-        self.last_used_at = datetime.utcnow()
\ No newline at end of file
+    @classmethod
+    def record_usage(cls, session: Session, key_id: uuid.UUID) -> None:
+        """Atomically increment usage count and update last used timestamp."""
+        session.execute(
+            update(cls)
+            .where(cls.id == key_id)
+            .values(usage_count=cls.usage_count + 1, last_used_at=func.now())
+        )
\ No newline at end of file
@@ -1,16 +1,23 @@
 """Voice processing model definitions."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Any, Tuple
 from enum import Enum
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, LargeBinary, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, JSON, Index, insert, text,
+    Computed, Enum as SQLEnum, and_, bindparam, column, event, exists, select, table, type_coerce, update
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.ext.mutable import MutableDict
+from sqlalchemy.orm import aliased, deferred, object_session, relationship, Session
 from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import FunctionElement
 import uuid
 
-from src.core.database import Base
+from src.core.database import Base, JSONType, elapsed_seconds, jsonb_gin_index, register_monthly_partitions
 
 
 class VoiceRecordingStatus(str, Enum):
@@ -36,6 +43,18 @@ class VoiceProcessingStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# Jobs still queued or in progress
+OPEN_JOB_STATUSES = tuple(
+    s.value for s in VoiceProcessingStatus
+    if s not in (VoiceProcessingStatus.COMPLETED, VoiceProcessingStatus.FAILED, VoiceProcessingStatus.CANCELLED)
+)
+_OPEN_JOBS = "status IN (%s)" % ", ".join(f"'{s}'" for s in OPEN_JOB_STATUSES)
+
+# Job types the process_voice_recording worker can run; the others are
+# recorded but have no executor yet, so they are never dispatched
+DISPATCHABLE_JOB_TYPES = ("upload_processing",)
+
+
 class AudioFormat(str, Enum):
     """Supported audio formats."""
     WAV = "wav"
@@ -46,23 +65,122 @@ class AudioFormat(str, Enum):
     WEBM = "webm"
 
 
+class _format_duration(FunctionElement):
+    """``MM:SS`` rendering of a seconds column, matching ``duration_formatted``."""
+    type = String()
+    inherit_cache = True
+
+
+@compiles(_format_duration)
+def _compile_format_duration(element, compiler, **kw):
+    seconds = f"COALESCE({compiler.process(element.clauses, **kw)}, 0)"
+    return (
+        f"to_char(floor({seconds} / 60), 'FM9999900') || ':' || "
+        f"to_char(floor(mod(CAST({seconds} AS NUMERIC), 60)), 'FM00')"
+    )
+
+
+@compiles(_format_duration, "sqlite")
+def _compile_format_duration_sqlite(element, compiler, **kw):
+    seconds = f"COALESCE({compiler.process(element.clauses, **kw)}, 0)"
+    return f"printf('%02d:%02d', CAST({seconds} / 60 AS INTEGER), CAST({seconds} AS INTEGER) % 60)"
+
+
+class _has_text_expression(FunctionElement):
+    """Generation expression: the column holds any non-whitespace character."""
+    type = Boolean()
+    inherit_cache = True
+
+
+@compiles(_has_text_expression)
+def _compile_has_text(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return rf"COALESCE({column} ~ '\S', false)"
+
+
+@compiles(_has_text_expression, "sqlite")
+def _compile_has_text_sqlite(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return f"COALESCE(length(trim({column}, ' ' || char(9, 10, 13))) > 0, 0)"
+
+
+class _word_count_expression(FunctionElement):
+    """Generation expression: whitespace-separated words in the column."""
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(_word_count_expression)
+def _compile_word_count(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return (
+        rf"CASE WHEN {column} ~ '\S' "
+        rf"THEN array_length(regexp_split_to_array(btrim({column}, E' \t\n\r'), '\s+'), 1) "
+        f"ELSE 0 END"
+    )
+
+
+@compiles(_word_count_expression, "sqlite")
+def _compile_word_count_sqlite(element, compiler, **kw):
+    # No regular expressions: fold tabs/newlines to spaces, collapse runs
+    # of spaces, then count the separators
+    text_value = compiler.process(element.clauses, **kw)
+    for whitespace in (9, 10, 13):
+        text_value = f"replace({text_value}, char({whitespace}), ' ')"
+    text_value = f"trim({text_value})"
+    for _ in range(4):
+        text_value = f"replace({text_value}, '  ', ' ')"
+    return (
+        f"CASE WHEN {text_value} = '' THEN 0 "
+        f"ELSE length({text_value}) - length(replace({text_value}, ' ', '')) + 1 END"
+    )
+
+
+def _native_enum(enum_class, name: str) -> SQLEnum:
+    """Database enum type storing the members' string values."""
+    return SQLEnum(
+        enum_class,
+        name=name,
+        values_callable=lambda members: [member.value for member in members]
+    )
+
+
 class VoiceRecording(Base):
     """Voice recording model."""
     
     __tablename__ = "voice_recordings"
+    __table_args__ = (
+        # Per-user recording lists, newest first, with or without a status filter
+        Index("ix_vr_user_created", "user_id", "created_at"),
+        Index("ix_vr_user_status_created", "user_id", "status", "created_at"),
+        # Dashboard recording counts over a date window, across users
+        Index("ix_vr_created", "created_at"),
+        # Transcribed recordings per user, for search and dashboard counts
+        Index(
+            "ix_vr_has_transcription",
+            "user_id",
+            "created_at",
+            postgresql_where=text("has_transcription"),
+            sqlite_where=text("has_transcription")
+        ),
+        # Keyword/category containment search
+        jsonb_gin_index("ix_vr_keywords_gin", "keywords"),
+        jsonb_gin_index("ix_vr_categories_gin", "content_categories"),
+    )
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Foreign key
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # File information
     filename = Column(String(255), nullable=False)
     original_filename = Column(String(255), nullable=True)
-    file_path = Column(String(500), nullable=False)
+    file_path = Column(String(500), nullable=False)  # Storage location; audio bytes never live in the database
+    content_hash = Column(String(64), nullable=True, index=True)  # sha256 hex; identical uploads share one stored file
     file_size = Column(Integer, nullable=False)  # bytes
-    file_format = Column(String(10), nullable=False)
+    file_format = Column(_native_enum(AudioFormat, "audio_format"), nullable=False)
     mime_type = Column(String(100), nullable=False)
     
     # Audio properties
@@ -73,22 +191,30 @@ class VoiceRecording(Base):
     
     # Recording metadata
     recorded_at = Column(DateTime(timezone=True), nullable=True)
-    device_info = Column(JSON, nullable=True)  # Recording device information
+    # Large payloads are deferred in the "heavy" group; detail views undefer it
+    device_info = deferred(Column(JSON, nullable=True), group="heavy")  # Recording device information
     quality_score = Column(Float, nullable=True)  # 0-1 audio quality assessment
     
     # Processing status
-    status = Column(String(20), default=VoiceRecordingStatus.UPLOADED)
+    status = Column(
+        _native_enum(VoiceRecordingStatus, "voice_recording_status"),
+        default=VoiceRecordingStatus.UPLOADED,
+        nullable=False,
+        index=True
+    )
     
     # Transcription results
-    transcription = Column(Text, nullable=True)
+    transcription = deferred(Column(Text, nullable=True), group="heavy")
+    # Non-blank transcription present; maintained by the database
+    has_transcription = Column(Boolean, Computed(_has_text_expression(column("transcription")), persisted=True))
     transcription_confidence = Column(Float, nullable=True)  # 0-1
     language_detected = Column(String(10), nullable=True)  # ISO language code
     speaker_count = Column(Integer, nullable=True)  # Number of speakers detected
     
     # Analysis results
-    emotional_analysis = Column(JSON, nullable=True)  # Emotional tone analysis
-    content_categories = Column(JSON, nullable=True)  # Content categorization
-    keywords = Column(JSON, nullable=True)  # Extracted keywords
+    emotional_analysis = deferred(Column(JSONType, nullable=True), group="heavy")  # Emotional tone analysis
+    content_categories = deferred(Column(JSONType, nullable=True), group="heavy")  # Content categorization
+    keywords = deferred(Column(JSONType, nullable=True), group="heavy")  # Extracted keywords
     sentiment_score = Column(Float, nullable=True)  # -1 to 1
     
     # Processing metadata
@@ -99,36 +225,65 @@ class VoiceRecording(Base):
     # Privacy and storage
     is_public = Column(Boolean, default=False)
     retain_audio = Column(Boolean, default=True)  # Whether to keep the audio file
-    auto_delete_at = Column(DateTime(timezone=True), nullable=True)
+    auto_delete_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Swept by the TTL cleanup
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     processed_at = Column(DateTime(timezone=True), nullable=True)
     
-    # Relationships
-    user = relationship("User", back_populates="voice_recordings")
-    processing_jobs = relationship("VoiceProcessingJob", back_populates="recording", cascade="all, delete-orphan")
+    # Relationships; never lazy-loaded, callers opt in with selectinload()
+    user = relationship("User", back_populates="voice_recordings", lazy="raise")
+    processing_jobs = relationship(
+        "VoiceProcessingJob",
+        back_populates="recording",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise"
+    )
+    segments = relationship(
+        "SpeechSegment",
+        back_populates="recording",
+        order_by="SpeechSegment.start_time",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise"
+    )
     
     def __repr__(self) -> str:
         return f"<VoiceRecording(id={self.id}, filename={self.filename}, status={self.status})>"
     
+    @classmethod
+    def tagged_with(cls, dialect_name: str, column, values: List[str]):
+        """Predicate: the JSON array ``column`` contains every one of ``values``.
+        
+        PostgreSQL uses ``@>`` so the GIN index applies; other databases
+        probe the array with ``json_each``.
+        """
+        if dialect_name == "postgresql":
+            return type_coerce(column, JSONB).contains(values)
+        
+        def has(value):
+            elements = func.json_each(column).table_valued("value")
+            return exists(select(1).select_from(elements).where(elements.c.value == value))
+        
+        return and_(*[has(value) for value in values])
+    
     @property
     def is_processed(self) -> bool:
         """Check if recording has been processed."""
         return self.status == VoiceRecordingStatus.PROCESSED
     
-    @property
-    def has_transcription(self) -> bool:
-        """Check if recording has transcription."""
-        return bool(self.transcription and self.transcription.strip())
-    
-    @property
+    @hybrid_property
     def file_size_mb(self) -> float:
         """Get file size in megabytes."""
         return self.file_size / (1024 * 1024) if self.file_size else 0.0
     
-    @property
+    @file_size_mb.expression
+    def file_size_mb(cls):
+        return func.coalesce(cls.file_size, 0) / 1048576.0
+    
+    @hybrid_property
     def duration_formatted(self) -> str:
         """Get formatted duration string."""
         if not self.duration_seconds:
@@ -137,28 +292,60 @@ class VoiceRecording(Base):
         minutes = int(self.duration_seconds // 60)
         seconds = int(self.duration_seconds % 60)
         return f"{minutes:02d}:{seconds:02d}"
+    
+    @duration_formatted.expression
+    def duration_formatted(cls):
+        return _format_duration(cls.duration_seconds)
 
 
 class VoiceProcessingJob(Base):
     """Voice processing job tracking."""
     
     __tablename__ = "voice_processing_jobs"
+    __table_args__ = (
+        # Queue poll: pending jobs, highest priority first, oldest first
+        Index("ix_vpj_status_priority_created", "status", text("priority DESC"), "created_at"),
+        # Per-user job lists, optionally filtered by status
+        Index("ix_vpj_user_status_created", "user_id", "status", "created_at"),
+        # Admin overview counters: open and failed jobs only
+        Index(
+            "ix_vpj_open_created",
+            "created_at",
+            postgresql_where=text(_OPEN_JOBS),
+            sqlite_where=text(_OPEN_JOBS)
+        ),
+        Index(
+            "ix_vpj_failed_created",
+            "created_at",
+            postgresql_where=text("status = 'failed'"),
+            sqlite_where=text("status = 'failed'")
+        ),
+        # Monthly range partitions keep the queue's hot partition small
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Foreign keys
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    recording_id = Column(UUID(as_uuid=True), ForeignKey("voice_recordings.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    recording_id = Column(UUID(as_uuid=True), ForeignKey("voice_recordings.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Job information
-    job_type = Column(String(50), nullable=False)  # transcription, analysis, quote_generation
-    status = Column(String(20), default=VoiceProcessingStatus.PENDING)
+    job_type = Column(String(50), nullable=False, index=True)  # transcription, analysis, quote_generation
+    status = Column(
+        _native_enum(VoiceProcessingStatus, "voice_processing_status"),
+        default=VoiceProcessingStatus.PENDING,
+        nullable=False
+    )
     priority = Column(Integer, default=5)  # 1-10, higher = more priority
     
     # Processing parameters
-    parameters = Column(JSON, nullable=True)  # Job-specific parameters
-    model_config = Column(JSON, nullable=True)  # AI model configuration
+    # Workers update parameters in place, so only it carries mutation tracking;
+    # the other JSON columns are always replaced wholesale
+    parameters = Column(MutableDict.as_mutable(JSON), nullable=True)  # Job-specific parameters
+    # Mapped under a new name so it can't shadow Pydantic's model_config
+    ai_model_config = Column("model_config", JSON, nullable=True)  # AI model configuration
     
     # Progress tracking
     progress_percent = Column(Float, default=0.0)  # 0-100
@@ -188,16 +375,22 @@ class VoiceProcessingJob(Base):
     cost_usd = Column(Float, nullable=True)
     
     # Worker information
-    worker_id = Column(String(100), nullable=True)
+    worker_id = Column(String(100), nullable=True, index=True)
     worker_version = Column(String(50), nullable=True)
     
-    # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Timestamps; created_at is the partition key, so part of the primary key
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=datetime.utcnow,
+        server_default=func.now(),
+        nullable=False
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    # Relationships
-    user = relationship("User")
-    recording = relationship("VoiceRecording", back_populates="processing_jobs")
+    # Relationships; never lazy-loaded, callers opt in with selectinload()
+    user = relationship("User", lazy="raise")
+    recording = relationship("VoiceRecording", back_populates="processing_jobs", lazy="raise")
     
     def __repr__(self) -> str:
         return f"<VoiceProcessingJob(id={self.id}, type={self.job_type}, status={self.status})>"
@@ -224,17 +417,118 @@ class VoiceProcessingJob(Base):
             return delta.total_seconds()
         return None
     
+    def _elapsed_since_start(self):
+        """Seconds since ``started_at``, evaluated by the database on flush."""
+        return elapsed_seconds(object_session(self).bind.dialect.name, VoiceProcessingJob.started_at)
+    
     def mark_started(self) -> None:
         """Mark job as started."""
         self.status = VoiceProcessingStatus.STARTED
-        self.started_at = datetime.utcnow()
+        self.started_at = func.now()
+    
+    @classmethod
+    def start(cls, session: Session, job_id: uuid.UUID, worker_id: str) -> bool:
+        """Start a pending job assigned to ``worker_id``; False if it isn't one.
+        
+        The conditional UPDATE is the only place a job leaves PENDING, so when
+        a job has been queued more than once exactly one worker starts it and
+        the others skip it.
+        """
+        result = session.execute(
+            update(cls)
+            .where(
+                cls.id == job_id,
+                cls.status == VoiceProcessingStatus.PENDING,
+                cls.worker_id == worker_id
+            )
+            .values(status=VoiceProcessingStatus.STARTED, started_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    @classmethod
+    def release(cls, session: Session, job_id: uuid.UUID) -> None:
+        """Put a started job back to PENDING for its worker's own retry."""
+        session.execute(
+            update(cls)
+            .where(cls.id == job_id, cls.status == VoiceProcessingStatus.STARTED)
+            .values(status=VoiceProcessingStatus.PENDING, started_at=None)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @classmethod
+    def requeue_failed(cls, session: Session, job_type: Optional[str] = None) -> int:
+        """Return retryable failed jobs to the queue in one UPDATE; returns how many.
+        
+        No rows are loaded; workers pick the jobs up with ``claim_pending``,
+        so only DISPATCHABLE_JOB_TYPES are requeued.
+        """
+        statement = (
+            update(cls)
+            .where(
+                cls.status == VoiceProcessingStatus.FAILED,
+                cls.retry_count < cls.max_retries,
+                cls.job_type.in_(DISPATCHABLE_JOB_TYPES)
+            )
+            .values(
+                status=VoiceProcessingStatus.PENDING,
+                retry_count=cls.retry_count + 1,
+                error_message=None,
+                error_code=None,
+                started_at=None,
+                completed_at=None,
+                worker_id=None
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if job_type:
+            statement = statement.where(cls.job_type == job_type)
+        return session.execute(statement).rowcount
+    
+    @classmethod
+    def claim_pending(cls, session: Session, limit: int = 32) -> List[Tuple[str, Any]]:
+        """Assign up to ``limit`` requeued jobs to new worker task ids.
+        
+        Only jobs put back by ``requeue_failed`` that no task owns yet are
+        claimed, and only of DISPATCHABLE_JOB_TYPES; new uploads are queued
+        by the upload route itself. ``FOR UPDATE SKIP LOCKED`` lets
+        concurrent dispatchers take disjoint batches; the claim holds until
+        the caller commits. Returns (task_id, row) pairs in queue order,
+        each row having id, recording_id, user_id, parameters and file_path;
+        the worker run under ``task_id`` starts the job with ``start``.
+        """
+        rows = session.execute(
+            select(cls.id, cls.recording_id, cls.user_id, cls.parameters, VoiceRecording.file_path)
+            .join(VoiceRecording, VoiceRecording.id == cls.recording_id)
+            .where(
+                cls.status == VoiceProcessingStatus.PENDING,
+                cls.job_type.in_(DISPATCHABLE_JOB_TYPES),
+                cls.retry_count > 0,
+                cls.worker_id.is_(None)
+            )
+            .order_by(cls.priority.desc(), cls.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=cls)
+        ).all()
+        if not rows:
+            return []
+        
+        claims = [(str(uuid.uuid4()), row) for row in rows]
+        jobs = cls.__table__
+        session.execute(
+            update(jobs)
+            .where(jobs.c.id == bindparam("job_id"))
+            .values(worker_id=bindparam("task_id")),
+            [{"job_id": row.id, "task_id": task_id} for task_id, row in claims]
+        )
+        return claims
     
     def mark_completed(self, result_data: dict = None) -> None:
         """Mark job as completed."""
         self.status = VoiceProcessingStatus.COMPLETED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = func.now()
         self.progress_percent = 100.0
-        self.processing_time = self.calculate_processing_time()
+        self.processing_time = self._elapsed_since_start()
         
         if result_data:
             self.result_data = result_data
@@ -244,15 +538,59 @@ class VoiceProcessingJob(Base):
         self.status = VoiceProcessingStatus.FAILED
         self.error_message = error_message
         self.error_code = error_code
-        self.completed_at = datetime.utcnow()
-        self.processing_time = self.calculate_processing_time()
+        self.completed_at = func.now()
+        self.processing_time = self._elapsed_since_start()
     
     def update_progress(self, percent: float, step: str = None) -> None:
-        """Update job progress."""
+        """Update job progress on a loaded job.
+        
+        Workers heartbeating progress should use ``write_progress`` instead.
+        """
         self.progress_percent = min(100.0, max(0.0, percent))
         if step:
             self.current_step = step
-        self.updated_at = datetime.utcnow()
+        self.updated_at = func.now()
+    
+    @classmethod
+    def finish(
+        cls,
+        session: Session,
+        job_id: uuid.UUID,
+        status: VoiceProcessingStatus,
+        result_data: dict = None,
+        error_message: str = None
+    ) -> None:
+        """Record a job's outcome in one UPDATE, timing it on the database clock."""
+        values = {
+            "status": status,
+            "completed_at": func.now(),
+            "processing_time": elapsed_seconds(session.bind.dialect.name, cls.started_at),
+        }
+        if status == VoiceProcessingStatus.COMPLETED:
+            values["progress_percent"] = 100.0
+        if result_data is not None:
+            values["result_data"] = result_data
+        if error_message is not None:
+            values["error_message"] = error_message
+        session.execute(
+            update(cls)
+            .where(cls.id == job_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @classmethod
+    def write_progress(cls, session: Session, job_id: uuid.UUID, percent: float, step: str = None) -> None:
+        """Write a progress heartbeat with a single UPDATE, without loading the job."""
+        values = {"progress_percent": min(100.0, max(0.0, percent)), "updated_at": func.now()}
+        if step:
+            values["current_step"] = step
+        session.execute(
+            update(cls)
+            .where(cls.id == job_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
 
 
 class VoiceModel(Base):
@@ -301,12 +639,16 @@ class SpeechSegment(Base):
     """Speech segment within a recording."""
     
     __tablename__ = "speech_segments"
+    __table_args__ = (
+        # A recording's transcript is one range scan in playback order
+        Index("ix_ss_recording_start", "recording_id", "start_time"),
+    )
     
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Foreign key
-    recording_id = Column(UUID(as_uuid=True), ForeignKey("voice_recordings.id"), nullable=False)
+    recording_id = Column(UUID(as_uuid=True), ForeignKey("voice_recordings.id", ondelete="CASCADE"), nullable=False)
     
     # Segment information
     start_time = Column(Float, nullable=False)  # seconds
@@ -325,12 +667,100 @@ class SpeechSegment(Base):
     emotional_tone = Column(String(50), nullable=True)
     sentiment_score = Column(Float, nullable=True)  # -1 to 1
     words = Column(JSON, nullable=True)  # Array of word-level data
+    word_count = Column(Integer, Computed(_word_count_expression(column("text")), persisted=True))
+    
+    # Relationships
+    recording = relationship("VoiceRecording", back_populates="segments", lazy="raise")
     
     def __repr__(self) -> str:
         preview = self.text[:50] + "..." if len(self.text) > 50 else self.text
         return f"<SpeechSegment(id={self.id}, text='{preview}')>"
     
-    @property
-    def word_count(self) -> int:
-        """Get word count of the segment."""
-        return len(self.text.split()) if self.text else 0
+    @classmethod
+    def bulk_create(
+        cls,
+        session: Session,
+        rows: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> List[uuid.UUID]:
+        """Insert a transcript's segments with one INSERT ... RETURNING per batch.
+        
+        Returns the new segment ids in the same order as ``rows``.
+        """
+        statement = insert(cls).returning(cls.id, sort_by_parameter_order=True)
+        ids: List[uuid.UUID] = []
+        for start in range(0, len(rows), batch_size):
+            ids.extend(session.execute(statement, rows[start:start + batch_size]).scalars().all())
+        return ids
+
+
+# Job history is partitioned by month (PostgreSQL only)
+register_monthly_partitions(VoiceProcessingJob.__table__)
+
+
+# Snapshot of the newest jobs for the admin listing (PostgreSQL only), so it
+# reads a small, pre-sorted relation instead of every partition of the live
+# table. Refreshed by the refresh_recent_jobs beat task; up to a minute stale.
+RECENT_JOBS_VIEW = "recent_voice_jobs"
+RECENT_JOBS_LIMIT = 10_000
+
+RecentVoiceJob = aliased(
+    VoiceProcessingJob,
+    table(RECENT_JOBS_VIEW, *(column(c.name, c.type) for c in VoiceProcessingJob.__table__.c)),
+    adapt_on_names=True
+)
+
+
+def _create_recent_jobs_view(connection) -> None:
+    """Create the view and its indexes unless they exist; PostgreSQL only."""
+    connection.execute(text(
+        f"CREATE MATERIALIZED VIEW IF NOT EXISTS {RECENT_JOBS_VIEW} AS "
+        f"SELECT * FROM {VoiceProcessingJob.__tablename__} ORDER BY created_at DESC LIMIT {RECENT_JOBS_LIMIT}"
+    ))
+    # REFRESH ... CONCURRENTLY needs a unique index on the view
+    connection.execute(text(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{RECENT_JOBS_VIEW}_id ON {RECENT_JOBS_VIEW} (id, created_at)"
+    ))
+    connection.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_{RECENT_JOBS_VIEW}_created ON {RECENT_JOBS_VIEW} (created_at DESC)"
+    ))
+
+
+@event.listens_for(VoiceProcessingJob.__table__, "after_create")
+def _create_recent_jobs_view_with_table(target, connection, **kw) -> None:
+    if connection.dialect.name == "postgresql":
+        _create_recent_jobs_view(connection)
+
+
+def ensure_recent_jobs_view(bind) -> None:
+    """Create the recent jobs view if missing.
+    
+    ``create_all`` only creates it along with a new jobs table, so databases
+    created before the view existed get it here, at startup. No-op on
+    databases other than PostgreSQL.
+    """
+    if bind.dialect.name != "postgresql":
+        return
+    
+    with bind.begin() as connection:
+        _create_recent_jobs_view(connection)
+
+
+@event.listens_for(VoiceProcessingJob.__table__, "before_drop")
+def _drop_recent_jobs_view(target, connection, **kw) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {RECENT_JOBS_VIEW}"))
+
+
+def refresh_recent_jobs_view(bind) -> None:
+    """Rebuild the recent jobs snapshot without blocking readers.
+    
+    Creates the view first if it is missing. No-op on databases other than
+    PostgreSQL.
+    """
+    if bind.dialect.name != "postgresql":
+        return
+    
+    with bind.begin() as connection:
+        _create_recent_jobs_view(connection)
+        connection.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {RECENT_JOBS_VIEW}"))
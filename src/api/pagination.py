@@ -0,0 +1,26 @@
+"""Keyset pagination cursors shared by the API routers."""
+
+from datetime import datetime
+from typing import Tuple
+import base64
+import uuid
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(sort_value: datetime, row_id: uuid.UUID) -> str:
+    """Opaque keyset cursor for the row a page ended on."""
+    raw = f"{sort_value.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Return the ``(sort value, id)`` key a cursor points past; 400 if malformed."""
+    try:
+        sort_value, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(sort_value), uuid.UUID(row_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
@@ -1,18 +1,24 @@
-"""API routers for Quote Master Pro."""
-from .auth import router as auth_router
-from .users import router as users_router
-from .quotes import router as quotes_router
-from .service_quotes import router as service_quotes_router
-from .voice import router as voice_router
-from .analytics import router as analytics_router
-from .admin import router as admin_router
+"""API routers for Quote Master Pro.
+
+Routers are imported lazily on first attribute access, so importing one
+of them doesn't load every other router with its models and services.
+"""
+import importlib
 
 __all__ = [
     "auth_router",
-    "users_router", 
+    "users_router",
     "quotes_router",
     "service_quotes_router",
     "voice_router",
     "analytics_router",
     "admin_router"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        router = importlib.import_module(f".{name[:-len('_router')]}", __name__).router
+        globals()[name] = router
+        return router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,102 +2,204 @@
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
-
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
-
-from src.core.database import get_db
+from functools import partial
+import asyncio
+import hashlib
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, raiseload, selectinload, undefer_group
+from sqlalchemy import bindparam, func, and_, or_, desc, select, tuple_, update
+
+from src.core.database import SessionLocal, get_db
 from src.api.dependencies import get_current_admin_user
+from src.api.pagination import decode_cursor, encode_cursor
 from src.api.models.user import User, UserRole, UserStatus
 from src.api.models.quote import Quote, QuoteCategory, QuoteStatus
-from src.api.models.voice import VoiceRecording, VoiceProcessingJob
-from src.api.models.analytics import AnalyticsEvent, UserSession
-from src.api.schemas.user import UserResponse
-from src.api.schemas.quote import QuoteCategoryCreate, QuoteCategoryUpdate, QuoteCategoryResponse
-
+from src.api.models.voice import (
+    VoiceRecording, VoiceProcessingJob, VoiceProcessingStatus, OPEN_JOB_STATUSES, RecentVoiceJob
+)
+from src.api.models.analytics import DailyActiveUsers, UserSession
+from src.api.schemas.user import AdminUserUpdate, UserResponse
+from src.api.schemas.quote import (
+    AdminQuoteResponse, QuoteCategoryCreate, QuoteCategoryUpdate, QuoteCategoryResponse, QuoteModerationBulk
+)
+from src.services.cache.response_cache import cache_service
+from src.services.cache.user_cache import invalidate_user
+
+# Handlers use the blocking Session, so they are plain ``def`` and run in the
+# threadpool; async ones push their queries to an executor
 router = APIRouter()
 
+# Platform-wide counters only (no PII), so one cache entry serves every admin
+OVERVIEW_CACHE_KEY = "admin:overview"
+OVERVIEW_CACHE_TTL = 120  # seconds
 
-# System Overview
-@router.get("/overview")
-async def get_system_overview(
-    current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
-):
-    """Get system overview statistics."""
+
+# Runs of characters replaced by a single hyphen in category slugs
+_SLUG_RE = re.compile(r'[^a-zA-Z0-9]+')
+
+# Shortest term the trigram indexes can serve; shorter terms match as prefixes
+MIN_SUBSTRING_SEARCH = 3
+
+
+def _search_filter(search: str, *columns):
+    """ILIKE over ``columns``, served by their trigram indexes on PostgreSQL."""
+    pattern = f"%{search}%" if len(search) >= MIN_SUBSTRING_SEARCH else f"{search}%"
+    return or_(*(column.ilike(pattern) for column in columns))
+
+
+def _paginate(query, model, response: Response, cursor: Optional[str], skip: int,
+              limit: int, sort_by: str, sort_order: str) -> list:
+    """Apply ordering and pagination to an admin listing.
     
-    # User statistics
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_active == True).count()
-    premium_users = db.query(User).filter(User.role.in_([UserRole.PREMIUM, UserRole.MODERATOR, UserRole.ADMIN])).count()
-    verified_users = db.query(User).filter(User.is_verified == True).count()
+    Listings ordered by ``created_at`` page by keyset on ``(created_at, id)``:
+    each page is an index seek past the cursor, however deep. The cursor for
+    the next page is returned in the ``X-Next-Cursor`` header. Other sort
+    orders fall back to ``skip``/``limit``.
+    """
+    if sort_by != "created_at":
+        if cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination requires sort_by=created_at"
+            )
+        sort_column = getattr(model, sort_by, model.created_at)
+        query = query.order_by(desc(sort_column) if sort_order == "desc" else sort_column)
+        return query.offset(skip).limit(limit).all()
     
-    # New users in last 30 days
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    new_users_30d = db.query(User).filter(User.created_at >= thirty_days_ago).count()
+    key = tuple_(model.created_at, model.id)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor))
+        query = query.filter(key < after if sort_order == "desc" else key > after)
+    elif skip:
+        query = query.offset(skip)
     
-    # Quote statistics
-    total_quotes = db.query(Quote).count()
-    published_quotes = db.query(Quote).filter(Quote.status == QuoteStatus.PUBLISHED).count()
-    quotes_today = db.query(Quote).filter(
-        Quote.created_at >= datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    ).count()
+    if sort_order == "desc":
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at, model.id)
+    
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    return rows
+
+
+# Overview counters, built once at import: each request only binds the
+# cut-offs and reuses the cached compiled SQL
+_USER_COUNTS = select(
+    func.count().label("total"),
+    func.count().filter(User.is_active == True).label("active"),
+    func.count().filter(User.is_premium).label("premium"),
+    func.count().filter(User.is_verified == True).label("verified"),
+    func.count().filter(User.created_at >= bindparam("thirty_days_ago")).label("new_30d"),
+).select_from(User)
+
+_QUOTE_COUNTS = select(
+    func.count().label("total"),
+    func.count().filter(Quote.status == QuoteStatus.PUBLISHED).label("published"),
+    func.count().filter(Quote.created_at >= bindparam("start_of_day")).label("today"),
+    func.count().filter(Quote.created_at >= bindparam("thirty_days_ago")).label("new_30d"),
+).select_from(Quote)
+
+_RECORDING_COUNTS = select(
+    func.count().label("total_recordings"),
+    func.count().filter(VoiceRecording.created_at >= bindparam("thirty_days_ago")).label("new_30d"),
+).select_from(VoiceRecording)
+
+_JOB_COUNTS = select(
+    func.count().filter(VoiceProcessingJob.status.in_(OPEN_JOB_STATUSES)).label("pending_jobs"),
+    func.count().filter(VoiceProcessingJob.status == VoiceProcessingStatus.FAILED).label("failed_jobs"),
+).select_from(VoiceProcessingJob)
+
+
+def _count(*statements, **params) -> Dict[str, int]:
+    """Execute counter statements on one session and merge their rows."""
+    counts = {}
+    with SessionLocal() as session:
+        for statement in statements:
+            counts.update(session.execute(statement, params).one()._mapping)
+    return counts
+
+
+async def _count_overview(now: datetime) -> Dict[str, Any]:
+    """Run the overview counters concurrently, one pooled connection each.
+    
+    The queries are blocking, so each runs in the default executor with its
+    own session; wall time is the slowest query rather than their sum.
+    """
+    
+    # Bound once so every counter shares the same cut-off
+    thirty_days_ago = now - timedelta(days=30)
+    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    loop = asyncio.get_running_loop()
+    users, quotes, voice = await asyncio.gather(
+        loop.run_in_executor(None, partial(_count, _USER_COUNTS, thirty_days_ago=thirty_days_ago)),
+        loop.run_in_executor(None, partial(
+            _count, _QUOTE_COUNTS, thirty_days_ago=thirty_days_ago, start_of_day=start_of_day
+        )),
+        loop.run_in_executor(None, partial(
+            _count, _RECORDING_COUNTS, _JOB_COUNTS, thirty_days_ago=thirty_days_ago
+        )),
+    )
     
-    quotes_30d = db.query(Quote).filter(Quote.created_at >= thirty_days_ago).count()
+    return {"users": users, "quotes": quotes, "voice": voice}
+
+
+# System Overview
+@router.get("/overview")
+async def get_system_overview(
+    response: Response,
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Get system overview statistics.
     
-    # Voice statistics
-    total_recordings = db.query(VoiceRecording).count()
-    recordings_30d = db.query(VoiceRecording).filter(VoiceRecording.created_at >= thirty_days_ago).count()
+    Served from the response cache for up to OVERVIEW_CACHE_TTL seconds;
+    the admin dependency still runs on every request.
+    """
     
-    # Processing jobs
-    pending_jobs = db.query(VoiceProcessingJob).filter(
-        VoiceProcessingJob.status.in_(["pending", "started", "processing"])
-    ).count()
+    cached = await cache_service.get_cached_response(OVERVIEW_CACHE_KEY, {})
+    if cached:
+        response.headers["X-Cache"] = "HIT"
+        return {k: v for k, v in cached.items() if not k.startswith("_cache")}
     
-    failed_jobs = db.query(VoiceProcessingJob).filter(
-        VoiceProcessingJob.status == "failed"
-    ).count()
+    now = datetime.utcnow()
+    counters = await _count_overview(now)
     
     # System health
     db_healthy = True  # TODO: Implement actual health check
     redis_healthy = True  # TODO: Implement Redis health check
     ai_services_healthy = True  # TODO: Implement AI services health check
     
-    return {
-        "timestamp": datetime.utcnow(),
-        "users": {
-            "total": total_users,
-            "active": active_users,
-            "premium": premium_users,
-            "verified": verified_users,
-            "new_30d": new_users_30d,
-        },
-        "quotes": {
-            "total": total_quotes,
-            "published": published_quotes,
-            "today": quotes_today,
-            "new_30d": quotes_30d,
-        },
-        "voice": {
-            "total_recordings": total_recordings,
-            "new_30d": recordings_30d,
-            "pending_jobs": pending_jobs,
-            "failed_jobs": failed_jobs,
-        },
+    overview = jsonable_encoder({
+        "timestamp": now,
+        **counters,
         "system_health": {
             "database": db_healthy,
             "redis": redis_healthy,
             "ai_services": ai_services_healthy,
             "overall": db_healthy and redis_healthy and ai_services_healthy,
         }
-    }
+    })
+    
+    await cache_service.cache_response(OVERVIEW_CACHE_KEY, {}, overview, ttl=OVERVIEW_CACHE_TTL)
+    response.headers["X-Cache"] = "MISS"
+    
+    return overview
 
 
 # User Management
 @router.get("/users", response_model=List[UserResponse])
-async def admin_list_users(
-    skip: int = Query(0, ge=0),
+def admin_list_users(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(50, ge=1, le=200),
     search: Optional[str] = Query(None),
     role: Optional[UserRole] = Query(None),
@@ -111,17 +213,12 @@ async def admin_list_users(
 ):
     """List and filter users."""
     
-    query = db.query(User)
+    # UserResponse reads no relationships; fail loudly rather than N+1 if one is added
+    query = db.query(User).options(raiseload("*"))
     
     # Apply filters
     if search:
-        query = query.filter(
-            or_(
-                User.email.ilike(f"%{search}%"),
-                User.username.ilike(f"%{search}%"),
-                User.full_name.ilike(f"%{search}%")
-            )
-        )
+        query = query.filter(_search_filter(search, User.email, User.username, User.full_name))
     
     if role:
         query = query.filter(User.role == role)
@@ -135,28 +232,26 @@ async def admin_list_users(
     if is_active is not None:
         query = query.filter(User.is_active == is_active)
     
-    # Apply sorting
-    sort_column = getattr(User, sort_by, User.created_at)
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
-    else:
-        query = query.order_by(sort_column)
-    
-    users = query.offset(skip).limit(limit).all()
-    
-    return users
+    return _paginate(query, User, response, cursor, skip, limit, sort_by, sort_order)
 
 
-@router.put("/users/{user_id}")
-async def admin_update_user(
+@router.put("/users/{user_id}", response_model=UserResponse)
+def admin_update_user(
     user_id: str,
-    updates: Dict[str, Any],
+    updates: AdminUserUpdate,
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """Update user account (admin only)."""
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # One UPDATE ... RETURNING instead of SELECT, UPDATE and refresh;
+    # only the fields the admin sent, and the schema admits nothing else
+    user = db.scalars(
+        update(User)
+        .where(User.id == user_id)
+        .values(**updates.model_dump(exclude_unset=True), updated_at=func.now())
+        .returning(User)
+    ).first()
     
     if not user:
         raise HTTPException(
@@ -164,26 +259,16 @@ async def admin_update_user(
             detail="User not found"
         )
     
-    # Define allowed fields for admin updates
-    allowed_fields = {
-        'role', 'status', 'is_active', 'is_verified', 
-        'subscription_tier', 'subscription_expires_at'
-    }
-    
-    # Apply updates
-    for field, value in updates.items():
-        if field in allowed_fields and hasattr(user, field):
-            setattr(user, field, value)
-    
-    user.updated_at = datetime.utcnow()
+    response = UserResponse.model_validate(user)
     db.commit()
-    db.refresh(user)
+    # A bulk UPDATE, so the ORM listeners didn't see it
+    invalidate_user(user.id)
     
-    return user
+    return response
 
 
 @router.delete("/users/{user_id}")
-async def admin_delete_user(
+def admin_delete_user(
     user_id: str,
     permanent: bool = Query(False),
     current_admin: User = Depends(get_current_admin_user),
@@ -214,18 +299,20 @@ async def admin_delete_user(
         # Soft deletion
         user.status = UserStatus.DELETED
         user.is_active = False
-        user.updated_at = datetime.utcnow()
         message = "User account deactivated"
     
     db.commit()
+    invalidate_user(user_id)
     
     return {"message": message}
 
 
 # Quote Management
-@router.get("/quotes")
-async def admin_list_quotes(
-    skip: int = Query(0, ge=0),
+@router.get("/quotes", response_model=List[AdminQuoteResponse])
+def admin_list_quotes(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(50, ge=1, le=200),
     status: Optional[QuoteStatus] = Query(None),
     is_approved: Optional[bool] = Query(None),
@@ -239,7 +326,13 @@ async def admin_list_quotes(
 ):
     """List and filter quotes."""
     
-    query = db.query(Quote)
+    # Everything AdminQuoteResponse reads, loaded per page rather than per row
+    query = db.query(Quote).options(
+        selectinload(Quote.user),
+        selectinload(Quote.category),
+        undefer_group("analysis"),
+        raiseload("*")
+    )
     
     # Apply filters
     if status:
@@ -252,31 +345,16 @@ async def admin_list_quotes(
         query = query.filter(Quote.is_featured == is_featured)
     
     if search:
-        query = query.filter(
-            or_(
-                Quote.text.ilike(f"%{search}%"),
-                Quote.author.ilike(f"%{search}%"),
-                Quote.context.ilike(f"%{search}%")
-            )
-        )
+        query = query.filter(_search_filter(search, Quote.text, Quote.author, Quote.context))
     
     if user_id:
         query = query.filter(Quote.user_id == user_id)
     
-    # Apply sorting
-    sort_column = getattr(Quote, sort_by, Quote.created_at)
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
-    else:
-        query = query.order_by(sort_column)
-    
-    quotes = query.offset(skip).limit(limit).all()
-    
-    return quotes
+    return _paginate(query, Quote, response, cursor, skip, limit, sort_by, sort_order)
 
 
 @router.put("/quotes/{quote_id}/moderate")
-async def moderate_quote(
+def moderate_quote(
     quote_id: str,
     action: str = Query(..., pattern="^(approve|reject|feature|unfeature)$"),
     notes: Optional[str] = None,
@@ -303,7 +381,7 @@ async def moderate_quote(
         message = "Quote rejected"
     elif action == "feature":
         quote.is_featured = True
-        quote.featured_at = datetime.utcnow()
+        quote.featured_at = func.now()
         message = "Quote featured"
     elif action == "unfeature":
         quote.is_featured = False
@@ -313,33 +391,84 @@ async def moderate_quote(
     if notes:
         quote.moderation_notes = notes
     
-    quote.updated_at = datetime.utcnow()
     db.commit()
     
     return {"message": message, "quote_id": quote_id}
 
 
+@router.post("/quotes/moderate/bulk")
+def moderate_quotes_bulk(
+    moderation: QuoteModerationBulk,
+    current_admin: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Moderate many quotes in one UPDATE and one transaction."""
+    
+    values = {
+        "approve": {"is_approved": True, "status": QuoteStatus.PUBLISHED},
+        "reject": {"is_approved": False, "status": QuoteStatus.ARCHIVED},
+        "feature": {"is_featured": True, "featured_at": func.now()},
+        "unfeature": {"is_featured": False, "featured_at": None},
+    }[moderation.action]
+    
+    if moderation.notes:
+        values["moderation_notes"] = moderation.notes
+    
+    result = db.execute(
+        update(Quote)
+        .where(Quote.id.in_(moderation.quote_ids))
+        .values(**values, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    
+    return {
+        "message": f"{result.rowcount} quotes updated",
+        "action": moderation.action,
+        "updated": result.rowcount
+    }
+
+
 # Category Management
 @router.get("/categories", response_model=List[QuoteCategoryResponse])
-async def admin_list_categories(
+def admin_list_categories(
+    request: Request,
+    response: Response,
     include_inactive: bool = Query(False),
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """List quote categories."""
+    """List quote categories.
+    
+    Sends an ETag over the listed rows' count and latest change; a client
+    presenting it in If-None-Match gets 304 without the listing being read.
+    """
     
     query = db.query(QuoteCategory)
     
     if not include_inactive:
         query = query.filter(QuoteCategory.is_active == True)
     
+    # Count catches deletions, the latest timestamp catches inserts and edits
+    count, latest = query.with_entities(
+        func.count(),
+        func.max(func.coalesce(QuoteCategory.updated_at, QuoteCategory.created_at))
+    ).one()
+    etag = '"%s"' % hashlib.md5(f"{include_inactive}|{count}|{latest}".encode()).hexdigest()
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
     categories = query.order_by(QuoteCategory.sort_order, QuoteCategory.name).all()
     
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, max-age=60"
+    
     return categories
 
 
 @router.post("/categories", response_model=QuoteCategoryResponse, status_code=status.HTTP_201_CREATED)
-async def admin_create_category(
+def admin_create_category(
     category_data: QuoteCategoryCreate,
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
@@ -347,36 +476,41 @@ async def admin_create_category(
     """Create a new quote category."""
     
     # Generate slug from name
-    import re
-    slug = re.sub(r'[^a-zA-Z0-9]+', '-', category_data.name.lower()).strip('-')
+    slug = _SLUG_RE.sub('-', category_data.name.lower()).strip('-')
+    
+    # Single INSERT; a conflicting name or slug inserts nothing instead of
+    # racing a separate existence check
+    dialect_insert = sqlite.insert if db.bind.dialect.name == "sqlite" else postgresql.insert
+    category = db.scalars(
+        dialect_insert(QuoteCategory)
+        .values(
+            name=category_data.name,
+            slug=slug,
+            description=category_data.description,
+            color=category_data.color,
+            icon=category_data.icon,
+            parent_id=category_data.parent_id,
+            sort_order=category_data.sort_order
+        )
+        .on_conflict_do_nothing()
+        .returning(QuoteCategory)
+    ).first()
     
-    # Check if slug already exists
-    existing_category = db.query(QuoteCategory).filter(QuoteCategory.slug == slug).first()
-    if existing_category:
+    if category is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Category with this name already exists"
         )
     
-    category = QuoteCategory(
-        name=category_data.name,
-        slug=slug,
-        description=category_data.description,
-        color=category_data.color,
-        icon=category_data.icon,
-        parent_id=category_data.parent_id,
-        sort_order=category_data.sort_order
-    )
-    
-    db.add(category)
+    # RETURNING loaded every column; serialize before commit expires them
+    response = QuoteCategoryResponse.model_validate(category)
     db.commit()
-    db.refresh(category)
     
-    return category
+    return response
 
 
 @router.put("/categories/{category_id}", response_model=QuoteCategoryResponse)
-async def admin_update_category(
+def admin_update_category(
     category_id: str,
     category_update: QuoteCategoryUpdate,
     current_admin: User = Depends(get_current_admin_user),
@@ -396,8 +530,7 @@ async def admin_update_category(
     for field, value in category_update.dict(exclude_unset=True).items():
         if field == "name" and value:
             # Update slug when name changes
-            import re
-            new_slug = re.sub(r'[^a-zA-Z0-9]+', '-', value.lower()).strip('-')
+            new_slug = _SLUG_RE.sub('-', value.lower()).strip('-')
             
             # Check if new slug conflicts
             existing = db.query(QuoteCategory).filter(
@@ -415,7 +548,6 @@ async def admin_update_category(
         
         setattr(category, field, value)
     
-    category.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(category)
     
@@ -423,7 +555,7 @@ async def admin_update_category(
 
 
 @router.delete("/categories/{category_id}")
-async def admin_delete_category(
+def admin_delete_category(
     category_id: str,
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
@@ -438,13 +570,15 @@ async def admin_delete_category(
             detail="Category not found"
         )
     
-    # Check if category has quotes
-    quote_count = db.query(Quote).filter(Quote.category_id == category_id).count()
+    # Stops at the first quote instead of counting them all
+    has_quotes = db.query(
+        db.query(Quote.id).filter(Quote.category_id == category_id).exists()
+    ).scalar()
     
-    if quote_count > 0:
+    if has_quotes:
         # Soft delete if has quotes
         category.is_active = False
-        message = f"Category deactivated ({quote_count} quotes remain)"
+        message = "Category deactivated (it still has quotes)"
     else:
         # Hard delete if no quotes
         db.delete(category)
@@ -458,68 +592,91 @@ async def admin_delete_category(
 # System Maintenance
 @router.post("/maintenance/cleanup")
 async def run_cleanup(
-    background_tasks: BackgroundTasks,
     cleanup_type: str = Query(..., pattern="^(temp_files|old_sessions|failed_jobs|deleted_users)$"),
-    current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    current_admin: User = Depends(get_current_admin_user)
 ):
-    """Run system cleanup tasks."""
+    """Run system cleanup tasks.
+    
+    Queued on the maintenance workers; a cleanup of the same type that is
+    still pending or running is reused rather than queued twice.
+    """
     
-    background_tasks.add_task(execute_cleanup_task, cleanup_type)
+    from src.workers.background_tasks import get_task_manager
     
-    return {"message": f"Cleanup task '{cleanup_type}' started"}
+    task_id = await get_task_manager().schedule_cleanup_task(cleanup_type, {}, dedupe=True)
+    
+    return {"message": f"Cleanup task '{cleanup_type}' queued", "task_id": task_id}
 
 
 @router.get("/maintenance/jobs")
-async def list_background_jobs(
+def list_background_jobs(
     job_type: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """List background processing jobs."""
+    """List background processing jobs.
+    
+    On PostgreSQL this reads the recent_voice_jobs snapshot, which is
+    refreshed every minute, rather than the live table.
+    """
     
-    query = db.query(VoiceProcessingJob)
+    job = RecentVoiceJob if db.get_bind().dialect.name == "postgresql" else VoiceProcessingJob
+    query = db.query(job)
     
     if job_type:
-        query = query.filter(VoiceProcessingJob.job_type == job_type)
+        query = query.filter(job.job_type == job_type)
     
     if status:
-        query = query.filter(VoiceProcessingJob.status == status)
+        query = query.filter(job.status == status)
     
-    jobs = query.order_by(desc(VoiceProcessingJob.created_at)).limit(100).all()
+    jobs = query.order_by(desc(job.created_at)).limit(100).all()
     
     return jobs
 
 
 @router.post("/maintenance/retry-failed-jobs")
-async def retry_failed_jobs(
-    background_tasks: BackgroundTasks,
+def retry_failed_jobs(
     job_type: Optional[str] = Query(None),
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Retry failed processing jobs."""
+    """Retry failed processing jobs.
     
-    query = db.query(VoiceProcessingJob).filter(
-        VoiceProcessingJob.status == "failed",
-        VoiceProcessingJob.retry_count < VoiceProcessingJob.max_retries
-    )
+    Requeues them in a single UPDATE and leaves dispatch to the workers;
+    no job rows are loaded here.
+    """
     
-    if job_type:
-        query = query.filter(VoiceProcessingJob.job_type == job_type)
+    requeued = VoiceProcessingJob.requeue_failed(db, job_type)
+    db.commit()
+    
+    if requeued:
+        from src.workers.background_tasks import get_task_manager
+        get_task_manager().schedule_voice_job_dispatch()
+    
+    return {"message": f"Retrying {requeued} failed jobs"}
+
+
+def _daily_active_users(db: Session, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+    """Distinct active users for every day from start_date to end_date, including idle days.
     
-    failed_jobs = query.all()
+    Past days come from the DailyActiveUsers rollup, so the cost grows with
+    the number of days rather than events; today, and days not rolled up
+    yet, are counted live.
+    """
+    start_day, today = start_date.date(), end_date.date()
     
-    for job in failed_jobs:
-        background_tasks.add_task(retry_processing_job, job.id)
+    counts = DailyActiveUsers.daily_counts(db, start_day, today)
     
-    return {"message": f"Retrying {len(failed_jobs)} failed jobs"}
+    return [
+        {"date": str(day), "active_users": counts.get(day, 0)}
+        for day in (start_day + timedelta(days=offset) for offset in range((today - start_day).days + 1))
+    ]
 
 
 # Reports
 @router.get("/reports/user-activity")
-async def get_user_activity_report(
+def get_user_activity_report(
     days: int = Query(30, ge=1, le=365),
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
@@ -529,14 +686,7 @@ async def get_user_activity_report(
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
     
-    # Daily active users
-    daily_active = db.query(
-        func.date(AnalyticsEvent.timestamp).label('date'),
-        func.count(func.distinct(AnalyticsEvent.user_id)).label('active_users')
-    ).filter(
-        AnalyticsEvent.timestamp >= start_date,
-        AnalyticsEvent.user_id.isnot(None)
-    ).group_by(func.date(AnalyticsEvent.timestamp)).all()
+    daily_active = _daily_active_users(db, start_date, end_date)
     
     # User retention
     # TODO: Implement retention calculation
@@ -545,22 +695,7 @@ async def get_user_activity_report(
         "period": f"{days} days",
         "start_date": start_date,
         "end_date": end_date,
-        "daily_active_users": [
-            {"date": str(day.date), "active_users": day.active_users}
-            for day in daily_active
-        ],
+        "daily_active_users": daily_active,
         "retention_cohorts": []  # TODO: Implement
     }
 
-
-# Background task functions
-async def execute_cleanup_task(cleanup_type: str):
-    """Execute system cleanup task."""
-    # TODO: Implement cleanup tasks
-    pass
-
-
-async def retry_processing_job(job_id: str):
-    """Retry a failed processing job."""
-    # TODO: Implement job retry logic
-    pass
\ No newline at end of file
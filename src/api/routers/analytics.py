@@ -2,26 +2,32 @@
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
+from functools import partial
+import asyncio
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session, undefer_group
+from sqlalchemy import bindparam, case, func, and_, lambda_stmt, or_, select, tuple_
 
-from src.core.database import get_db
+from src.core.database import approx_row_count, get_db, time_ordered_uuid
 from src.api.dependencies import (
     get_current_user,
     get_current_admin_user,
     get_optional_current_user,
     get_user_session
 )
+from src.api.pagination import decode_cursor, encode_cursor
 from src.api.models.user import User
 from src.api.models.analytics import (
     AnalyticsEvent,
     UserSession,
     PageView,
     ConversionEvent,
+    DailySessionMetrics,
     FunnelStep,
-    EventType
+    EventType,
+    event_type_id
 )
 from src.api.models.quote import Quote
 from src.api.models.voice import VoiceRecording
@@ -43,182 +49,114 @@ from src.api.schemas.analytics import (
     FunnelAnalysis,
     ABTestResult
 )
+from src.services.analytics.tracker import DURABLE_EVENT_TYPES, get_analytics_tracker
+from src.services.cache.response_cache import cache_service
 
+# Handlers that only use the blocking Session are plain ``def`` and run in
+# the threadpool; async ones push their queries to an executor
 router = APIRouter()
 
+DASHBOARD_CACHE_KEY = "analytics:dashboard"
+DASHBOARD_CACHE_TTL = 60  # seconds; dashboards refresh about once a minute
 
-@router.post("/events", response_model=AnalyticsEventResponse, status_code=status.HTTP_201_CREATED)
-async def track_event(
-    event_data: AnalyticsEventCreate,
-    request: Request,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user),
-    session: Optional[UserSession] = Depends(get_user_session)
-):
-    """Track an analytics event."""
-    
-    # Extract request information
-    user_agent = request.headers.get("user-agent")
-    ip_address = request.client.host if request.client else None
-    
-    # Create event
-    event = AnalyticsEvent(
-        user_id=current_user.id if current_user else None,
-        session_id=session.id if session else None,
-        event_type=event_data.event_type,
-        event_name=event_data.event_name,
-        event_category=event_data.event_category,
-        properties=event_data.properties,
-        value=event_data.value,
-        page_url=event_data.page_url,
-        page_title=event_data.page_title,
-        referrer=event_data.referrer,
-        user_agent=user_agent,
-        ip_address=ip_address,
-        device_type=event_data.device_type,
-        browser=event_data.browser,
-        operating_system=event_data.operating_system,
-        screen_resolution=event_data.screen_resolution,
-        country=event_data.country,
-        region=event_data.region,
-        city=event_data.city,
-        timezone=event_data.timezone,
-        page_load_time=event_data.page_load_time,
-        api_response_time=event_data.api_response_time,
-        experiment_id=event_data.experiment_id,
-        variant=event_data.variant
-    )
-    
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    
-    return event
+REPORT_CACHE_KEY = "analytics:report"
+REPORT_CACHE_TTL = 300  # seconds
 
 
-@router.post("/page-views", response_model=PageViewResponse, status_code=status.HTTP_201_CREATED)
-async def track_page_view(
-    page_view_data: PageViewCreate,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user),
-    session: Optional[UserSession] = Depends(get_user_session)
-):
-    """Track a page view."""
-    
-    page_view = PageView(
-        user_id=current_user.id if current_user else None,
-        session_id=session.id if session else None,
-        url=page_view_data.url,
-        title=page_view_data.title,
-        path=page_view_data.path,
-        query_params=page_view_data.query_params,
-        referrer=page_view_data.referrer,
-        previous_page=page_view_data.previous_page,
-        time_on_page=page_view_data.time_on_page,
-        load_time=page_view_data.load_time,
-        scroll_depth=page_view_data.scroll_depth,
-        clicks=page_view_data.clicks,
-        interactions=page_view_data.interactions
-    )
-    
-    db.add(page_view)
-    
-    # Update session page view count
-    if session:
-        session.page_views += 1
-        session.last_activity_at = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(page_view)
-    
-    return page_view
+# Dashboard aggregates, one statement per table, built once at import;
+# each request only binds the window boundaries. Session and page view
+# totals come from the DailySessionMetrics rollup; distinct visitors
+# don't add up across days, so they are counted live from
+# ix_user_sessions_started_user.
+_VISITOR_METRICS = select(
+    func.count(func.distinct(UserSession.user_id)).label("known_visitors"),
+    func.max(case((UserSession.user_id.is_(None), 1), else_=0)).label("anonymous_visitors"),
+).where(UserSession.started_at >= bindparam("start_date"))
 
+_QUOTE_METRICS = select(
+    func.count().filter(Quote.created_at >= bindparam("start_date")).label("total"),
+    func.count().filter(Quote.created_at >= bindparam("today_start")).label("today"),
+    func.count().filter(Quote.created_at >= bindparam("week_start")).label("this_week"),
+    func.count().filter(Quote.created_at >= bindparam("month_start")).label("this_month"),
+).where(Quote.created_at >= bindparam("since"))
 
-@router.post("/conversions", response_model=ConversionEventResponse, status_code=status.HTTP_201_CREATED)
-async def track_conversion(
-    conversion_data: ConversionEventCreate,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user),
-    session: Optional[UserSession] = Depends(get_user_session)
-):
-    """Track a conversion event."""
-    
-    conversion = ConversionEvent(
-        user_id=current_user.id if current_user else None,
-        session_id=session.id if session else None,
-        goal_name=conversion_data.goal_name,
-        goal_category=conversion_data.goal_category,
-        value=conversion_data.value,
-        first_touch_source=conversion_data.first_touch_source,
-        last_touch_source=conversion_data.last_touch_source,
-        conversion_path=conversion_data.conversion_path,
-        time_to_conversion=conversion_data.time_to_conversion,
-        properties=conversion_data.properties
-    )
-    
-    db.add(conversion)
-    
-    # Mark session as converted
-    if session:
-        session.converted = True
-    
-    db.commit()
-    db.refresh(conversion)
-    
-    return conversion
+_RECORDING_METRICS = select(
+    func.count().filter(VoiceRecording.created_at >= bindparam("start_date")).label("total"),
+    func.count().filter(VoiceRecording.created_at >= bindparam("today_start")).label("today"),
+    func.count().filter(VoiceRecording.created_at >= bindparam("week_start")).label("this_week"),
+    func.count().filter(VoiceRecording.created_at >= bindparam("month_start")).label("this_month"),
+    func.sum(VoiceRecording.duration_seconds).filter(
+        VoiceRecording.created_at >= bindparam("start_date")
+    ).label("total_duration"),
+    func.avg(VoiceRecording.duration_seconds).filter(
+        VoiceRecording.created_at >= bindparam("start_date")
+    ).label("avg_duration"),
+).where(VoiceRecording.created_at >= bindparam("since"))
 
+# All-time user total when ``exact`` is requested; otherwise estimated
+_TOTAL_USERS = select(func.count()).select_from(User)
 
-@router.get("/dashboard", response_model=DashboardData)
-async def get_dashboard_data(
-    days: int = Query(7, ge=1, le=365),
-    current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
-):
-    """Get dashboard analytics data."""
+# Custom report metrics over [start_date, end_date], combined per request
+# into a single SELECT of scalar subqueries
+_REPORT_METRICS = {
+    "page_views": select(func.count()).select_from(PageView).where(
+        PageView.viewed_at.between(bindparam("start_date"), bindparam("end_date"))
+    ),
+    "unique_visitors": select(
+        func.count(func.distinct(UserSession.user_id))
+        + func.coalesce(func.max(case((UserSession.user_id.is_(None), 1), else_=0)), 0)
+    ).where(UserSession.started_at.between(bindparam("start_date"), bindparam("end_date"))),
+    "sessions": select(func.count()).select_from(UserSession).where(
+        UserSession.started_at.between(bindparam("start_date"), bindparam("end_date"))
+    ),
+    "quotes_generated": select(func.count()).select_from(Quote).where(
+        Quote.created_at.between(bindparam("start_date"), bindparam("end_date"))
+    ),
+}
+
+
+def _build_dashboard(db: Session, days: int, exact: bool = False) -> DashboardData:
+    """Run the dashboard aggregates; blocking, so called in the executor.
+    
+    The all-time user total comes from the planner's row estimate unless
+    ``exact`` is set; the windowed counts are always exact.
+    """
     
     # Calculate date range
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
+    params = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "today_start": end_date.replace(hour=0, minute=0, second=0, microsecond=0),
+        "week_start": end_date - timedelta(days=7),
+        "month_start": end_date - timedelta(days=30),
+        # Lower bound of every window above, so each table is scanned once
+        "since": min(start_date, end_date - timedelta(days=30)),
+    }
     
     # User engagement metrics
-    total_sessions = db.query(UserSession).filter(
-        UserSession.started_at >= start_date
-    ).count()
-    
-    total_page_views = db.query(PageView).filter(
-        PageView.viewed_at >= start_date
-    ).count()
-    
-    avg_session_duration = db.query(func.avg(UserSession.duration_seconds)).filter(
-        UserSession.started_at >= start_date,
-        UserSession.duration_seconds.isnot(None)
-    ).scalar() or 0.0
-    
-    bounce_rate = db.query(func.avg(UserSession.bounce.cast(db.Float))).filter(
-        UserSession.started_at >= start_date
-    ).scalar() or 0.0
-    
-    pages_per_session = total_page_views / total_sessions if total_sessions > 0 else 0.0
-    
-    return_visitors = db.query(UserSession).filter(
-        UserSession.started_at >= start_date,
-        UserSession.user_id.isnot(None)
-    ).distinct(UserSession.user_id).count()
-    
-    total_visitors = db.query(UserSession).filter(
-        UserSession.started_at >= start_date
-    ).distinct(UserSession.user_id).count()
-    
+    sessions = DailySessionMetrics.window_totals(db, start_date, end_date)
+    visitors = db.execute(_VISITOR_METRICS, params).one()
+    
+    total_sessions = sessions["sessions"]
+    total_page_views = sessions["page_views"]
+    timed_sessions = sessions["timed_sessions"]
+    avg_session_duration = sessions["duration_total"] / timed_sessions if timed_sessions > 0 else 0.0
+    
+    if total_sessions > 0:
+        bounce_rate = sessions["bounces"] / total_sessions
+        engagement_rate = sessions["engaged_sessions"] / total_sessions
+        conversion_rate = sessions["conversions"] / total_sessions
+        pages_per_session = total_page_views / total_sessions
+    else:
+        bounce_rate = engagement_rate = conversion_rate = pages_per_session = 0.0
+    
+    return_visitors = visitors.known_visitors
+    # Anonymous sessions count as one visitor, as DISTINCT ON (user_id) did
+    total_visitors = visitors.known_visitors + (visitors.anonymous_visitors or 0)
     return_visitor_rate = return_visitors / total_visitors if total_visitors > 0 else 0.0
     
-    engagement_rate = db.query(func.avg(UserSession.engaged.cast(db.Float))).filter(
-        UserSession.started_at >= start_date
-    ).scalar() or 0.0
-    
-    conversion_rate = db.query(func.avg(UserSession.converted.cast(db.Float))).filter(
-        UserSession.started_at >= start_date
-    ).scalar() or 0.0
-    
     engagement_metrics = UserEngagementMetrics(
         total_sessions=total_sessions,
         total_page_views=total_page_views,
@@ -231,28 +169,21 @@ async def get_dashboard_data(
     )
     
     # Quote generation metrics
-    total_quotes = db.query(Quote).filter(Quote.created_at >= start_date).count()
-    quotes_today = db.query(Quote).filter(
-        Quote.created_at >= datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    ).count()
-    
-    quotes_this_week = db.query(Quote).filter(
-        Quote.created_at >= end_date - timedelta(days=7)
-    ).count()
-    
-    quotes_this_month = db.query(Quote).filter(
-        Quote.created_at >= end_date - timedelta(days=30)
-    ).count()
+    quotes = db.execute(_QUOTE_METRICS, params).one()
+    if exact:
+        total_users = db.execute(_TOTAL_USERS).scalar_one()
+    else:
+        total_users = approx_row_count(db, User.__table__)
     
-    total_users = db.query(User).filter(User.created_at <= end_date).count()
+    total_quotes = quotes.total
     avg_quotes_per_user = total_quotes / total_users if total_users > 0 else 0.0
     avg_quotes_per_session = total_quotes / total_sessions if total_sessions > 0 else 0.0
     
     quote_metrics = QuoteGenerationMetrics(
         total_quotes=total_quotes,
-        quotes_today=quotes_today,
-        quotes_this_week=quotes_this_week,
-        quotes_this_month=quotes_this_month,
+        quotes_today=quotes.today,
+        quotes_this_week=quotes.this_week,
+        quotes_this_month=quotes.this_month,
         avg_quotes_per_user=round(avg_quotes_per_user, 2),
         avg_quotes_per_session=round(avg_quotes_per_session, 2),
         most_popular_categories=[],  # TODO: Implement
@@ -260,36 +191,16 @@ async def get_dashboard_data(
     )
     
     # Voice processing metrics
-    total_recordings = db.query(VoiceRecording).filter(
-        VoiceRecording.created_at >= start_date
-    ).count()
+    recordings = db.execute(_RECORDING_METRICS, params).one()
     
-    recordings_today = db.query(VoiceRecording).filter(
-        VoiceRecording.created_at >= datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    ).count()
-    
-    recordings_this_week = db.query(VoiceRecording).filter(
-        VoiceRecording.created_at >= end_date - timedelta(days=7)
-    ).count()
-    
-    recordings_this_month = db.query(VoiceRecording).filter(
-        VoiceRecording.created_at >= end_date - timedelta(days=30)
-    ).count()
-    
-    total_duration_hours = db.query(func.sum(VoiceRecording.duration_seconds)).filter(
-        VoiceRecording.created_at >= start_date
-    ).scalar() or 0.0
-    total_duration_hours = total_duration_hours / 3600  # Convert to hours
-    
-    avg_recording_duration = db.query(func.avg(VoiceRecording.duration_seconds)).filter(
-        VoiceRecording.created_at >= start_date
-    ).scalar() or 0.0
+    total_duration_hours = (recordings.total_duration or 0.0) / 3600  # Convert to hours
+    avg_recording_duration = recordings.avg_duration or 0.0
     
     voice_metrics = VoiceProcessingMetrics(
-        total_recordings=total_recordings,
-        recordings_today=recordings_today,
-        recordings_this_week=recordings_this_week,
-        recordings_this_month=recordings_this_month,
+        total_recordings=recordings.total,
+        recordings_today=recordings.today,
+        recordings_this_week=recordings.this_week,
+        recordings_this_month=recordings.this_month,
         total_duration_hours=round(total_duration_hours, 2),
         avg_recording_duration=round(avg_recording_duration, 2),
         processing_success_rate=95.0,  # TODO: Calculate actual rate
@@ -321,48 +232,177 @@ async def get_dashboard_data(
     )
 
 
+def _report_values(db: Session, query: AnalyticsQuery, metrics: List[str]) -> Dict[str, Any]:
+    """Compute the supported ``metrics`` in one statement; blocking."""
+    
+    supported = [name for name in metrics if name in _REPORT_METRICS]
+    if not supported:
+        return {}
+    
+    row = db.execute(
+        select(*(_REPORT_METRICS[name].scalar_subquery().label(name) for name in supported)),
+        {"start_date": query.start_date, "end_date": query.end_date}
+    ).one()
+    return dict(row._mapping)
+
+@router.post("/events", response_model=AnalyticsEventResponse, status_code=status.HTTP_201_CREATED)
+async def track_event(
+    event_data: AnalyticsEventCreate,
+    request: Request,
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    session: Optional[UserSession] = Depends(get_user_session)
+):
+    """Track an analytics event.
+    
+    The row is written with the tracker's next batch; the response is
+    built from it without waiting for the insert.
+    """
+    
+    now = datetime.utcnow()
+    event = {
+        **event_data.model_dump(exclude={"event_type", "user_agent"}),
+        "id": time_ordered_uuid(),
+        "user_id": current_user.id if current_user else None,
+        "session_id": session.id if session else None,
+        "event_type_id": event_type_id(event_data.event_type),
+        # Taken from the request rather than the payload
+        "user_agent": request.headers.get("user-agent"),
+        "ip_address": request.client.host if request.client else None,
+        "timestamp": now,
+        "server_timestamp": now
+    }
+    
+    await get_analytics_tracker().record(
+        AnalyticsEvent, event, durable=event_data.event_type in DURABLE_EVENT_TYPES
+    )
+    
+    return {**event, "event_type": event_data.event_type}
+
+
+@router.post("/page-views", response_model=PageViewResponse, status_code=status.HTTP_201_CREATED)
+async def track_page_view(
+    page_view_data: PageViewCreate,
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    session: Optional[UserSession] = Depends(get_user_session)
+):
+    """Track a page view."""
+    
+    page_view = {
+        **page_view_data.model_dump(),
+        "id": time_ordered_uuid(),
+        "user_id": current_user.id if current_user else None,
+        "session_id": session.id if session else None,
+        "viewed_at": datetime.utcnow()
+    }
+    
+    tracker = get_analytics_tracker()
+    await tracker.record(PageView, page_view)
+    
+    # Update session page view count
+    if session:
+        tracker.record_session_activity(session.id, page_views=1)
+    
+    return page_view
+
+
+@router.post("/conversions", response_model=ConversionEventResponse, status_code=status.HTTP_201_CREATED)
+async def track_conversion(
+    conversion_data: ConversionEventCreate,
+    current_user: Optional[User] = Depends(get_optional_current_user),
+    session: Optional[UserSession] = Depends(get_user_session)
+):
+    """Track a conversion event."""
+    
+    conversion = {
+        **conversion_data.model_dump(),
+        "id": time_ordered_uuid(),
+        "user_id": current_user.id if current_user else None,
+        "session_id": session.id if session else None,
+        "converted_at": datetime.utcnow()
+    }
+    
+    tracker = get_analytics_tracker()
+    await tracker.record(ConversionEvent, conversion)
+    
+    # Mark session as converted
+    if session:
+        tracker.record_session_activity(session.id, converted=True)
+    
+    return conversion
+
+
+@router.get("/dashboard", response_model=DashboardData)
+async def get_dashboard_data(
+    response: Response,
+    days: int = Query(7, ge=1, le=365),
+    exact: bool = Query(False, description="Count all users exactly instead of estimating"),
+    current_admin: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Get dashboard analytics data.
+    
+    Served from the response cache for up to DASHBOARD_CACHE_TTL seconds
+    per ``days`` and ``exact`` value; the admin dependency still runs on
+    every request.
+    """
+    
+    cache_params = {"days": days, "exact": exact}
+    cached = await cache_service.get_cached_response(DASHBOARD_CACHE_KEY, cache_params)
+    if cached:
+        response.headers["X-Cache"] = "HIT"
+        return {k: v for k, v in cached.items() if not k.startswith("_cache")}
+    
+    loop = asyncio.get_running_loop()
+    dashboard = await loop.run_in_executor(None, partial(_build_dashboard, db, days, exact))
+    
+    await cache_service.cache_response(
+        DASHBOARD_CACHE_KEY, cache_params, jsonable_encoder(dashboard), ttl=DASHBOARD_CACHE_TTL
+    )
+    response.headers["X-Cache"] = "MISS"
+    
+    return dashboard
+
+
 @router.post("/query", response_model=AnalyticsReport)
 async def query_analytics(
     query: AnalyticsQuery,
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Execute custom analytics query."""
+    """Execute custom analytics query.
+    
+    Requested metrics are computed in one statement. Their values are cached
+    for REPORT_CACHE_TTL seconds under the normalized query, so requests
+    that differ only in metric order or duplicates share the cached values.
+    """
     
     # TODO: Implement comprehensive analytics querying
     # This is a simplified version
     
-    metrics = []
-    for metric_name in query.metrics:
-        value = 0.0
-        
-        if metric_name == "page_views":
-            value = db.query(PageView).filter(
-                PageView.viewed_at >= query.start_date,
-                PageView.viewed_at <= query.end_date
-            ).count()
-        elif metric_name == "unique_visitors":
-            value = db.query(UserSession).filter(
-                UserSession.started_at >= query.start_date,
-                UserSession.started_at <= query.end_date
-            ).distinct(UserSession.user_id).count()
-        elif metric_name == "sessions":
-            value = db.query(UserSession).filter(
-                UserSession.started_at >= query.start_date,
-                UserSession.started_at <= query.end_date
-            ).count()
-        elif metric_name == "quotes_generated":
-            value = db.query(Quote).filter(
-                Quote.created_at >= query.start_date,
-                Quote.created_at <= query.end_date
-            ).count()
-        
-        metrics.append({
+    requested = sorted(set(query.metrics))
+    cache_params = {
+        "metrics": requested,
+        "start_date": query.start_date.isoformat(),
+        "end_date": query.end_date.isoformat(),
+        "dimensions": sorted(query.dimensions or []),
+        "filters": query.filters or {},
+    }
+    
+    values = await cache_service.get_cached_response(REPORT_CACHE_KEY, cache_params)
+    if not values:
+        loop = asyncio.get_running_loop()
+        values = await loop.run_in_executor(None, partial(_report_values, db, query, requested))
+        await cache_service.cache_response(REPORT_CACHE_KEY, cache_params, values, ttl=REPORT_CACHE_TTL)
+    
+    metrics = [
+        {
             "name": metric_name,
-            "value": value,
+            "value": values.get(metric_name, 0.0),
             "change": None,
             "change_percentage": None
-        })
+        }
+        for metric_name in query.metrics
+    ]
     
     return AnalyticsReport(
         period=f"{query.start_date.date()} to {query.end_date.date()}",
@@ -375,9 +415,40 @@ async def query_analytics(
     )
 
 
+def _page_events(db: Session, stmt, response: Response, cursor: Optional[str],
+                 skip: int, limit: int) -> List[AnalyticsEvent]:
+    """Run an event listing newest first, a page at a time.
+    
+    Pages by keyset on ``(timestamp, id)``: each page is an index seek past
+    the cursor instead of an OFFSET that reads and discards every earlier
+    row. The cursor for the next page is set in the ``X-Next-Cursor``
+    header; ``skip`` remains for clients that haven't moved to cursors.
+    """
+    if cursor:
+        timestamp, event_id = decode_cursor(cursor)
+        stmt += lambda s: s.where(
+            tuple_(AnalyticsEvent.timestamp, AnalyticsEvent.id) < tuple_(timestamp, event_id)
+        )
+    elif skip:
+        stmt += lambda s: s.offset(skip)
+    
+    # One extra row tells whether there is a next page
+    fetch = limit + 1
+    stmt += lambda s: s.order_by(AnalyticsEvent.timestamp.desc(), AnalyticsEvent.id.desc()).limit(fetch)
+    
+    events = db.execute(stmt).scalars().all()
+    if len(events) > limit:
+        events = events[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(events[-1].timestamp, events[-1].id)
+    
+    return events
+
+
 @router.get("/events", response_model=List[AnalyticsEventResponse])
-async def list_events(
-    skip: int = Query(0, ge=0),
+def list_events(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=1000),
     event_type: Optional[EventType] = Query(None),
     start_date: Optional[datetime] = Query(None),
@@ -385,27 +456,29 @@ async def list_events(
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """List analytics events (admin only)."""
+    """List analytics events (admin only), newest first; see _page_events."""
     
-    query = db.query(AnalyticsEvent)
+    # The response includes the deferred user agent
+    stmt = lambda_stmt(lambda: select(AnalyticsEvent).options(undefer_group("diag")))
     
     if event_type:
-        query = query.filter(AnalyticsEvent.event_type == event_type)
+        type_id = event_type_id(event_type)
+        stmt += lambda s: s.where(AnalyticsEvent.event_type_id == type_id)
     
     if start_date:
-        query = query.filter(AnalyticsEvent.timestamp >= start_date)
+        stmt += lambda s: s.where(AnalyticsEvent.timestamp >= start_date)
     
     if end_date:
-        query = query.filter(AnalyticsEvent.timestamp <= end_date)
-    
-    events = query.order_by(AnalyticsEvent.timestamp.desc()).offset(skip).limit(limit).all()
+        stmt += lambda s: s.where(AnalyticsEvent.timestamp <= end_date)
     
-    return events
+    return _page_events(db, stmt, response, cursor, skip, limit)
 
 
 @router.get("/sessions", response_model=List[UserSessionResponse])
-async def list_sessions(
-    skip: int = Query(0, ge=0),
+def list_sessions(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=1000),
     user_id: Optional[str] = Query(None),
     start_date: Optional[datetime] = Query(None),
@@ -413,26 +486,44 @@ async def list_sessions(
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """List user sessions (admin only)."""
+    """List user sessions (admin only), most recently started first.
+    
+    Pages by keyset on ``(started_at, id)`` like _page_events.
+    """
     
-    query = db.query(UserSession)
+    stmt = lambda_stmt(lambda: select(UserSession).options(undefer_group("diag")))
     
     if user_id:
-        query = query.filter(UserSession.user_id == user_id)
+        stmt += lambda s: s.where(UserSession.user_id == user_id)
     
     if start_date:
-        query = query.filter(UserSession.started_at >= start_date)
+        stmt += lambda s: s.where(UserSession.started_at >= start_date)
     
     if end_date:
-        query = query.filter(UserSession.started_at <= end_date)
+        stmt += lambda s: s.where(UserSession.started_at <= end_date)
     
-    sessions = query.order_by(UserSession.started_at.desc()).offset(skip).limit(limit).all()
+    if cursor:
+        started_at, session_id = decode_cursor(cursor)
+        stmt += lambda s: s.where(
+            tuple_(UserSession.started_at, UserSession.id) < tuple_(started_at, session_id)
+        )
+    elif skip:
+        stmt += lambda s: s.offset(skip)
+    
+    # One extra row tells whether there is a next page
+    fetch = limit + 1
+    stmt += lambda s: s.order_by(UserSession.started_at.desc(), UserSession.id.desc()).limit(fetch)
+    
+    sessions = db.execute(stmt).scalars().all()
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(sessions[-1].started_at, sessions[-1].id)
     
     return sessions
 
 
 @router.get("/funnel/{funnel_name}", response_model=FunnelAnalysis)
-async def analyze_funnel(
+def analyze_funnel(
     funnel_name: str,
     days: int = Query(30, ge=1, le=365),
     current_admin: User = Depends(get_current_admin_user),
@@ -489,7 +580,7 @@ async def analyze_funnel(
 
 
 @router.get("/experiments/{experiment_id}", response_model=List[ABTestResult])
-async def get_experiment_results(
+def get_experiment_results(
     experiment_id: str,
     current_admin: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
@@ -524,20 +615,24 @@ async def get_experiment_results(
 
 
 @router.get("/me/events", response_model=List[AnalyticsEventResponse])
-async def get_my_events(
-    skip: int = Query(0, ge=0),
+def get_my_events(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(50, ge=1, le=100),
     event_type: Optional[EventType] = Query(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get current user's analytics events."""
+    """Get current user's analytics events, newest first; see _page_events."""
     
-    query = db.query(AnalyticsEvent).filter(AnalyticsEvent.user_id == current_user.id)
+    user_id = current_user.id
+    stmt = lambda_stmt(lambda: select(AnalyticsEvent).options(undefer_group("diag")).where(
+        AnalyticsEvent.user_id == user_id
+    ))
     
     if event_type:
-        query = query.filter(AnalyticsEvent.event_type == event_type)
-    
-    events = query.order_by(AnalyticsEvent.timestamp.desc()).offset(skip).limit(limit).all()
+        type_id = event_type_id(event_type)
+        stmt += lambda s: s.where(AnalyticsEvent.event_type_id == type_id)
     
-    return events
\ No newline at end of file
+    return _page_events(db, stmt, response, cursor, skip, limit)
@@ -1,10 +1,11 @@
 """Authentication router for Quote Master Pro."""
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from src.core.database import get_db
@@ -19,6 +20,8 @@ from src.core.security import (
 from src.core.config import get_settings
 from src.api.dependencies import get_current_user, get_current_active_user
 from src.api.models.user import User
+from src.services.analytics.tracker import get_analytics_tracker
+from src.services.cache.user_cache import get_user_by_email, get_user_by_id, invalidate_user
 from src.api.schemas.user import (
     UserCreate,
     UserResponse,
@@ -33,33 +36,34 @@ from src.api.schemas.user import (
     EmailVerificationConfirm,
 )
 
+# Handlers that query the blocking Session or hash passwords are plain
+# ``def`` and run in the threadpool
 router = APIRouter()
 settings = get_settings()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(
+def register(
     user_data: UserCreate,
     db: Session = Depends(get_db)
 ):
     """Register a new user."""
     
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    # Check if user already exists; only the id is read, from ix_users_email_lower
+    if db.query(User.id).filter(User.email_matches(user_data.email)).first():
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="User with this email already exists"
         )
     
     # Check username if provided
-    if user_data.username:
-        existing_username = db.query(User).filter(User.username == user_data.username).first()
-        if existing_username:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Username already taken"
-            )
+    if user_data.username and db.query(User.id).filter(
+        User.username_matches(user_data.username)
+    ).first():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Username already taken"
+        )
     
     # Create new user
     hashed_password = get_password_hash(user_data.password)
@@ -75,7 +79,15 @@ async def register(
     )
     
     db.add(db_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent registration took the email or username after the checks
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email or username already exists"
+        )
     db.refresh(db_user)
     
     # TODO: Send verification email
@@ -84,14 +96,14 @@ async def register(
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(
+def login(
     login_data: LoginRequest,
     db: Session = Depends(get_db)
 ):
     """Authenticate user and return tokens."""
     
     # Get user by email
-    user = db.query(User).filter(User.email == login_data.email).first()
+    user = get_user_by_email(db, login_data.email)
     
     if not user or not verify_password(login_data.password, user.hashed_password):
         raise HTTPException(
@@ -126,9 +138,8 @@ async def login(
         expires_delta=refresh_token_expires
     )
     
-    # Update last login
-    user.last_login_at = datetime.utcnow()
-    db.commit()
+    # Update last login; written with the analytics tracker's next flush
+    get_analytics_tracker().record_login(user.id)
     
     return LoginResponse(
         access_token=access_token,
@@ -139,7 +150,7 @@ async def login(
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(
+def refresh_token(
     refresh_data: RefreshTokenRequest,
     db: Session = Depends(get_db)
 ):
@@ -157,7 +168,7 @@ async def refresh_token(
             )
         
         # Get user
-        user = db.query(User).filter(User.id == user_id).first()
+        user = get_user_by_id(db, user_id)
         if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -198,13 +209,13 @@ async def logout(
 
 
 @router.post("/password/reset-request")
-async def request_password_reset(
+def request_password_reset(
     reset_data: PasswordResetRequest,
     db: Session = Depends(get_db)
 ):
     """Request password reset token."""
     
-    user = db.query(User).filter(User.email == reset_data.email).first()
+    user = db.query(User).filter(User.email_matches(reset_data.email)).first()
     
     if user:
         # Generate reset token
@@ -241,7 +252,7 @@ async def confirm_password_reset(
 
 
 @router.post("/password/change")
-async def change_password(
+def change_password(
     password_data: PasswordChangeRequest,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -258,18 +269,19 @@ async def change_password(
     # Update password
     current_user.hashed_password = get_password_hash(password_data.new_password)
     db.commit()
+    invalidate_user(current_user.id)
     
     return {"message": "Password changed successfully"}
 
 
 @router.post("/email/verify-request")
-async def request_email_verification(
+def request_email_verification(
     verification_data: EmailVerificationRequest,
     db: Session = Depends(get_db)
 ):
     """Request email verification."""
     
-    user = db.query(User).filter(User.email == verification_data.email).first()
+    user = db.query(User).filter(User.email_matches(verification_data.email)).first()
     
     if user and not user.is_verified:
         # TODO: Generate and send verification email
@@ -4,7 +4,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 from sqlalchemy import func, or_, and_
 
 from src.core.database import get_db
@@ -23,7 +23,8 @@ from src.api.models.quote import (
     QuoteCollection,
     QuoteCollectionItem,
     QuoteRating,
-    QuoteStatus
+    QuoteStatus,
+    quote_counter_batcher
 )
 from src.api.schemas.quote import (
     QuoteCreate,
@@ -93,9 +94,7 @@ async def generate_quote(
     db.add(quote)
     
     # Update user stats
-    current_user.increment_quote_count()
-    current_user.api_calls_today += 1
-    current_user.last_api_call_date = datetime.utcnow()
+    User.bump_quote_count(db, current_user.id, api_call=True)
     
     db.commit()
     db.refresh(quote)
@@ -113,7 +112,7 @@ async def list_quotes(
     category_id: Optional[str] = Query(None),
     author: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    sort_by: str = Query("created_at", pattern="^(created_at|popularity|likes|views)$"),
+    sort_by: str = Query("created_at", pattern="^(created_at|popularity|trending|likes|views)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
     db: Session = Depends(get_db)
 ):
@@ -144,6 +143,8 @@ async def list_quotes(
     # Apply sorting
     if sort_by == "popularity":
         order_column = Quote.popularity_score
+    elif sort_by == "trending":
+        order_column = Quote.trending_score
     elif sort_by == "likes":
         order_column = Quote.like_count
     elif sort_by == "views":
@@ -262,9 +263,8 @@ async def get_quote(
             detail="Quote not found"
         )
     
-    # Increment view count
-    quote.increment_view_count()
-    db.commit()
+    # Views are hot; coalesce them rather than updating the row per request
+    quote_counter_batcher.bump(quote.id, "view_count")
     
     return quote
 
@@ -279,7 +279,10 @@ async def get_my_quotes(
 ):
     """Get current user's quotes."""
     
-    query = db.query(Quote).filter(Quote.user_id == current_user.id)
+    # QuoteResponse includes the deferred psychological profile
+    query = db.query(Quote).options(undefer(Quote.psychological_profile)).filter(
+        Quote.user_id == current_user.id
+    )
     
     if status:
         query = query.filter(Quote.status == status)
@@ -309,7 +312,7 @@ async def create_quote(
     )
     
     db.add(quote)
-    current_user.increment_quote_count()
+    User.bump_quote_count(db, current_user.id)
     db.commit()
     db.refresh(quote)
     
@@ -425,7 +428,7 @@ async def add_favorite(
     db.add(favorite)
     
     # Update quote favorite count
-    quote.favorite_count += 1
+    Quote.bump_counter(db, quote.id, "favorite_count")
     
     db.commit()
     db.refresh(favorite)
@@ -497,10 +500,10 @@ async def like_quote(
         )
     
     # TODO: Implement like tracking to prevent double-likes
-    quote.increment_like_count()
+    likes = Quote.bump_likes(db, quote.id)
     db.commit()
     
-    return {"message": "Quote liked successfully", "likes": quote.like_count}
+    return {"message": "Quote liked successfully", "likes": likes}
 
 
 @router.post("/{quote_id}/share")
@@ -519,10 +522,10 @@ async def share_quote(
             detail="Quote not found"
         )
     
-    quote.increment_share_count()
+    shares = Quote.bump_shares(db, quote.id)
     db.commit()
     
-    return {"message": "Quote share tracked", "shares": quote.share_count}
+    return {"message": "Quote share tracked", "shares": shares}
 
 
 async def process_quote_ai_analysis(quote_id: str):
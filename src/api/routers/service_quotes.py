@@ -4,7 +4,7 @@ Endpoints for window and pressure cleaning service quotes
 """
 
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -77,12 +77,19 @@ class VoiceQuoteRequest(BaseModel):
 @router.post("/service-quotes/calculate", response_model=ServiceQuoteResponse)
 async def create_service_quote(
     request: ServiceQuoteRequest,
+    http_request: Request,
     current_user: User = Depends(get_current_user),
     service: Any = Depends(get_service_quote_service)
 ):
     """
     Calculate and create a new service quote
     """
+    # Picked up by the observability middleware for quote metrics
+    http_request.state.quote_labels = {
+        "service_type": request.service_type.value,
+        "suburb": request.suburb.value
+    }
+    
     try:
         quote_data = service.create_service_quote(
             user_id=current_user.id,
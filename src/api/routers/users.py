@@ -29,6 +29,7 @@ from src.api.schemas.user import (
     APIKeyWithSecret,
 )
 from src.core.security import generate_api_key, hash_api_key
+from src.services.cache.user_cache import invalidate_user
 
 router = APIRouter()
 
@@ -51,8 +52,8 @@ async def update_my_profile(
     
     # Check if username is already taken (if being updated)
     if user_update.username and user_update.username != current_user.username:
-        existing_user = db.query(User).filter(
-            User.username == user_update.username,
+        existing_user = db.query(User.id).filter(
+            User.username_matches(user_update.username),
             User.id != current_user.id
         ).first()
         
@@ -87,6 +88,7 @@ async def delete_my_account(
     current_user.updated_at = datetime.utcnow()
     
     db.commit()
+    invalidate_user(current_user.id)
     
     return {"message": "Account has been deleted successfully"}
 
@@ -1,6 +1,7 @@
 """Voice processing router for Quote Master Pro."""
 
 from typing import Optional, List
+import hashlib
 import os
 from datetime import datetime
 
@@ -14,7 +15,9 @@ from fastapi import (
     File,
     BackgroundTasks
 )
-from sqlalchemy.orm import Session
+from fastapi.responses import FileResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload, undefer_group
 
 from src.core.database import get_db
 from src.core.config import get_settings
@@ -27,7 +30,6 @@ from src.api.models.voice import (
     VoiceRecording,
     VoiceProcessingJob,
     VoiceModel,
-    SpeechSegment,
     VoiceRecordingStatus,
     VoiceProcessingStatus,
     AudioFormat
@@ -51,15 +53,23 @@ router = APIRouter()
 settings = get_settings()
 
 
-@router.post("/upload", response_model=VoiceRecordingResponse, dependencies=[Depends(check_voice_quota)])
+@router.post(
+    "/upload",
+    response_model=VoiceRecordingResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(check_voice_quota)]
+)
 async def upload_voice_recording(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     retain_audio: bool = True,
     current_user: User = Depends(get_current_verified_user),
     db: Session = Depends(get_db)
 ):
-    """Upload a voice recording for processing."""
+    """Upload a voice recording and queue it for processing.
+    
+    Returns 202 as soon as the file is stored; audio analysis runs on a
+    Celery worker and reports through the returned ``processing_job_id``.
+    """
     
     # Validate file type
     if file.content_type not in settings.allowed_file_types:
@@ -96,13 +106,16 @@ async def upload_voice_recording(
     import uuid
     unique_filename = f"{uuid.uuid4()}_{file.filename}"
     
-    # Save file (in production, use cloud storage)
+    # Save file content-addressed (in production, use cloud storage), so
+    # re-uploads of the same audio reuse the stored object
+    content_hash = hashlib.sha256(file_content).hexdigest()
     upload_dir = "uploads/audio"
     os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, unique_filename)
+    file_path = os.path.join(upload_dir, f"{content_hash}.{audio_format.value}")
     
-    with open(file_path, "wb") as buffer:
-        buffer.write(file_content)
+    if not os.path.exists(file_path):
+        with open(file_path, "wb") as buffer:
+            buffer.write(file_content)
     
     # Create recording record
     recording = VoiceRecording(
@@ -110,6 +123,7 @@ async def upload_voice_recording(
         filename=unique_filename,
         original_filename=file.filename,
         file_path=file_path,
+        content_hash=content_hash,
         file_size=len(file_content),
         file_format=audio_format.value,
         mime_type=file.content_type,
@@ -117,18 +131,50 @@ async def upload_voice_recording(
         status=VoiceRecordingStatus.UPLOADED
     )
     
-    db.add(recording)
+    # The job is assigned to its worker task up front, so the upload's
+    # own queueing is its only dispatch route
+    task_id = str(uuid.uuid4())
+    job = VoiceProcessingJob(
+        user_id=current_user.id,
+        recording=recording,
+        job_type="upload_processing",
+        worker_id=task_id
+    )
+    db.add_all([recording, job])
+    db.flush()
+    job_id = job.id
     
     # Update user stats
-    current_user.increment_voice_count()
+    User.bump_voice_count(db, current_user.id)
     
     db.commit()
     db.refresh(recording)
     
-    # Start background processing
-    background_tasks.add_task(process_uploaded_audio, recording.id)
+    # Hand the audio work to the worker pool
+    from src.workers.background_tasks import get_task_manager
+    try:
+        await get_task_manager().schedule_voice_processing(
+            recording_id=str(recording.id),
+            user_id=str(current_user.id),
+            processing_options={},
+            job_id=str(job_id),
+            file_path=file_path,
+            task_id=task_id
+        )
+    except Exception:
+        # No task will ever own the job; fail it unassigned so
+        # requeue_failed and the dispatcher can recover it
+        job.mark_failed("Could not queue voice processing", error_code="ENQUEUE_FAILED")
+        job.worker_id = None
+        db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recording saved, but processing could not be queued; it will be retried"
+        )
     
-    return recording
+    response = VoiceRecordingResponse.model_validate(recording)
+    response.processing_job_id = job_id
+    return response
 
 
 @router.get("/recordings", response_model=List[VoiceRecordingResponse])
@@ -141,7 +187,9 @@ async def list_my_recordings(
 ):
     """List current user's voice recordings."""
     
-    query = db.query(VoiceRecording).filter(VoiceRecording.user_id == current_user.id)
+    query = db.query(VoiceRecording).options(undefer_group("heavy")).filter(
+        VoiceRecording.user_id == current_user.id
+    )
     
     if status:
         query = query.filter(VoiceRecording.status == status)
@@ -170,11 +218,20 @@ async def search_recordings(
     if search_request.status:
         query = query.filter(VoiceRecording.status == search_request.status)
     
+    dialect_name = db.bind.dialect.name
+    
+    if search_request.keywords:
+        query = query.filter(
+            VoiceRecording.tagged_with(dialect_name, VoiceRecording.keywords, search_request.keywords)
+        )
+    
+    if search_request.categories:
+        query = query.filter(
+            VoiceRecording.tagged_with(dialect_name, VoiceRecording.content_categories, search_request.categories)
+        )
+    
     if search_request.has_transcription is not None:
-        if search_request.has_transcription:
-            query = query.filter(VoiceRecording.transcription.isnot(None))
-        else:
-            query = query.filter(VoiceRecording.transcription.is_(None))
+        query = query.filter(VoiceRecording.has_transcription.is_(search_request.has_transcription))
     
     if search_request.min_duration:
         query = query.filter(VoiceRecording.duration_seconds >= search_request.min_duration)
@@ -200,7 +257,7 @@ async def search_recordings(
             query = query.order_by(sort_column.asc())
     
     # Apply pagination
-    recordings = query.offset(search_request.offset).limit(search_request.limit).all()
+    recordings = query.options(undefer_group("heavy")).offset(search_request.offset).limit(search_request.limit).all()
     
     return VoiceSearchResponse(
         recordings=recordings,
@@ -219,7 +276,7 @@ async def get_recording(
 ):
     """Get a specific voice recording."""
     
-    recording = db.query(VoiceRecording).filter(
+    recording = db.query(VoiceRecording).options(undefer_group("heavy")).filter(
         VoiceRecording.id == recording_id,
         VoiceRecording.user_id == current_user.id
     ).first()
@@ -233,6 +290,32 @@ async def get_recording(
     return recording
 
 
+@router.get("/recordings/{recording_id}/audio")
+async def download_recording_audio(
+    recording_id: str,
+    current_user: User = Depends(get_current_verified_user),
+    db: Session = Depends(get_db)
+):
+    """Stream a recording's audio from storage in chunks."""
+    
+    recording = db.query(VoiceRecording).filter(
+        VoiceRecording.id == recording_id,
+        VoiceRecording.user_id == current_user.id
+    ).first()
+    
+    if not recording or not os.path.exists(recording.file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recording audio not found"
+        )
+    
+    return FileResponse(
+        recording.file_path,
+        media_type=recording.mime_type,
+        filename=recording.original_filename or recording.filename
+    )
+
+
 @router.delete("/recordings/{recording_id}")
 async def delete_recording(
     recording_id: str,
@@ -252,8 +335,16 @@ async def delete_recording(
             detail="Recording not found"
         )
     
-    # Delete file if it exists
-    if os.path.exists(recording.file_path):
+    # Delete the stored file unless another live recording shares it
+    shared = recording.content_hash is not None and db.query(
+        db.query(VoiceRecording).filter(
+            VoiceRecording.content_hash == recording.content_hash,
+            VoiceRecording.id != recording.id,
+            VoiceRecording.status != VoiceRecordingStatus.DELETED
+        ).exists()
+    ).scalar()
+    
+    if not shared and os.path.exists(recording.file_path):
         os.remove(recording.file_path)
     
     # Mark as deleted
@@ -557,8 +648,10 @@ async def get_speech_segments(
 ):
     """Get speech segments for a recording."""
     
-    # Check recording ownership
-    recording = db.query(VoiceRecording).filter(
+    # Check recording ownership; segments arrive in one IN query, already ordered
+    recording = db.query(VoiceRecording).options(
+        selectinload(VoiceRecording.segments)
+    ).filter(
         VoiceRecording.id == recording_id,
         VoiceRecording.user_id == current_user.id
     ).first()
@@ -569,11 +662,7 @@ async def get_speech_segments(
             detail="Recording not found"
         )
     
-    segments = db.query(SpeechSegment).filter(
-        SpeechSegment.recording_id == recording_id
-    ).order_by(SpeechSegment.start_time).all()
-    
-    return segments
+    return recording.segments
 
 
 @router.get("/statistics", response_model=VoiceStatistics)
@@ -583,27 +672,41 @@ async def get_voice_statistics(
 ):
     """Get voice processing statistics for current user."""
     
-    # Calculate statistics
-    total_recordings = db.query(VoiceRecording).filter(
-        VoiceRecording.user_id == current_user.id
-    ).count()
+    start_of_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     
-    total_duration = db.query(func.sum(VoiceRecording.duration_seconds)).filter(
+    # Recording and job aggregates as one row each, without loading any rows
+    recording_stats = db.query(
+        func.count(VoiceRecording.id),
+        func.sum(VoiceRecording.duration_seconds),
+        func.count(VoiceRecording.id).filter(
+            VoiceRecording.status == VoiceRecordingStatus.PROCESSED
+        ),
+        func.count(VoiceRecording.id).filter(
+            VoiceRecording.created_at >= start_of_month
+        )
+    ).filter(
         VoiceRecording.user_id == current_user.id
-    ).scalar() or 0.0
+    ).one()
     
-    total_processed = db.query(VoiceRecording).filter(
-        VoiceRecording.user_id == current_user.id,
-        VoiceRecording.status == VoiceRecordingStatus.PROCESSED
-    ).count()
+    total_recordings, total_duration, total_processed, recordings_this_month = recording_stats
+    total_duration = total_duration or 0.0
     
     processing_success_rate = (total_processed / total_recordings * 100) if total_recordings > 0 else 0.0
     
-    # Average processing time from jobs
-    avg_processing_time = db.query(func.avg(VoiceProcessingJob.processing_time)).filter(
-        VoiceProcessingJob.user_id == current_user.id,
-        VoiceProcessingJob.status == VoiceProcessingStatus.COMPLETED
-    ).scalar() or 0.0
+    # Average processing time of completed jobs and this month's cost
+    avg_processing_time, processing_cost_this_month = db.query(
+        func.avg(VoiceProcessingJob.processing_time).filter(
+            VoiceProcessingJob.status == VoiceProcessingStatus.COMPLETED
+        ),
+        func.sum(VoiceProcessingJob.cost_usd).filter(
+            VoiceProcessingJob.created_at >= start_of_month
+        )
+    ).filter(
+        VoiceProcessingJob.user_id == current_user.id
+    ).one()
+    
+    avg_processing_time = avg_processing_time or 0.0
+    processing_cost_this_month = processing_cost_this_month or 0.0
     
     # Most common language
     most_common_language = db.query(VoiceRecording.language_detected).filter(
@@ -615,20 +718,6 @@ async def get_voice_statistics(
     
     most_common_language = most_common_language[0] if most_common_language else None
     
-    # This month statistics
-    from datetime import datetime
-    start_of_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    recordings_this_month = db.query(VoiceRecording).filter(
-        VoiceRecording.user_id == current_user.id,
-        VoiceRecording.created_at >= start_of_month
-    ).count()
-    
-    processing_cost_this_month = db.query(func.sum(VoiceProcessingJob.cost_usd)).filter(
-        VoiceProcessingJob.user_id == current_user.id,
-        VoiceProcessingJob.created_at >= start_of_month
-    ).scalar() or 0.0
-    
     return VoiceStatistics(
         total_recordings=total_recordings,
         total_duration=total_duration,
@@ -642,15 +731,6 @@ async def get_voice_statistics(
 
 
 # Background task functions
-async def process_uploaded_audio(recording_id: str):
-    """Process uploaded audio file."""
-    # TODO: Implement audio processing
-    # - Extract metadata (duration, format, etc.)
-    # - Audio quality analysis
-    # - Basic transcription if enabled
-    pass
-
-
 async def execute_voice_processing_job(job_id: str):
     """Execute a voice processing job."""
     # TODO: Implement job processing
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field, validator
 from uuid import UUID
 
 from src.api.models.quote import QuoteSource, QuoteStatus
+from src.api.schemas.user import UserPublicResponse
 
 
 class QuoteBase(BaseModel):
@@ -157,6 +158,12 @@ class QuoteCategoryResponse(QuoteCategoryBase):
         from_attributes = True
 
 
+class AdminQuoteResponse(QuoteResponse):
+    """Quote as listed for moderation, with its author and category."""
+    user: UserPublicResponse
+    category: Optional[QuoteCategoryResponse]
+
+
 class QuoteFavoriteResponse(BaseModel):
     """Quote favorite response schema."""
     id: UUID
@@ -206,6 +213,13 @@ class QuoteBulkAction(BaseModel):
     action: str = Field(..., pattern="^(delete|archive|publish|feature)$")
 
 
+class QuoteModerationBulk(BaseModel):
+    """Bulk quote moderation schema."""
+    quote_ids: List[UUID] = Field(..., min_length=1, max_length=500)
+    action: str = Field(..., pattern="^(approve|reject|feature|unfeature)$")
+    notes: Optional[str] = None
+
+
 class QuoteAnalytics(BaseModel):
     """Quote analytics schema."""
     quote_id: UUID
@@ -60,6 +60,19 @@ class UserUpdate(BaseModel):
     avatar_url: Optional[str] = None
 
 
+class AdminUserUpdate(BaseModel):
+    """Account fields an admin may change."""
+    role: Optional[UserRole] = None
+    status: Optional[UserStatus] = None
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+    subscription_tier: Optional[str] = Field(None, max_length=50)
+    subscription_expires_at: Optional[datetime] = None
+    
+    class Config:
+        use_enum_values = True
+
+
 class UserProfile(BaseModel):
     """User profile schema."""
     first_name: Optional[str] = None
@@ -70,6 +70,7 @@ class VoiceRecordingResponse(VoiceRecordingBase):
     has_transcription: bool
     file_size_mb: float
     duration_formatted: str
+    processing_job_id: Optional[UUID] = None  # Set on upload: the queued processing job
     
     class Config:
         from_attributes = True
@@ -104,7 +105,7 @@ class VoiceProcessingJobResponse(VoiceProcessingJobBase):
     recording_id: UUID
     status: VoiceProcessingStatus
     priority: int
-    processing_config: Optional[Dict[str, Any]]
+    processing_config: Optional[Dict[str, Any]] = Field(None, validation_alias="ai_model_config")
     progress_percent: float
     current_step: Optional[str]
     steps_total: Optional[int]
@@ -236,6 +237,8 @@ class VoiceSearchRequest(BaseModel):
     """Voice recording search request schema."""
     query: Optional[str] = None
     status: Optional[VoiceRecordingStatus] = None
+    keywords: Optional[List[str]] = None
+    categories: Optional[List[str]] = None
     has_transcription: Optional[bool] = None
     min_duration: Optional[float] = None
     max_duration: Optional[float] = None
@@ -94,6 +94,8 @@ class Settings(BaseSettings):
     
     # Monitoring
     prometheus_port: int = 8001
+    trace_sample_ratio: float = 0.05  # Share of root traces kept by the head sampler
+    slow_request_threshold: float = 1.0  # Seconds; slower requests are always logged
     sentry_dsn: Optional[str] = None
     new_relic_license_key: Optional[str] = None
     
@@ -1,13 +1,19 @@
 """Database configuration and session management."""
 
-from typing import Generator, Optional
+from datetime import date, datetime
+from typing import Generator, List, Optional
 import logging
+import os
+import time
+import uuid
 
-from sqlalchemy import create_engine, MetaData, event, text, inspect
+from sqlalchemy import create_engine, make_url, MetaData, JSON, Index, Table, event, select, text, inspect
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import Pool
 from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.sql import func
 
 from .config import get_settings
 
@@ -24,15 +30,24 @@ if settings.database_url.startswith("sqlite"):
         settings.database_url,
         echo=settings.debug,
         pool_pre_ping=True,  # Verify connections before use
+        query_cache_size=1200,  # Compiled statements kept per engine
     )
 else:
     # PostgreSQL/other database configuration
+    driver_options = {}
+    if make_url(settings.database_url).get_driver_name() == "psycopg2":
+        # Batch executemany UPDATE/DELETE pages instead of one statement per row
+        driver_options["executemany_mode"] = "values_plus_batch"
+    
     engine = create_engine(
         settings.database_url,
         pool_size=settings.db_pool_size,
-        pool_overflow=settings.db_pool_overflow,
+        max_overflow=settings.db_pool_overflow,
         echo=settings.debug,
         pool_pre_ping=True,  # Verify connections before use
+        insertmanyvalues_page_size=1000,  # Rows per multi-row INSERT ... RETURNING
+        query_cache_size=1200,  # Compiled statements kept per engine
+        **driver_options
     )
 
 # Session factory
@@ -45,9 +60,246 @@ SessionLocal = sessionmaker(
 # Base class for models
 Base = declarative_base()
 
+
+@event.listens_for(Base.metadata, "before_create")
+def _create_extensions(target, connection, **kw):
+    """Extensions the model indexes depend on (see trigram_gin_index)."""
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
 # Metadata for migrations
 metadata = MetaData()
 
+# JSON column type: binary, indexable JSONB on PostgreSQL, plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+def time_ordered_uuid() -> uuid.UUID:
+    """UUIDv7-style primary key: 48-bit millisecond timestamp, then random bits.
+    
+    Keys generated later sort later, so inserts append to the right-hand side
+    of the primary key B-tree instead of touching a random leaf page as
+    ``uuid4`` does.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def elapsed_seconds(dialect_name: str, since):
+    """SQL expression for the seconds elapsed since ``since``, on the database clock."""
+    if dialect_name == "sqlite":
+        return (func.julianday("now") - func.julianday(since)) * 86400
+    return func.extract("epoch", func.now() - since)
+
+
+def approx_row_count(db: Session, table: Table) -> int:
+    """Row count of ``table`` from the planner statistics in ``pg_class``.
+    
+    O(1) instead of a ``COUNT(*)`` scan, and as fresh as the last
+    ANALYZE/autovacuum. Partitioned tables sum their leaf partitions,
+    counting never-analyzed ones as empty. Other databases, and tables
+    with no statistics yet, get an exact count.
+    """
+    if db.bind.dialect.name == "postgresql":
+        estimate, analyzed = db.execute(text(
+            "SELECT sum(greatest(c.reltuples, 0)), max(c.reltuples) >= 0 "
+            "FROM pg_partition_tree(CAST(:table_name AS regclass)) tree "
+            "JOIN pg_class c ON c.oid = tree.relid "
+            "WHERE tree.isleaf"
+        ), {"table_name": table.name}).one()
+        if analyzed:
+            return int(estimate)
+    
+    return db.execute(select(func.count()).select_from(table)).scalar_one()
+
+
+def jsonb_gin_index(name: str, column: str) -> Index:
+    """GIN (jsonb_path_ops) index for ``@>`` containment queries on a JSONB column.
+    
+    Only emitted on PostgreSQL; other dialects skip it.
+    """
+    return Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "jsonb_path_ops"}
+    ).ddl_if(dialect="postgresql")
+
+
+def trigram_gin_index(name: str, column: str) -> Index:
+    """GIN (gin_trgm_ops) index so ``ILIKE '%term%'`` on a text column can use it.
+    
+    Only emitted on PostgreSQL, where pg_trgm is created before the tables;
+    other dialects skip it.
+    """
+    return Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"}
+    ).ddl_if(dialect="postgresql")
+
+
+# Tables range-partitioned by month on PostgreSQL; see register_monthly_partitions
+PARTITIONED_TABLES: List[Table] = []
+
+
+def _add_months(month: date, months: int) -> date:
+    """Return the first day of the month ``months`` after ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(table_name: str, month: date) -> str:
+    return f"{table_name}_p{month:%Y%m}"
+
+
+def _partition_key(table: Table) -> str:
+    """Column named in the table's ``postgresql_partition_by`` clause."""
+    clause = table.dialect_options["postgresql"]["partition_by"]
+    return clause[clause.index("(") + 1:clause.rindex(")")].strip()
+
+
+def _is_partitioned(connection, table: Table) -> bool:
+    """Whether ``table`` exists in the database as a partitioned parent."""
+    return bool(connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+        "WHERE partrelid = to_regclass(:table_name))"
+    ), {"table_name": table.name}).scalar())
+
+
+def _create_partitions(connection, table: Table, months_ahead: int) -> None:
+    """Create the default partition and monthly ones from the current month.
+    
+    A month whose rows already landed in the default partition (because
+    its partition was missing) has them moved into the new partition;
+    PostgreSQL refuses to create a range the default partition holds
+    rows for.
+    """
+    current_month = date.today().replace(day=1)
+    default = f"{table.name}_default"
+    key = _partition_key(table)
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {default} PARTITION OF {table.name} DEFAULT"
+    ))
+    for offset in range(months_ahead + 1):
+        start = _add_months(current_month, offset)
+        end = _add_months(start, 1)
+        name = _partition_name(table.name, start)
+        exists = connection.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+        ).scalar()
+        if exists:
+            continue
+        
+        # Block inserts until the range is attached, then park its default rows
+        connection.execute(text(f"LOCK TABLE {table.name} IN SHARE ROW EXCLUSIVE MODE"))
+        bounds = {"start": start, "end": end}
+        stray = connection.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {key} >= :start AND {key} < :end)"
+        ), bounds).scalar()
+        if stray:
+            connection.execute(text(
+                f"CREATE TEMP TABLE {name}_moved (LIKE {table.name}) ON COMMIT DROP"
+            ))
+            connection.execute(text(
+                f"WITH moved AS (DELETE FROM {default} "
+                f"WHERE {key} >= :start AND {key} < :end RETURNING *) "
+                f"INSERT INTO {name}_moved SELECT * FROM moved"
+            ), bounds)
+        
+        connection.execute(text(
+            f"CREATE TABLE {name} "
+            f"PARTITION OF {table.name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        if stray:
+            connection.execute(text(
+                f"INSERT INTO {table.name} SELECT * FROM {name}_moved"
+            ))
+            logger.info("Moved default partition rows into %s", name)
+
+
+def _create_initial_partitions(target, connection, **kw) -> None:
+    """Partitioned parents accept no rows until a partition exists."""
+    if connection.dialect.name == "postgresql":
+        _create_partitions(connection, target, months_ahead=2)
+
+
+def register_monthly_partitions(table: Table) -> None:
+    """Have ``table``'s monthly partitions managed by the helpers below.
+    
+    The table itself declares ``postgresql_partition_by`` in its
+    ``__table_args__``; this creates its first partitions when the table
+    is created and includes it in ensure/drop maintenance.
+    """
+    PARTITIONED_TABLES.append(table)
+    event.listen(table, "after_create", _create_initial_partitions)
+
+
+def ensure_monthly_partitions(bind, months_ahead: int = 2) -> None:
+    """Create the default and upcoming monthly partitions if missing.
+    
+    Covers the current month plus ``months_ahead``; rows outside every
+    monthly range land in the default partition instead of failing, and
+    are moved out once their month's partition is created. Run at startup
+    and daily from the ``ensure_partitions`` beat task. Tables that exist
+    unpartitioned are skipped with a warning. No-op on databases other
+    than PostgreSQL.
+    """
+    if bind.dialect.name != "postgresql":
+        return
+    
+    for table in PARTITIONED_TABLES:
+        with bind.begin() as connection:
+            if not _is_partitioned(connection, table):
+                # create_all never converts a table created before partitioning
+                logger.warning(
+                    "%s is not partitioned; migrate it before partitions can be managed",
+                    table.name
+                )
+                continue
+            _create_partitions(connection, table, months_ahead)
+
+
+def drop_partitions_before(bind, cutoff: date, tables: Optional[List[Table]] = None) -> List[str]:
+    """Detach and drop monthly partitions that end on or before ``cutoff``.
+    
+    Retention in O(1) per month instead of ``DELETE ... WHERE timestamp < ...``.
+    Applies to ``tables`` or every registered table. Returns the names of
+    the dropped partitions.
+    """
+    if bind.dialect.name != "postgresql":
+        return []
+    
+    dropped = []
+    with bind.begin() as connection:
+        for table in tables or PARTITIONED_TABLES:
+            children = connection.execute(text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                "WHERE parent.relname = :table_name"
+            ), {"table_name": table.name}).scalars()
+            
+            prefix = f"{table.name}_p"
+            for child in children:
+                if not child.startswith(prefix):
+                    continue
+                try:
+                    start = datetime.strptime(child[len(prefix):], "%Y%m").date()
+                except ValueError:
+                    continue
+                if _add_months(start, 1) <= cutoff:
+                    connection.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {child}"))
+                    connection.execute(text(f"DROP TABLE {child}"))
+                    dropped.append(child)
+    
+    return dropped
+
 
 def get_db() -> Generator[Session, None, None]:
     """Get database session dependency."""
@@ -2,12 +2,16 @@
 
 from datetime import datetime, timedelta
 from typing import Optional, Union, Any
+import hashlib
+import hmac
+import os
 import secrets
+import threading
 
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 
 from .config import get_settings
 
@@ -15,12 +19,20 @@ from .config import get_settings
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is pure CPU (and releases the GIL); more concurrent hashes than
+# cores only makes every one of them slower, so extra callers queue here
+_hash_slots = threading.BoundedSemaphore(os.cpu_count() or 1)
+
 # JWT token scheme
 security = HTTPBearer()
 
 # Get settings
 settings = get_settings()
 
+# Token key built once; given the raw secret, jose reconstructs the key
+# (and first tries to parse it as a JWK set) on every encode and decode
+_jwt_key = jwk.construct(settings.secret_key, settings.algorithm)
+
 
 class SecurityException(HTTPException):
     """Custom security exception."""
@@ -28,13 +40,19 @@ class SecurityException(HTTPException):
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash.
+    
+    Blocking for tens of milliseconds: call it from a sync handler or an
+    executor, never directly on the event loop.
+    """
+    with _hash_slots:
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Generate password hash."""
-    return pwd_context.hash(password)
+    """Generate password hash; blocking, see verify_password."""
+    with _hash_slots:
+        return pwd_context.hash(password)
 
 
 def create_access_token(
@@ -55,7 +73,7 @@ def create_access_token(
     
     return jwt.encode(
         to_encode,
-        settings.secret_key,
+        _jwt_key,
         algorithm=settings.algorithm
     )
 
@@ -78,7 +96,7 @@ def create_refresh_token(
     
     return jwt.encode(
         to_encode,
-        settings.secret_key,
+        _jwt_key,
         algorithm=settings.algorithm
     )
 
@@ -88,7 +106,7 @@ def verify_token(token: str, token_type: str = "access") -> dict:
     try:
         payload = jwt.decode(
             token,
-            settings.secret_key,
+            _jwt_key,
             algorithms=[settings.algorithm]
         )
         
@@ -199,14 +217,22 @@ def create_password_reset_data(user_id: str, email: str) -> dict:
     }
 
 
-def hash_api_key(api_key: str) -> str:
-    """Hash API key for storage."""
-    return get_password_hash(api_key)
+# Server-side pepper for API key hashes; blake2b keys are limited to 64 bytes
+_API_KEY_PEPPER = hashlib.sha256(settings.secret_key.encode()).digest()
+
+
+def hash_api_key(api_key: str) -> bytes:
+    """Hash API key for storage.
+    
+    API keys are high-entropy random tokens, so a fast keyed hash is enough
+    and makes the stored digest directly indexable for lookups.
+    """
+    return hashlib.blake2b(api_key.encode(), digest_size=32, key=_API_KEY_PEPPER).digest()
 
 
-def verify_api_key(api_key: str, hashed_key: str) -> bool:
+def verify_api_key(api_key: str, hashed_key: bytes) -> bool:
     """Verify API key against stored hash."""
-    return verify_password(api_key, hashed_key)
+    return hmac.compare_digest(hash_api_key(api_key), hashed_key)
 
 
 class RateLimiter:
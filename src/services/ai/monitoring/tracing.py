@@ -14,6 +14,7 @@ from functools import wraps
 from opentelemetry import trace, metrics
 from opentelemetry.sdk.resources import Resource, SERVICE_NAME, SERVICE_VERSION
 from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
 from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader, ConsoleMetricExporter
@@ -24,6 +25,11 @@ from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
 from opentelemetry.propagate import set_global_textmap
 from opentelemetry.propagators.b3 import B3MultiFormat
 
+try:
+    from opentelemetry.exporter.prometheus import PrometheusMetricReader
+except ImportError:
+    PrometheusMetricReader = None
+
 from src.core.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -58,8 +64,12 @@ class AIServiceTracing:
                 "deployment.environment": settings.environment,
             })
             
-            # Configure trace provider
-            trace_provider = TracerProvider(resource=resource)
+            # Configure trace provider; head-sample root traces and follow
+            # the caller's decision for propagated ones
+            trace_provider = TracerProvider(
+                resource=resource,
+                sampler=ParentBased(TraceIdRatioBased(settings.trace_sample_ratio))
+            )
             trace.set_tracer_provider(trace_provider)
             
             # Configure exporters based on environment
@@ -88,9 +98,15 @@ class AIServiceTracing:
                 export_interval_millis=30000
             )
             
+            metric_readers = [metric_reader]
+            
+            # Expose the same instruments to Prometheus via /metrics
+            if PrometheusMetricReader is not None:
+                metric_readers.append(PrometheusMetricReader())
+            
             metrics_provider = MeterProvider(
                 resource=resource,
-                metric_readers=[metric_reader]
+                metric_readers=metric_readers
             )
             metrics.set_meter_provider(metrics_provider)
             
@@ -107,11 +107,10 @@ class AnalyticsReporter:
         # Total events
         total_events = db.query(AnalyticsEvent).filter(*base_filters).count()
         
-        # Unique users
-        unique_users = db.query(AnalyticsEvent.user_id).filter(
-            *base_filters,
-            AnalyticsEvent.user_id.isnot(None)
-        ).distinct().count()
+        # Unique users; COUNT(DISTINCT) skips NULLs and needs no subquery
+        unique_users = db.query(func.count(func.distinct(AnalyticsEvent.user_id))).filter(
+            *base_filters
+        ).scalar()
         
         # Sessions
         session_filters = [UserSession.started_at >= start_date]
@@ -170,10 +169,9 @@ class AnalyticsReporter:
         ).count()
         
         # Active users (users with events in period)
-        active_users = db.query(AnalyticsEvent.user_id).filter(
-            *base_filters,
-            AnalyticsEvent.user_id.isnot(None)
-        ).distinct().count()
+        active_users = db.query(func.count(func.distinct(AnalyticsEvent.user_id))).filter(
+            *base_filters
+        ).scalar()
         
         # User retention (users who returned)
         # Simplified: users with sessions on multiple days
@@ -447,10 +445,9 @@ class AnalyticsReporter:
         ).group_by(ConversionEvent.goal_name).order_by(desc('count')).all()
         
         # Conversion rate (simplified)
-        total_users = db.query(UserSession.user_id).filter(
-            UserSession.started_at >= start_date,
-            UserSession.user_id.isnot(None)
-        ).distinct().count()
+        total_users = db.query(func.count(func.distinct(UserSession.user_id))).filter(
+            UserSession.started_at >= start_date
+        ).scalar()
         
         conversion_rate = (total_conversions / max(total_users, 1)) * 100
         
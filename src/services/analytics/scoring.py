@@ -0,0 +1,268 @@
+"""Batch popularity and session scoring for Quote Master Pro.
+
+Recomputation jobs pull whole chunks of rows with one keyset-paginated
+SELECT, score them as NumPy column vectors and write the results back
+with one bulk UPDATE per chunk, instead of loading ORM objects and
+scoring them row by row.
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Float, SmallInteger, bindparam, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from src.api.models.quote import (
+    Quote,
+    POPULARITY_WEIGHTS,
+    POPULARITY_DECAY_PER_DAY,
+    POPULARITY_MIN_DECAY
+)
+from src.api.models.analytics import (
+    UserSession,
+    FLAG_BOUNCE,
+    FLAG_ENGAGED,
+    BOUNCE_MAX_PAGE_VIEWS,
+    BOUNCE_MAX_SECONDS,
+    ENGAGED_MIN_PAGE_VIEWS,
+    ENGAGED_MIN_SECONDS
+)
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched, scored and written back per statement
+SCORING_CHUNK_SIZE = 50_000
+
+_SECONDS_PER_DAY = 86400.0
+
+_VIEW_WEIGHT = POPULARITY_WEIGHTS["view_count"]
+_LIKE_WEIGHT = POPULARITY_WEIGHTS["like_count"]
+_SHARE_WEIGHT = POPULARITY_WEIGHTS["share_count"]
+_FAVORITE_WEIGHT = POPULARITY_WEIGHTS["favorite_count"]
+
+
+def _decayed_scores_numpy(views, likes, shares, favorites, days_old):
+    """Weighted engagement times the floored linear age decay."""
+    engagement = (
+        views * _VIEW_WEIGHT
+        + likes * _LIKE_WEIGHT
+        + shares * _SHARE_WEIGHT
+        + favorites * _FAVORITE_WEIGHT
+    )
+    return engagement * np.maximum(POPULARITY_MIN_DECAY, 1.0 - days_old * POPULARITY_DECAY_PER_DAY)
+
+
+if njit is not None:
+    # Explicit signature: compiled once at import (and cached on disk),
+    # never re-specialized at call time
+    @njit("float64[:](float64[:], float64[:], float64[:], float64[:], float64[:])",
+          parallel=True, cache=True)
+    def _decayed_scores(views, likes, shares, favorites, days_old):
+        scores = np.empty(views.shape[0])
+        for i in prange(views.shape[0]):
+            engagement = (
+                views[i] * _VIEW_WEIGHT
+                + likes[i] * _LIKE_WEIGHT
+                + shares[i] * _SHARE_WEIGHT
+                + favorites[i] * _FAVORITE_WEIGHT
+            )
+            scores[i] = engagement * max(POPULARITY_MIN_DECAY, 1.0 - days_old[i] * POPULARITY_DECAY_PER_DAY)
+        return scores
+else:
+    _decayed_scores = _decayed_scores_numpy
+
+
+def _column(rows: Sequence[Tuple], index: int, dtype=np.float64) -> np.ndarray:
+    """One result column as a contiguous array, NULLs read as zero."""
+    return np.fromiter((row[index] or 0 for row in rows), dtype=dtype, count=len(rows))
+
+
+def _epoch(value: datetime) -> float:
+    """Seconds since the epoch, treating naive datetimes as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _bulk_update(
+    session: Session,
+    model,
+    target: str,
+    target_type,
+    ids: List[Any],
+    new_values: List[Any]
+) -> None:
+    """Write ``target`` for many rows in one statement.
+
+    PostgreSQL gets a single ``UPDATE ... FROM (VALUES ...)`` joined on id;
+    other dialects fall back to one executemany UPDATE.
+    """
+    if not ids:
+        return
+
+    if session.bind.dialect.name == "postgresql":
+        rows = values(
+            column("id", UUID(as_uuid=True)),
+            column("value", target_type),
+            name="v"
+        ).data(list(zip(ids, new_values)))
+        statement = (
+            update(model)
+            .where(model.id == rows.c.id)
+            .values({target: rows.c.value})
+            .execution_options(synchronize_session=False)
+        )
+        session.execute(statement)
+    else:
+        table = model.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("row_id"))
+            .values({target: bindparam("value")})
+        )
+        session.execute(
+            statement,
+            [{"row_id": row_id, "value": value} for row_id, value in zip(ids, new_values)]
+        )
+
+
+def score_quotes_batch(
+    session: Session,
+    chunk_size: int = SCORING_CHUNK_SIZE,
+    now: Optional[datetime] = None
+) -> int:
+    """Recompute ``Quote.trending_score`` for every quote.
+
+    Applies the same formula as ``Quote.calculate_popularity_score``.
+    Each chunk is committed on its own; returns the number of quotes scored.
+    """
+    now_ts = _epoch(now or datetime.now(timezone.utc))
+    last_id = None
+    scored = 0
+
+    while True:
+        query = (
+            select(
+                Quote.id,
+                Quote.view_count,
+                Quote.like_count,
+                Quote.share_count,
+                Quote.favorite_count,
+                Quote.created_at
+            )
+            .order_by(Quote.id)
+            .limit(chunk_size)
+        )
+        if last_id is not None:
+            query = query.where(Quote.id > last_id)
+        rows = session.execute(query).all()
+        if not rows:
+            break
+
+        created = np.fromiter((_epoch(row[5]) for row in rows), dtype=np.float64, count=len(rows))
+        days_old = np.floor((now_ts - created) / _SECONDS_PER_DAY)
+        scores = _decayed_scores(
+            _column(rows, 1), _column(rows, 2), _column(rows, 3), _column(rows, 4), days_old
+        )
+
+        ids = [row[0] for row in rows]
+        _bulk_update(session, Quote, "trending_score", Float, ids, scores.tolist())
+        session.commit()
+
+        scored += len(rows)
+        last_id = ids[-1]
+
+    return scored
+
+
+def score_sessions_batch(session: Session, chunk_size: int = SCORING_CHUNK_SIZE) -> int:
+    """Re-derive the bounce/engaged flags of every ended session.
+
+    Uses the thresholds behind ``UserSession.end_session`` and writes only
+    rows whose flags changed. Returns the number of sessions updated.
+    """
+    quality_bits = FLAG_BOUNCE | FLAG_ENGAGED
+    last_id = None
+    updated = 0
+
+    while True:
+        query = (
+            select(
+                UserSession.id,
+                UserSession.page_views,
+                UserSession.duration_seconds,
+                UserSession.quotes_generated,
+                UserSession.voice_recordings,
+                UserSession.flags
+            )
+            .where(UserSession.ended_at.isnot(None))
+            .order_by(UserSession.id)
+            .limit(chunk_size)
+        )
+        if last_id is not None:
+            query = query.where(UserSession.id > last_id)
+        rows = session.execute(query).all()
+        if not rows:
+            break
+
+        page_views = _column(rows, 1, np.int64)
+        duration = _column(rows, 2, np.int64)
+        flags = _column(rows, 5, np.int64)
+
+        bounce = (page_views <= BOUNCE_MAX_PAGE_VIEWS) & (duration < BOUNCE_MAX_SECONDS)
+        engaged = (
+            (page_views > ENGAGED_MIN_PAGE_VIEWS)
+            | (duration > ENGAGED_MIN_SECONDS)
+            | (_column(rows, 3, np.int64) > 0)
+            | (_column(rows, 4, np.int64) > 0)
+        )
+        new_flags = (
+            (flags & ~quality_bits)
+            | np.where(bounce, FLAG_BOUNCE, 0)
+            | np.where(engaged, FLAG_ENGAGED, 0)
+        )
+
+        changed = np.flatnonzero(new_flags != flags)
+        _bulk_update(
+            session,
+            UserSession,
+            "flags",
+            SmallInteger,
+            [rows[i][0] for i in changed],
+            new_flags[changed].tolist()
+        )
+        session.commit()
+
+        updated += len(changed)
+        last_id = rows[-1][0]
+
+    return updated
+
+
+def run_scoring_job(session: Session, chunk_size: int = SCORING_CHUNK_SIZE) -> Dict[str, Any]:
+    """Nightly recomputation of quote trending scores and session flags."""
+    started = time.monotonic()
+    quotes_scored = score_quotes_batch(session, chunk_size)
+    sessions_updated = score_sessions_batch(session, chunk_size)
+    duration = time.monotonic() - started
+
+    logger.info(
+        f"Scoring job finished: {quotes_scored} quotes scored, "
+        f"{sessions_updated} sessions updated in {duration:.1f}s"
+    )
+
+    return {
+        "quotes_scored": quotes_scored,
+        "sessions_updated": sessions_updated,
+        "duration_seconds": duration,
+        "jit": njit is not None
+    }
@@ -1,14 +1,16 @@
 """Analytics tracking service for Quote Master Pro."""
 
 import asyncio
+import functools
 import logging
+import threading
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 import json
 import uuid
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, text
 
 from src.core.database import get_db_session
 from src.core.config import get_settings
@@ -17,24 +19,41 @@ from src.api.models.analytics import (
     UserSession, 
     PageView, 
     ConversionEvent,
-    EventType
+    EventType,
+    event_type_id
 )
 from src.api.models.user import User
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Events that must not sit in the in-memory buffer; written straight away
+DURABLE_EVENT_TYPES = frozenset({
+    EventType.PAYMENT_COMPLETED,
+    EventType.SUBSCRIPTION_UPGRADED,
+    EventType.SUBSCRIPTION_CANCELLED,
+})
+
 
 class AnalyticsTracker:
     """Real-time analytics tracking service."""
     
     def __init__(self):
         self.event_queue = asyncio.Queue()
-        self.batch_size = 100
+        self.batch_size = 500
+        self.batch_window = 0.02  # seconds to keep collecting after the first event
         self.flush_interval = 30  # seconds
         self.is_processing = False
         self._active_sessions = {}
         self._event_buffer = []
+        self._tasks: List[asyncio.Task] = []
+        # Stored sessions' activity since the last flush
+        self._session_page_views: Dict[uuid.UUID, int] = {}
+        self._session_last_activity: Dict[uuid.UUID, datetime] = {}
+        self._converted_sessions = set()
+        # Latest login per user since the last flush; written from request threads
+        self._last_logins: Dict[uuid.UUID, datetime] = {}
+        self._last_logins_lock = threading.Lock()
         
     async def track_event(
         self,
@@ -60,8 +79,11 @@ class AnalyticsTracker:
                 "timestamp": datetime.utcnow()
             }
             
-            # Add to queue for processing
-            await self.event_queue.put(event_data)
+            if event_type in DURABLE_EVENT_TYPES:
+                # Bypass the write-behind buffer
+                await self._process_events_batch([event_data], durable=True)
+            else:
+                self.event_queue.put_nowait(event_data)
             
             # Log important events immediately
             if event_type in [EventType.USER_REGISTER, EventType.QUOTE_GENERATED, EventType.VOICE_RECORDING_COMPLETED]:
@@ -104,7 +126,7 @@ class AnalyticsTracker:
                 "timestamp": datetime.utcnow()
             }
             
-            await self.event_queue.put(page_view_data)
+            self.event_queue.put_nowait(page_view_data)
             
             # Update session activity
             if session_id:
@@ -218,10 +240,46 @@ class AnalyticsTracker:
             "timestamp": datetime.utcnow()
         }
         
-        await self.event_queue.put(conversion_data)
+        self.event_queue.put_nowait(conversion_data)
         
         return True
     
+    async def record(self, model: type, row: Dict[str, Any], durable: bool = False) -> None:
+        """Write a fully built ``model`` row with the next batch.
+        
+        For callers that assign the row's id and timestamps themselves so
+        they can answer before it is written. ``durable`` rows skip the
+        buffer and are committed before this returns.
+        """
+        
+        entry = {"type": "row", "model": model, "row": row}
+        if durable:
+            await self._process_events_batch([entry], durable=True)
+        else:
+            self.event_queue.put_nowait(entry)
+    
+    def record_session_activity(self, session_id: uuid.UUID, page_views: int = 0, converted: bool = False) -> None:
+        """Count page views and/or the converted flag for a stored session.
+        
+        Accumulated in memory and written by the periodic flush, so a busy
+        session costs one UPDATE per flush interval instead of one per view.
+        """
+        
+        if page_views:
+            self._session_page_views[session_id] = self._session_page_views.get(session_id, 0) + page_views
+            self._session_last_activity[session_id] = datetime.utcnow()
+        if converted:
+            self._converted_sessions.add(session_id)
+    
+    def record_login(self, user_id: uuid.UUID) -> None:
+        """Note a login; ``users.last_login_at`` is written by the next flush.
+        
+        Safe to call from sync handlers running in the threadpool.
+        """
+        
+        with self._last_logins_lock:
+            self._last_logins[user_id] = datetime.utcnow()
+    
     async def start_session(
         self,
         user_id: Optional[str] = None,
@@ -263,7 +321,7 @@ class AnalyticsTracker:
                 "type": "session_start",
                 "session_data": session_data
             }
-            await self.event_queue.put(db_session_data)
+            self.event_queue.put_nowait(db_session_data)
             
             return session_id
             
@@ -317,7 +375,7 @@ class AnalyticsTracker:
                 "type": "session_end",
                 "session_data": session_data
             }
-            await self.event_queue.put(db_session_data)
+            self.event_queue.put_nowait(db_session_data)
             
             # Remove from active sessions
             del self._active_sessions[session_id]
@@ -354,10 +412,12 @@ class AnalyticsTracker:
         
         self.is_processing = True
         
-        # Start background tasks
-        asyncio.create_task(self._process_event_queue())
-        asyncio.create_task(self._periodic_flush())
-        asyncio.create_task(self._cleanup_old_sessions())
+        # Start background tasks; handles are kept so shutdown can cancel them
+        self._tasks = [
+            asyncio.create_task(self._process_event_queue()),
+            asyncio.create_task(self._periodic_flush()),
+            asyncio.create_task(self._cleanup_old_sessions()),
+        ]
         
         logger.info("Analytics processing started")
     
@@ -366,6 +426,19 @@ class AnalyticsTracker:
         
         self.is_processing = False
         
+        # Cancel background loops instead of waiting out their sleeps
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+        # Write whatever is still buffered in the queue
+        pending = []
+        while not self.event_queue.empty():
+            pending.append(self.event_queue.get_nowait())
+        if pending:
+            await self._process_events_batch(pending)
+        
         # Flush remaining events
         await self._flush_events()
         
@@ -376,15 +449,7 @@ class AnalyticsTracker:
         
         while self.is_processing:
             try:
-                # Get events with timeout
-                events_batch = []
-                
-                for _ in range(self.batch_size):
-                    try:
-                        event = await asyncio.wait_for(self.event_queue.get(), timeout=1.0)
-                        events_batch.append(event)
-                    except asyncio.TimeoutError:
-                        break
+                events_batch = await self._drain_queue()
                 
                 if events_batch:
                     await self._process_events_batch(events_batch)
@@ -393,14 +458,110 @@ class AnalyticsTracker:
                 logger.error(f"Event processing error: {str(e)}")
                 await asyncio.sleep(1.0)
     
-    async def _process_events_batch(self, events: List[Dict[str, Any]]) -> None:
-        """Process a batch of events."""
+    async def _drain_queue(self) -> List[Dict[str, Any]]:
+        """Collect up to ``batch_size`` events.
+        
+        Waits up to a second for the first event, then keeps collecting for
+        at most ``batch_window`` so bursts share one database write.
+        """
         
+        try:
+            first = await asyncio.wait_for(self.event_queue.get(), timeout=1.0)
+        except asyncio.TimeoutError:
+            return []
+        
+        events_batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_window
+        
+        while len(events_batch) < self.batch_size:
+            try:
+                events_batch.append(self.event_queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                events_batch.append(await asyncio.wait_for(self.event_queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        return events_batch
+    
+    async def _process_events_batch(self, events: List[Dict[str, Any]], durable: bool = False) -> None:
+        """Write a batch of events without blocking the event loop."""
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._write_events_batch, events, durable))
+    
+    def _write_events_batch(self, events: List[Dict[str, Any]], durable: bool = False) -> None:
+        """Write a batch of events in one transaction.
+        
+        Events are turned into plain row dicts and written with one
+        bulk_copy per table (COPY on PostgreSQL for large batches); no ORM
+        instances are built on the ingest path.
+        Unless ``durable``, the commit doesn't wait for the WAL flush on
+        PostgreSQL: a crash can lose the last moments of buffered events,
+        which the in-memory queue already risks.
+        """
+        
+        session_rows = []
+        event_rows = []
+        page_view_rows = []
+        conversion_rows = []
+        ended_sessions = []
+        # Rows built by callers; kept apart since bulk_copy wants uniform keys
+        recorded_rows: Dict[type, List[Dict[str, Any]]] = {}
+        session_activity = []
+        last_logins: Dict[uuid.UUID, datetime] = {}
+        
+        for event_data in events:
+            event_type = event_data.get("type", "analytics_event")
+            
+            if event_type == "analytics_event":
+                event_rows.append(self._analytics_event_row(event_data))
+            elif event_type == "page_view":
+                page_view_rows.append(self._page_view_row(event_data))
+            elif event_type == "conversion":
+                conversion_rows.append(self._conversion_event_row(event_data))
+            elif event_type == "session_start":
+                session_rows.append(self._user_session_row(event_data["session_data"]))
+            elif event_type == "session_end":
+                ended_sessions.append(event_data["session_data"])
+            elif event_type == "row":
+                recorded_rows.setdefault(event_data["model"], []).append(event_data["row"])
+            elif event_type == "session_activity":
+                session_activity.append(event_data)
+            elif event_type == "last_login":
+                last_logins.update(event_data["logins"])
+        
+        db = None
         try:
             db = get_db_session()
             
-            for event_data in events:
-                await self._process_single_event(event_data, db)
+            if not durable and db.bind.dialect.name == "postgresql":
+                db.execute(text("SET LOCAL synchronous_commit = OFF"))
+            
+            # Sessions first so events in the same batch can reference them
+            UserSession.bulk_copy(db, session_rows)
+            AnalyticsEvent.bulk_copy(db, event_rows)
+            PageView.bulk_copy(db, page_view_rows)
+            ConversionEvent.bulk_copy(db, conversion_rows)
+            for model, rows in recorded_rows.items():
+                model.bulk_copy(db, rows)
+            
+            for activity in session_activity:
+                UserSession.record_activity(
+                    db, activity["page_views"], activity["last_activity"], activity["converted"]
+                )
+            
+            User.record_logins(db, last_logins)
+            
+            for session_data in ended_sessions:
+                self._update_user_session(session_data, db)
             
             # Commit all events in batch
             db.commit()
@@ -414,116 +575,76 @@ class AnalyticsTracker:
                 db.rollback()
                 db.close()
     
-    async def _process_single_event(self, event_data: Dict[str, Any], db: Session) -> None:
-        """Process a single event."""
-        
-        event_type = event_data.get("type", "analytics_event")
-        
-        if event_type == "analytics_event":
-            await self._create_analytics_event(event_data, db)
-        elif event_type == "page_view":
-            await self._create_page_view(event_data, db)
-        elif event_type == "conversion":
-            await self._create_conversion_event(event_data, db)
-        elif event_type == "session_start":
-            await self._create_user_session(event_data["session_data"], db)
-        elif event_type == "session_end":
-            await self._update_user_session(event_data["session_data"], db)
-    
-    async def _create_analytics_event(self, event_data: Dict[str, Any], db: Session) -> None:
-        """Create analytics event in database."""
-        
-        event = AnalyticsEvent(
-            user_id=event_data.get("user_id"),
-            session_id=event_data.get("session_id"),
-            event_type=event_data["event_type"],
-            event_name=event_data["event_name"],
-            properties=event_data.get("properties"),
-            value=event_data.get("value"),
-            timestamp=event_data["timestamp"]
-        )
+    def _analytics_event_row(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build an analytics_events row."""
         
-        # Add metadata if available
         metadata = event_data.get("metadata", {})
-        if "user_agent" in metadata:
-            event.user_agent = metadata["user_agent"]
-        if "ip_address" in metadata:
-            event.ip_address = metadata["ip_address"]
-        if "page_url" in metadata:
-            event.page_url = metadata["page_url"]
-        
-        db.add(event)
+        return {
+            "user_id": event_data.get("user_id"),
+            "session_id": event_data.get("session_id"),
+            "event_type_id": event_type_id(event_data["event_type"]),
+            "event_name": event_data["event_name"],
+            "properties": event_data.get("properties"),
+            "value": event_data.get("value"),
+            "timestamp": event_data["timestamp"],
+            "user_agent": metadata.get("user_agent"),
+            "ip_address": metadata.get("ip_address"),
+            "page_url": metadata.get("page_url")
+        }
     
-    async def _create_page_view(self, event_data: Dict[str, Any], db: Session) -> None:
-        """Create page view in database."""
-        
-        page_view = PageView(
-            user_id=event_data.get("user_id"),
-            session_id=event_data.get("session_id"),
-            url=event_data["url"],
-            title=event_data.get("title"),
-            path=event_data["path"],
-            referrer=event_data.get("referrer"),
-            load_time=event_data.get("load_time"),
-            viewed_at=event_data["timestamp"]
-        )
+    def _page_view_row(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a page_views row."""
         
-        db.add(page_view)
+        return {
+            "user_id": event_data.get("user_id"),
+            "session_id": event_data.get("session_id"),
+            "url": event_data["url"],
+            "title": event_data.get("title"),
+            "path": event_data["path"],
+            "referrer": event_data.get("referrer"),
+            "load_time": event_data.get("load_time"),
+            "viewed_at": event_data["timestamp"]
+        }
     
-    async def _create_conversion_event(self, event_data: Dict[str, Any], db: Session) -> None:
-        """Create conversion event in database."""
-        
-        conversion = ConversionEvent(
-            user_id=event_data.get("user_id"),
-            session_id=event_data.get("session_id"),
-            goal_name=event_data["goal_name"],
-            goal_category=event_data.get("goal_category"),
-            value=event_data.get("value"),
-            conversion_path=event_data.get("conversion_path"),
-            converted_at=event_data["timestamp"]
-        )
+    def _conversion_event_row(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a conversion_events row."""
         
-        db.add(conversion)
+        return {
+            "user_id": event_data.get("user_id"),
+            "session_id": event_data.get("session_id"),
+            "goal_name": event_data["goal_name"],
+            "goal_category": event_data.get("goal_category"),
+            "value": event_data.get("value"),
+            "conversion_path": event_data.get("conversion_path"),
+            "converted_at": event_data["timestamp"]
+        }
     
-    async def _create_user_session(self, session_data: Dict[str, Any], db: Session) -> None:
-        """Create user session in database."""
-        
-        session = UserSession(
-            id=session_data["session_id"],
-            user_id=session_data.get("user_id"),
-            session_token=session_data["session_id"],
-            anonymous_id=session_data.get("anonymous_id"),
-            started_at=session_data["started_at"]
-        )
+    def _user_session_row(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a user_sessions row."""
         
-        # Add metadata
         metadata = session_data.get("metadata", {})
-        if "user_agent" in metadata:
-            session.user_agent = metadata["user_agent"]
-        if "ip_address" in metadata:
-            session.ip_address = metadata["ip_address"]
-        if "referrer" in metadata:
-            session.referrer = metadata["referrer"]
-        
-        db.add(session)
+        return {
+            "id": session_data["session_id"],
+            "user_id": session_data.get("user_id"),
+            "session_token": session_data["session_id"],
+            "anonymous_id": session_data.get("anonymous_id"),
+            "started_at": session_data["started_at"],
+            "user_agent": metadata.get("user_agent"),
+            "ip_address": metadata.get("ip_address"),
+            "referrer": metadata.get("referrer")
+        }
     
-    async def _update_user_session(self, session_data: Dict[str, Any], db: Session) -> None:
+    def _update_user_session(self, session_data: Dict[str, Any], db: Session) -> None:
         """Update user session in database."""
         
-        session = db.query(UserSession).filter(
-            UserSession.id == session_data["session_id"]
-        ).first()
-        
-        if session:
-            session.ended_at = session_data["ended_at"]
-            session.duration_seconds = session_data["duration_seconds"]
-            session.page_views = session_data["page_views"]
-            session.quotes_generated = session_data["quotes_generated"]
-            session.voice_recordings = session_data["voice_recordings"]
-            session.interactions = session_data["interactions"]
-            session.bounce = session_data["bounce"]
-            session.engaged = session_data["engaged"]
-            session.is_active = False
+        UserSession.end_session(
+            db,
+            session_data["session_id"],
+            page_views=session_data["page_views"],
+            quotes_generated=session_data["quotes_generated"],
+            voice_recordings=session_data["voice_recordings"],
+            interactions=session_data["interactions"]
+        )
     
     async def _periodic_flush(self) -> None:
         """Periodically flush events."""
@@ -533,7 +654,23 @@ class AnalyticsTracker:
             await self._flush_events()
     
     async def _flush_events(self) -> None:
-        """Flush buffered events."""
+        """Flush buffered events, accumulated session activity and logins."""
+        
+        if self._session_page_views or self._converted_sessions:
+            self._event_buffer.append({
+                "type": "session_activity",
+                "page_views": self._session_page_views,
+                "last_activity": self._session_last_activity,
+                "converted": list(self._converted_sessions)
+            })
+            self._session_page_views = {}
+            self._session_last_activity = {}
+            self._converted_sessions = set()
+        
+        with self._last_logins_lock:
+            last_logins, self._last_logins = self._last_logins, {}
+        if last_logins:
+            self._event_buffer.append({"type": "last_login", "logins": last_logins})
         
         if self._event_buffer:
             try:
@@ -0,0 +1,136 @@
+"""Short-lived per-process cache of users for the authentication path."""
+
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.api.models.user import User
+
+USER_CACHE_TTL = 60  # seconds
+USER_CACHE_SIZE = 10_000
+
+# Column values keyed by ("id", str(id)) and ("email", lowercased email)
+_entries: Dict[Tuple[str, str], Tuple[float, Mapping[str, Any]]] = {}
+_lock = threading.Lock()
+
+
+def _snapshot(user: User) -> Mapping[str, Any]:
+    return MappingProxyType({
+        attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+    })
+
+
+def _keys(values: Mapping[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return ("id", str(values["id"])), ("email", (values["email"] or "").lower())
+
+
+def _lookup(key: Tuple[str, str]) -> Optional[Mapping[str, Any]]:
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _entries[key]
+            return None
+        return entry[1]
+
+
+def _store(user: User) -> None:
+    values = _snapshot(user)
+    expires_at = time.monotonic() + USER_CACHE_TTL
+    with _lock:
+        for key in _keys(values):
+            _entries.pop(key, None)
+            _entries[key] = (expires_at, values)
+        # Oldest entries first, since dicts keep insertion order
+        while len(_entries) > USER_CACHE_SIZE:
+            del _entries[next(iter(_entries))]
+
+
+def _cached(db: Session, key: Tuple[str, str]) -> Optional[User]:
+    """The cached user under ``key`` attached to ``db``, if any."""
+    values = _lookup(key)
+    return _attach(db, values) if values is not None else None
+
+
+def _attach(db: Session, values: Mapping[str, Any]) -> User:
+    """Put a copy of the cached user into ``db`` without a SELECT."""
+    user = inspect(User).class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(user, key, value)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def get_user_by_id(db: Session, user_id: Any) -> Optional[User]:
+    """Get a user by primary key, attached to ``db``.
+
+    Served from the cache for up to USER_CACHE_TTL seconds after it was
+    loaded; misses aren't cached. Writes to credentials, role or active
+    state call invalidate_user, so only other processes can serve a stale
+    copy, and only until it expires. The returned user can be modified and
+    committed like one loaded by a query.
+    """
+    user = _cached(db, ("id", str(user_id)))
+    if user is not None:
+        return user
+
+    user = db.get(User, user_id)
+    if user is not None:
+        _store(user)
+    return user
+
+
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    """Get a user by case-insensitive email, attached to ``db``; see get_user_by_id."""
+    user = _cached(db, ("email", email.lower()))
+    if user is not None:
+        return user
+
+    user = db.execute(select(User).where(User.email_matches(email))).scalar_one_or_none()
+    if user is not None:
+        _store(user)
+    return user
+
+
+def invalidate_user(user_id: Any = None, email: Optional[str] = None) -> None:
+    """Drop a user's cached entries by id and/or email.
+
+    Needed after UPDATE statements that bypass the ORM unit of work, which
+    the listeners below don't see. Other processes keep their copy until
+    it expires.
+    """
+    keys = []
+    if user_id is not None:
+        keys.append(("id", str(user_id)))
+    if email is not None:
+        keys.append(("email", email.lower()))
+
+    with _lock:
+        for key in keys:
+            entry = _entries.pop(key, None)
+            if entry is not None:
+                # The same user's entry under its other key
+                for other in _keys(entry[1]):
+                    _entries.pop(other, None)
+
+
+def invalidate_users() -> None:
+    """Drop every cached user."""
+    with _lock:
+        _entries.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target) -> None:
+    """Invalidate whenever this process writes a user through the ORM."""
+    history = inspect(target).attrs.email.history
+    invalidate_user(target.id, target.email)
+    for email in history.deleted or ():
+        invalidate_user(email=email)
@@ -14,13 +14,22 @@ import structlog
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
 
-from src.services.monitoring.enhanced_metrics import get_metrics_collector
+from src.services.monitoring.enhanced_metrics import (
+    get_metrics_collector,
+    get_current_memory_usage,
+    get_current_cpu_usage
+)
 
 logger = structlog.get_logger(__name__)
 
 @dataclass
 class PerformanceProfile:
     """Performance profiling data."""
+    __slots__ = (
+        "endpoint", "duration", "memory_usage", "cpu_usage",
+        "database_queries", "cache_operations", "external_calls"
+    )
+    
     endpoint: str
     duration: float
     memory_usage: int
@@ -233,20 +242,11 @@ class APMTracker:
     
     def _get_memory_usage(self) -> int:
         """Get current memory usage in bytes."""
-        try:
-            import psutil
-            process = psutil.Process()
-            return process.memory_info().rss
-        except ImportError:
-            return 0
+        return get_current_memory_usage()
     
     def _get_cpu_usage(self) -> float:
         """Get current CPU usage percentage."""
-        try:
-            import psutil
-            return psutil.cpu_percent(interval=0.1)
-        except ImportError:
-            return 0.0
+        return get_current_cpu_usage()
     
     async def _calculate_avg_response_time(self) -> float:
         """Calculate average response time from recent data."""
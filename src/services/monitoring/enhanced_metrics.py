@@ -3,6 +3,7 @@ Enhanced metrics collection for Quote Master Pro.
 Provides comprehensive application and business metrics.
 """
 
+import os
 import time
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
@@ -10,14 +11,64 @@ from datetime import datetime, timedelta
 
 import structlog
 from opentelemetry import metrics
-from opentelemetry.metrics import Counter, Histogram, Gauge, UpDownCounter
+from opentelemetry.metrics import Counter, Histogram, Gauge, UpDownCounter, CallbackOptions, Observation
 
 from src.core.config import get_settings
 from src.services.ai.monitoring.tracing import get_meter
 
+try:
+    import psutil
+    _PROCESS = psutil.Process(os.getpid())
+except ImportError:
+    psutil = None
+    _PROCESS = None
+
 logger = structlog.get_logger(__name__)
 settings = get_settings()
 
+# Minimum seconds between two real psutil samples; callers inside the window
+# get the memoized values instead of re-reading /proc.
+RESOURCE_SAMPLE_INTERVAL = 1.0
+
+_resource_sample: Dict[str, float] = {"timestamp": 0.0, "memory": 0, "cpu": 0.0}
+
+
+def _sample_resources() -> Dict[str, float]:
+    """Sample process memory and CPU, memoized for RESOURCE_SAMPLE_INTERVAL."""
+    
+    if _PROCESS is None:
+        return _resource_sample
+    
+    now = time.monotonic()
+    if now - _resource_sample["timestamp"] >= RESOURCE_SAMPLE_INTERVAL:
+        with _PROCESS.oneshot():
+            _resource_sample["memory"] = _PROCESS.memory_info().rss
+            # Non-blocking: percentage since the previous call on this process
+            _resource_sample["cpu"] = _PROCESS.cpu_percent(interval=None)
+        _resource_sample["timestamp"] = now
+    
+    return _resource_sample
+
+
+def get_current_memory_usage() -> int:
+    """Get current process memory usage (RSS) in bytes."""
+    return int(_sample_resources()["memory"])
+
+
+def get_current_cpu_usage() -> float:
+    """Get current process CPU usage percentage."""
+    return _sample_resources()["cpu"]
+
+
+def _observe_memory_usage(options: CallbackOptions):
+    """Report process memory when metrics are collected."""
+    yield Observation(get_current_memory_usage())
+
+
+def _observe_cpu_usage(options: CallbackOptions):
+    """Report process CPU usage when metrics are collected."""
+    yield Observation(get_current_cpu_usage())
+
 @dataclass
 class BusinessMetrics:
     """Business-level metrics for monitoring."""
@@ -62,6 +113,12 @@ class EnhancedMetricsCollector:
             unit="s"
         )
         
+        self.pricing_calculation_duration = self.meter.create_histogram(
+            name="pricing_calculation_duration_seconds",
+            description="Time taken to calculate service quote pricing",
+            unit="s"
+        )
+        
         # Cache metrics
         self.cache_operations_counter = self.meter.create_counter(
             name="cache_operations_total",
@@ -107,26 +164,54 @@ class EnhancedMetricsCollector:
             unit="s"
         )
         
-        # API-specific metrics
-        self.api_requests_by_endpoint = self.meter.create_counter(
-            name="api_requests_by_endpoint_total",
-            description="API requests by endpoint",
+        # HTTP metrics, recorded once per request by the observability middleware
+        self.http_requests_counter = self.meter.create_counter(
+            name="http_requests_total",
+            description="Total HTTP requests processed",
+            unit="1"
+        )
+        
+        self.http_request_duration = self.meter.create_histogram(
+            name="http_request_duration_seconds",
+            description="HTTP request duration in seconds",
+            unit="s"
+        )
+        
+        self.http_response_size = self.meter.create_histogram(
+            name="http_response_size_bytes",
+            description="HTTP response size in bytes",
+            unit="by"
+        )
+        
+        self.http_requests_active = self.meter.create_up_down_counter(
+            name="http_requests_active",
+            description="HTTP requests currently in flight",
             unit="1"
         )
         
+        # API-specific metrics
         self.api_request_size = self.meter.create_histogram(
             name="api_request_size_bytes",
             description="API request payload size",
             unit="by"
         )
         
-        # System resource metrics
-        self.memory_usage_gauge = self.meter.create_gauge(
+        # System resource metrics, sampled only when a reader collects
+        # (Prometheus scrape or periodic export) rather than by a poller
+        self.memory_usage_gauge = self.meter.create_observable_gauge(
             name="system_memory_usage_bytes",
-            description="System memory usage",
+            callbacks=[_observe_memory_usage],
+            description="Process memory usage (RSS)",
             unit="by"
         )
         
+        self.cpu_usage_gauge = self.meter.create_observable_gauge(
+            name="system_cpu_usage_percent",
+            callbacks=[_observe_cpu_usage],
+            description="Process CPU usage",
+            unit="%"
+        )
+        
         # Security metrics
         self.authentication_attempts = self.meter.create_counter(
             name="authentication_attempts_total",
@@ -229,15 +314,19 @@ class EnhancedMetricsCollector:
                           method: str,
                           status_code: int,
                           request_size: int):
-        """Record API request metrics."""
+        """Record an API request's payload size.
+        
+        Request counts come from the observability middleware's
+        ``http_requests_total``; counting here too would double them.
+        """
         
         labels = {
-            "endpoint": endpoint,
             "method": method,
+            "route": endpoint,
+            "status_code": str(status_code),
             "status_class": f"{status_code // 100}xx"
         }
         
-        self.api_requests_by_endpoint.add(1, labels)
         self.api_request_size.record(request_size, labels)
     
     def record_authentication_attempt(self, 
@@ -301,3 +390,11 @@ metrics_collector = EnhancedMetricsCollector()
 def get_metrics_collector() -> EnhancedMetricsCollector:
     """Get the global metrics collector instance."""
     return metrics_collector
+
+def observe_pricing(duration: float) -> None:
+    """Record a pricing calculation duration.
+    
+    Plain function for the hot pricing path: callers time with
+    ``time.monotonic()`` instead of allocating a tracker per call.
+    """
+    metrics_collector.pricing_calculation_duration.record(duration)
@@ -7,6 +7,7 @@ from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 import json
+import time
 import asyncio
 
 from src.models.service_quote import ServiceType, PropertyType, PerthSuburb, ServiceQuote
@@ -16,6 +17,7 @@ from src.services.ai.base import AIRequest, AITaskType
 from src.core.config import get_settings
 from src.core.exceptions import QuoteGenerationException
 from src.core.database import get_db_session
+from src.services.monitoring.enhanced_metrics import observe_pricing
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -50,6 +52,7 @@ class PricingEngine:
         """
         Calculate comprehensive service quote with pricing breakdown
         """
+        start_time = time.monotonic()
         try:
             # Step 1: Get base pricing from rules
             base_price = self._get_base_price(service_type, property_type)
@@ -71,6 +74,7 @@ class PricingEngine:
             subtotal = base_price + quantity_price
             location_adjusted = subtotal * location_adjustment
             final_price = location_adjusted * complexity_adjustment
+            observe_pricing(time.monotonic() - start_time)
             
             # Step 6: Generate quote details
             quote_details = self._generate_quote_details(
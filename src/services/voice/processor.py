@@ -2,7 +2,7 @@
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from pathlib import Path
 import json
 import numpy as np
@@ -31,9 +31,17 @@ class VoiceProcessor:
     async def process_audio_file(
         self,
         file_path: str,
-        processing_options: Dict[str, Any]
+        processing_options: Dict[str, Any],
+        on_progress: Optional[Callable[[float, str], None]] = None
     ) -> Dict[str, Any]:
-        """Process an audio file with various analysis options."""
+        """Process an audio file with various analysis options.
+        
+        ``on_progress(percent, step)`` is called as each step begins.
+        """
+        
+        def progress(percent: float, step: str) -> None:
+            if on_progress:
+                on_progress(percent, step)
         
         try:
             logger.info(f"Starting audio processing for {file_path}")
@@ -54,12 +62,14 @@ class VoiceProcessor:
             
             # Step 2: Audio quality analysis
             if processing_options.get("analyze_quality", True):
+                progress(10.0, "analyzing_quality")
                 logger.info("Analyzing audio quality...")
                 quality_result = await self.recognizer.analyze_audio_quality(file_path)
                 result["analysis"]["quality"] = quality_result
             
             # Step 3: Transcription
             transcription_engine = processing_options.get("transcription_engine", "whisper")
+            progress(25.0, "transcribing")
             
             if transcription_engine == "whisper":
                 transcription_result = await self.whisper_service.transcribe_file(
@@ -84,12 +94,14 @@ class VoiceProcessor:
             
             # Step 4: Language detection (if not specified)
             if not processing_options.get("language") and result["transcription"]:
+                progress(60.0, "detecting_language")
                 logger.info("Detecting language...")
                 language_result = await self.recognizer.detect_language(file_path)
                 result["analysis"]["language_detection"] = language_result
             
             # Step 5: Text analysis (if transcription succeeded)
             if result["transcription"] and processing_options.get("analyze_text", True):
+                progress(70.0, "analyzing_text")
                 await self._analyze_transcribed_text(
                     result["transcription"]["transcription"],
                     result,
@@ -98,12 +110,14 @@ class VoiceProcessor:
             
             # Step 6: Voice characteristics analysis
             if processing_options.get("analyze_voice", True):
+                progress(80.0, "analyzing_voice")
                 logger.info("Analyzing voice characteristics...")
                 voice_analysis = await self._analyze_voice_characteristics(file_path)
                 result["analysis"]["voice_characteristics"] = voice_analysis
             
             # Step 7: Generate insights and recommendations
             if processing_options.get("generate_insights", True):
+                progress(90.0, "generating_insights")
                 await self._generate_processing_insights(result, processing_options)
             
             result["success"] = True
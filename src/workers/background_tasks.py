@@ -10,10 +10,12 @@ import traceback
 
 from celery import Celery
 from celery.result import AsyncResult
+from celery.states import UNREADY_STATES
 
 from src.workers.celery_app import celery_app
 from src.core.config import get_settings
 from src.core.database import get_db_session
+from src.services.cache.redis_connection import async_cache_get, async_cache_set
 from src.services.analytics.tracker import get_analytics_tracker
 from src.services.ai.orchestrator import get_ai_orchestrator
 from src.services.voice.processor import get_voice_processor
@@ -84,22 +86,33 @@ class BackgroundTaskManager:
         recording_id: str,
         user_id: str,
         processing_options: Dict[str, Any],
-        priority: TaskPriority = TaskPriority.NORMAL
+        priority: TaskPriority = TaskPriority.NORMAL,
+        job_id: Optional[str] = None,
+        file_path: Optional[str] = None,
+        task_id: Optional[str] = None
     ) -> str:
-        """Schedule voice processing task."""
+        """Schedule voice processing task.
+        
+        When ``job_id`` is given the worker reports progress and the outcome
+        on that ``VoiceProcessingJob`` row, which must be assigned to
+        ``task_id`` (its ``worker_id``).
+        """
         
         try:
             task_data = {
                 "recording_id": recording_id,
                 "user_id": user_id,
                 "processing_options": processing_options,
+                "job_id": job_id,
+                "file_path": file_path,
                 "scheduled_at": datetime.utcnow().isoformat()
             }
             
             # Submit to Celery
             result = process_voice_recording.apply_async(
                 args=[task_data],
-                priority=priority.value
+                priority=priority.value,
+                task_id=task_id
             )
             
             # Track task
@@ -113,6 +126,18 @@ class BackgroundTaskManager:
             logger.error(f"Failed to schedule voice processing: {str(e)}")
             raise
     
+    def schedule_voice_job_dispatch(self) -> str:
+        """Have a worker dispatch every pending voice processing job."""
+        
+        try:
+            result = dispatch_voice_jobs.apply_async()
+            self._track_task(result.id, "voice_dispatch", {"scheduled_at": datetime.utcnow().isoformat()})
+            return result.id
+            
+        except Exception as e:
+            logger.error(f"Failed to schedule voice job dispatch: {str(e)}")
+            raise
+    
     async def schedule_quote_generation(
         self,
         user_id: str,
@@ -177,11 +202,23 @@ class BackgroundTaskManager:
         self,
         cleanup_type: str,
         options: Dict[str, Any],
-        priority: TaskPriority = TaskPriority.LOW
+        priority: TaskPriority = TaskPriority.LOW,
+        dedupe: bool = False
     ) -> str:
-        """Schedule cleanup task."""
+        """Schedule cleanup task.
+        
+        With ``dedupe`` a request for a cleanup type that is already queued
+        or running returns that task's id instead of queueing another one.
+        """
+        
+        dedupe_key = f"cleanup_task:{cleanup_type}"
         
         try:
+            if dedupe:
+                queued_id = await async_cache_get(dedupe_key)
+                if queued_id and AsyncResult(queued_id, app=celery_app).state in UNREADY_STATES:
+                    return queued_id
+            
             task_data = {
                 "cleanup_type": cleanup_type,
                 "options": options,
@@ -195,6 +232,9 @@ class BackgroundTaskManager:
             
             self._track_task(result.id, "cleanup", task_data)
             
+            if dedupe:
+                await async_cache_set(dedupe_key, result.id, ttl=celery_app.conf.task_time_limit)
+            
             return result.id
             
         except Exception as e:
@@ -309,15 +349,39 @@ class BackgroundTaskManager:
 def process_voice_recording(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
     """Process voice recording task."""
     
+    from src.api.models.voice import VoiceProcessingJob, VoiceProcessingStatus
+    
+    # One session for the whole task: progress heartbeats and the outcome
+    db = get_db_session()
+    job_id = task_data.get("job_id")
+    
     try:
         recording_id = task_data["recording_id"]
         user_id = task_data["user_id"]
         processing_options = task_data["processing_options"]
+        file_path = task_data.get("file_path") or f"uploads/audio/{recording_id}"
         
         logger.info(f"Starting voice processing for recording {recording_id}")
         
+        # Update task status
+        if job_id:
+            started = VoiceProcessingJob.start(db, job_id, self.request.id)
+            db.commit()
+            if not started:
+                # Queued twice, or no longer pending: another worker owns it
+                logger.info(f"Skipping voice job {job_id}: not pending for this task")
+                return {"success": True, "skipped": True, "job_id": job_id}
+        
         # Update task status
         self.update_state(state='STARTED', meta={'status': 'Processing audio file'})
+        if job_id:
+            VoiceProcessingJob.write_progress(db, job_id, 0.0, "processing_audio")
+            db.commit()
+        
+        def heartbeat(percent: float, step: str) -> None:
+            # One small UPDATE per step, committed so pollers see it at once
+            VoiceProcessingJob.write_progress(db, job_id, percent, step)
+            db.commit()
         
         # Get voice processor
         voice_processor = get_voice_processor()
@@ -325,10 +389,20 @@ def process_voice_recording(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         # Process the recording
         # Note: This would need to be adapted for sync execution in Celery
         result = asyncio.run(voice_processor.process_audio_file(
-            file_path=f"uploads/audio/{recording_id}",
-            processing_options=processing_options
+            file_path=file_path,
+            processing_options=processing_options,
+            on_progress=heartbeat if job_id else None
         ))
         
+        if job_id:
+            VoiceProcessingJob.finish(
+                db,
+                job_id,
+                VoiceProcessingStatus.COMPLETED if result["success"] else VoiceProcessingStatus.FAILED,
+                result_data=result
+            )
+            db.commit()
+        
         # Track analytics
         tracker = get_analytics_tracker()
         asyncio.run(tracker.track_voice_processing(
@@ -350,6 +424,7 @@ def process_voice_recording(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         
     except Exception as e:
         logger.error(f"Voice processing task failed: {str(e)}")
+        db.rollback()
         
         # Track failure
         if 'user_id' in task_data and 'recording_id' in task_data:
@@ -366,14 +441,101 @@ def process_voice_recording(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         # Retry logic
         if self.request.retries < self.max_retries:
             logger.info(f"Retrying voice processing task (attempt {self.request.retries + 1})")
+            if job_id:
+                # The retry runs under the same task id and starts the job again
+                VoiceProcessingJob.release(db, job_id)
+                db.commit()
             raise self.retry(countdown=60 * (2 ** self.request.retries))  # Exponential backoff
         
+        if job_id:
+            VoiceProcessingJob.finish(db, job_id, VoiceProcessingStatus.FAILED, error_message=str(e))
+            db.commit()
+        
         return {
             "success": False,
             "error": str(e),
             "traceback": traceback.format_exc(),
             "failed_at": datetime.utcnow().isoformat()
         }
+    
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, name='quote_master_pro.dispatch_voice_jobs')
+def dispatch_voice_jobs(self, batch_size: int = 32) -> Dict[str, Any]:
+    """Claim requeued voice jobs in batches and queue each for processing.
+    
+    Batches are claimed with SKIP LOCKED, so several dispatchers can drain
+    the queue together without handing out the same job twice; each job is
+    queued under the task id it was assigned.
+    """
+    
+    from src.api.models.voice import VoiceProcessingJob
+    
+    db = get_db_session()
+    dispatched = 0
+    
+    try:
+        while True:
+            jobs = VoiceProcessingJob.claim_pending(db, batch_size)
+            db.commit()
+            if not jobs:
+                break
+            
+            for task_id, job in jobs:
+                process_voice_recording.apply_async(task_id=task_id, args=[{
+                    "recording_id": str(job.recording_id),
+                    "user_id": str(job.user_id),
+                    "processing_options": job.parameters or {},
+                    "job_id": str(job.id),
+                    "file_path": job.file_path,
+                    "scheduled_at": datetime.utcnow().isoformat()
+                }])
+            dispatched += len(jobs)
+        
+        return {"success": True, "dispatched": dispatched}
+        
+    except Exception as e:
+        logger.error(f"Voice job dispatch failed: {str(e)}")
+        db.rollback()
+        return {"success": False, "dispatched": dispatched, "error": str(e)}
+    
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, name='quote_master_pro.refresh_recent_jobs')
+def refresh_recent_jobs(self) -> Dict[str, Any]:
+    """Refresh the recent voice jobs snapshot read by the admin job listing."""
+    
+    from src.core.database import engine
+    from src.api.models.voice import refresh_recent_jobs_view
+    
+    try:
+        refresh_recent_jobs_view(engine)
+        return {"success": True, "refreshed_at": datetime.utcnow().isoformat()}
+        
+    except Exception as e:
+        logger.error(f"Recent jobs view refresh failed: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+
+@celery_app.task(bind=True, name='quote_master_pro.ensure_partitions')
+def ensure_partitions(self) -> Dict[str, Any]:
+    """Roll the monthly partitions forward so long uptimes never outrun them."""
+    
+    from src.core.database import engine, ensure_monthly_partitions
+    import src.api.models.analytics  # noqa - registers partitioned tables
+    import src.api.models.voice  # noqa - registers partitioned tables
+    
+    try:
+        ensure_monthly_partitions(engine)
+        return {"success": True, "ensured_at": datetime.utcnow().isoformat()}
+        
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {str(e)}")
+        return {"success": False, "error": str(e)}
 
 
 @celery_app.task(bind=True, name='quote_master_pro.generate_quote')
@@ -455,6 +617,12 @@ def process_analytics(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
             result = _process_performance_metrics(data)
         elif analytics_type == "usage_patterns":
             result = _process_usage_patterns(data)
+        elif analytics_type == "scoring":
+            result = _process_scoring(data)
+        elif analytics_type == "daily_active_users":
+            result = _process_daily_active_users(data)
+        elif analytics_type == "daily_session_metrics":
+            result = _process_daily_session_metrics(data)
         else:
             result = {"processed": False, "reason": f"Unknown analytics type: {analytics_type}"}
         
@@ -492,6 +660,8 @@ def cleanup_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
             result = _cleanup_failed_jobs(options)
         elif cleanup_type == "analytics_data":
             result = _cleanup_old_analytics(options)
+        elif cleanup_type == "old_partitions":
+            result = _cleanup_old_partitions(options)
         else:
             result = {"cleaned": False, "reason": f"Unknown cleanup type: {cleanup_type}"}
         
@@ -556,6 +726,76 @@ def _process_usage_patterns(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _process_scoring(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Recompute quote trending scores and session quality flags."""
+    
+    from src.services.analytics.scoring import run_scoring_job, SCORING_CHUNK_SIZE
+    
+    db = get_db_session()
+    try:
+        return run_scoring_job(db, data.get("chunk_size", SCORING_CHUNK_SIZE))
+    finally:
+        db.close()
+
+
+# Days of history a rollup is backfilled with while it is still empty
+ROLLUP_BACKFILL_DAYS = 365
+
+
+def _rollup_days(db, rollup, data: Dict[str, Any]) -> int:
+    """Days to refresh: ``days`` if given, a backfill while ``rollup`` is empty, else 2."""
+    
+    if "days" in data:
+        return data["days"]
+    if db.query(rollup.day).first() is None:
+        return ROLLUP_BACKFILL_DAYS
+    return 2
+
+
+def _process_daily_active_users(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Refresh the daily active users rollup for the last ``days`` days through today.
+    
+    Defaults to 2 days, or ROLLUP_BACKFILL_DAYS while the rollup is empty.
+    """
+    
+    from src.api.models.analytics import DailyActiveUsers
+    
+    db = get_db_session()
+    try:
+        end = datetime.utcnow().date() + timedelta(days=1)
+        start = end - timedelta(days=_rollup_days(db, DailyActiveUsers, data))
+        days_refreshed = DailyActiveUsers.refresh(db, start, end)
+        db.commit()
+        return {"days_refreshed": days_refreshed, "from": start.isoformat(), "to": end.isoformat()}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _process_daily_session_metrics(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Refresh the dashboard's session metrics rollup for the last ``days`` days through today.
+    
+    Defaults to 2 days, or ROLLUP_BACKFILL_DAYS while the rollup is empty.
+    """
+    
+    from src.api.models.analytics import DailySessionMetrics
+    
+    db = get_db_session()
+    try:
+        end = datetime.utcnow().date() + timedelta(days=1)
+        start = end - timedelta(days=_rollup_days(db, DailySessionMetrics, data))
+        days_refreshed = DailySessionMetrics.refresh(db, start, end)
+        db.commit()
+        return {"days_refreshed": days_refreshed, "from": start.isoformat(), "to": end.isoformat()}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 def _cleanup_old_sessions(options: Dict[str, Any]) -> Dict[str, Any]:
     """Clean up old user sessions."""
     
@@ -679,6 +919,34 @@ def _cleanup_old_analytics(options: Dict[str, Any]) -> Dict[str, Any]:
         return {"error": str(e)}
 
 
+def _cleanup_old_partitions(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop monthly partitions older than the retention window.
+    
+    Expects the rows to have been archived already; a dropped partition
+    is gone for good.
+    """
+    
+    try:
+        from src.core.database import engine, drop_partitions_before
+        import src.api.models.analytics  # noqa - registers partitioned tables
+        import src.api.models.voice  # noqa - registers partitioned tables
+        
+        months = options.get("months_to_keep", 6)
+        this_month = datetime.utcnow().date().replace(day=1)
+        month_index = this_month.year * 12 + this_month.month - 1 - months
+        cutoff = this_month.replace(year=month_index // 12, month=month_index % 12 + 1)
+        
+        dropped = drop_partitions_before(engine, cutoff)
+        
+        return {
+            "partitions_dropped": dropped,
+            "cutoff_date": cutoff.isoformat()
+        }
+        
+    except Exception as e:
+        return {"error": str(e)}
+
+
 # Global task manager instance
 _task_manager = None
 
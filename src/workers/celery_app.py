@@ -40,6 +40,30 @@ celery_app.conf.update(
         Queue('analytics'),
         Queue('maintenance'),
     ),
+    beat_schedule={
+        'refresh-recent-voice-jobs': {
+            'task': 'quote_master_pro.refresh_recent_jobs',
+            'schedule': 60.0,
+            'options': {'queue': 'maintenance', 'expires': 60},
+        },
+        'ensure-monthly-partitions': {
+            'task': 'quote_master_pro.ensure_partitions',
+            'schedule': 24 * 60 * 60.0,
+            'options': {'queue': 'maintenance', 'expires': 60 * 60},
+        },
+        'refresh-daily-active-users': {
+            'task': 'quote_master_pro.analytics',
+            'schedule': 300.0,
+            'args': ({'analytics_type': 'daily_active_users', 'data': {}},),
+            'options': {'queue': 'analytics', 'expires': 300},
+        },
+        'refresh-daily-session-metrics': {
+            'task': 'quote_master_pro.analytics',
+            'schedule': 300.0,
+            'args': ({'analytics_type': 'daily_session_metrics', 'data': {}},),
+            'options': {'queue': 'analytics', 'expires': 300},
+        },
+    },
 )
 
 # Auto-discover tasks
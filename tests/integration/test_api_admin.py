@@ -0,0 +1,94 @@
+"""
+Integration tests for admin API query budgets.
+"""
+
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+from src.api.models.quote import Quote, QuoteCategory
+from src.api.models.user import User, UserRole
+from src.core.security import create_access_token, get_password_hash
+
+
+# Statements one listing page may issue however many rows it returns: the
+# admin lookup (a user cache miss, since each test's admin is new), the
+# page, and one per eager load
+ADMIN_LIST_MAX_STATEMENTS = 4
+
+PAGE_SIZE = 20
+
+
+@pytest.fixture
+def admin_user(sync_test_session):
+    """Create a verified admin."""
+    admin = User(
+        email="admin@example.com",
+        username="admin",
+        hashed_password=get_password_hash("adminpassword123"),
+        role=UserRole.ADMIN.value,
+        is_verified=True,
+        is_active=True,
+    )
+    sync_test_session.add(admin)
+    sync_test_session.commit()
+    return admin
+
+
+@pytest.fixture
+def admin_headers(admin_user):
+    """Authentication headers for the admin."""
+    access_token = create_access_token(data={"sub": str(admin_user.id)})
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+@pytest.fixture
+def many_quotes(sync_test_session, admin_user):
+    """A full page of quotes, each with a category, by distinct users."""
+    category = QuoteCategory(name="Motivation", slug="motivation")
+    sync_test_session.add(category)
+    
+    for i in range(PAGE_SIZE):
+        author = User(
+            email=f"author{i}@example.com",
+            username=f"author{i}",
+            hashed_password=get_password_hash("authorpassword123"),
+        )
+        sync_test_session.add(author)
+        sync_test_session.add(Quote(text=f"Quote number {i}", user=author, category=category))
+    
+    sync_test_session.commit()
+    # Start requests from an empty identity map, as a fresh request session would
+    sync_test_session.expunge_all()
+
+
+class TestAdminQueryBudget:
+    """Admin listings issue a fixed number of statements per page."""
+
+    @pytest.mark.asyncio
+    async def test_list_users_statement_count(
+        self, async_client: AsyncClient, admin_headers, many_quotes, statement_log
+    ):
+        """Listing users does not issue a query per user."""
+        response = await async_client.get(
+            "/api/v1/admin/users", params={"limit": PAGE_SIZE}, headers=admin_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == PAGE_SIZE
+        assert len(statement_log) <= ADMIN_LIST_MAX_STATEMENTS
+
+    @pytest.mark.asyncio
+    async def test_list_quotes_statement_count(
+        self, async_client: AsyncClient, admin_headers, many_quotes, statement_log
+    ):
+        """Listing quotes loads authors and categories per page, not per quote."""
+        response = await async_client.get(
+            "/api/v1/admin/quotes", params={"limit": PAGE_SIZE}, headers=admin_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data) == PAGE_SIZE
+        assert all(quote["user"] and quote["category"] for quote in data)
+        assert len(statement_log) <= ADMIN_LIST_MAX_STATEMENTS
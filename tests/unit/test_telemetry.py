@@ -0,0 +1,44 @@
+"""
+Unit tests for telemetry middleware helpers.
+"""
+
+from unittest.mock import Mock
+
+from src.api.middleware.telemetry import normalize_route, get_route_label
+
+
+class TestNormalizeRoute:
+    """Test metric-label normalization of request paths."""
+
+    def test_static_path_unchanged(self):
+        """Paths without identifiers are returned as-is."""
+        assert normalize_route("/api/v1/quotes") == "/api/v1/quotes"
+
+    def test_numeric_ids_collapsed(self):
+        """Numeric path segments become a placeholder."""
+        assert normalize_route("/api/v1/users/42/quotes/7") == "/api/v1/users/{id}/quotes/{id}"
+
+    def test_uuid_collapsed(self):
+        """UUID path segments become a placeholder."""
+        path = "/api/v1/voice/0b8f5c1e-1c2d-4e5f-8a9b-0c1d2e3f4a5b/status"
+        assert normalize_route(path) == "/api/v1/voice/{id}/status"
+
+    def test_query_string_stripped(self):
+        """Query strings never reach the label."""
+        assert normalize_route("/api/v1/quotes?page=2") == "/api/v1/quotes"
+
+    def test_matched_route_preferred(self):
+        """The matched route template wins over the raw path."""
+        request = Mock()
+        request.scope = {"route": Mock(path="/api/v1/quotes/{quote_id}")}
+        request.url.path = "/api/v1/quotes/abc"
+        
+        assert get_route_label(request) == "/api/v1/quotes/{quote_id}"
+
+    def test_falls_back_to_normalized_path(self):
+        """Without a matched route the normalized path is used."""
+        request = Mock()
+        request.scope = {}
+        request.url.path = "/api/v1/quotes/12"
+        
+        assert get_route_label(request) == "/api/v1/quotes/{id}"